@@ -0,0 +1,275 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Solver Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+This module computes exact battle outcomes for SimpleBattle without
+simulating. A battle only depends on (character HP, enemy HP, ability
+cooldown, the effect the ability put on) at the start of each round,
+plus 50% coin flips for rogue critical strikes and escapes, so every
+reachable state is solved once and memoized.
+
+The effect is the Rogue's poison or the Cleric's shield, as (kind,
+turns left, poison per turn or shield left), or None. An ability's
+effect ends before the ability is ready again, so there is never more
+than one.
+"""
+
+import combat_system
+import status_effects
+
+# One full round = player turn then enemy turn, so turn parity never needs
+# to be part of the state: every state is "start of a round".
+ABILITY_COOLDOWN = combat_system.ABILITY_COOLDOWN
+
+# Outcome kinds used in the transition lists
+WIN = 'win'
+LOSS = 'loss'
+ESCAPE = 'escape'
+CONTINUE = 'continue'
+
+# ============================================================================
+# POLICIES
+# ============================================================================
+# A policy picks the player's action for a state, using the same choices
+# as SimpleBattle.player_turn: '1' attack, '2' special ability, '3' run.
+
+def attack_only_policy(character_hp, enemy_hp, cooldown):
+    """Always use a basic attack"""
+    return '1'
+
+def ability_when_ready_policy(character_hp, enemy_hp, cooldown):
+    """Use the special ability whenever it is off cooldown, else attack"""
+    if cooldown == 0:
+        return '2'
+    return '1'
+
+# ============================================================================
+# SOLVER
+# ============================================================================
+
+def solve_battle(character, enemy, policy=attack_only_policy):
+    """
+    Compute the exact outcome of a battle under a policy
+
+    Args:
+        character: Character dictionary (health, max_health, strength,
+                   magic, class are read; nothing is changed)
+        enemy: Enemy dictionary from combat_system.create_enemy
+        policy: Function(character_hp, enemy_hp, cooldown) -> '1'/'2'/'3'
+
+    Returns: Dictionary with win_probability, loss_probability,
+             escape_probability, expected_turns, expected_damage_taken
+             and states_explored
+    Raises: ValueError if the policy can loop forever (e.g. a Cleric that
+            only heals against an enemy weaker than the heal)
+    """
+    start = (character['health'], enemy['health'], 0, None)
+    if start[0] <= 0:
+        # start_battle would refuse this fight
+        return _summarize((0.0, 1.0, 0.0, 0.0, 0.0), 0)
+    if start[1] <= 0:
+        return _summarize((1.0, 0.0, 0.0, 0.0, 0.0), 0)
+
+    attack_damage = combat_system.calculate_attack_damage(character, enemy)
+    enemy_damage = combat_system.calculate_attack_damage(enemy, character)
+
+    def get_transitions(state):
+        return _round_transitions(
+            state, character, enemy, policy, attack_damage, enemy_damage
+        )
+
+    values = _solve_states(start, get_transitions)
+    return _summarize(values[start], len(values))
+
+def _solve_states(start, get_transitions):
+    """
+    Memoized depth-first evaluation of every state reachable from start
+
+    Uses an explicit stack instead of recursion so long fights (hundreds
+    of rounds) do not hit Python's recursion limit.
+
+    Returns: Dictionary {state: (win, loss, escape, turns, damage)}
+    """
+    values = {}
+    transitions = {}
+    on_path = set()
+    stack = [(start, False)]
+
+    while stack:
+        state, expanded = stack.pop()
+        if state in values:
+            continue
+
+        if not expanded:
+            on_path.add(state)
+            transitions[state] = get_transitions(state)
+            stack.append((state, True))
+            for probability, kind, next_state, damage in transitions[state]:
+                if kind != CONTINUE or next_state in values:
+                    continue
+                if next_state in on_path:
+                    raise ValueError(
+                        f"Policy never finishes the battle: state {next_state} repeats."
+                    )
+                stack.append((next_state, False))
+            continue
+
+        win = loss = escape = turns = damage_taken = 0.0
+        for probability, kind, next_state, damage in transitions.pop(state):
+            # Every transition is one full round
+            turns += probability
+            damage_taken += probability * damage
+            if kind == WIN:
+                win += probability
+            elif kind == LOSS:
+                loss += probability
+            elif kind == ESCAPE:
+                escape += probability
+            else:
+                next_win, next_loss, next_escape, next_turns, next_damage = values[next_state]
+                win += probability * next_win
+                loss += probability * next_loss
+                escape += probability * next_escape
+                turns += probability * next_turns
+                damage_taken += probability * next_damage
+
+        values[state] = (win, loss, escape, turns, damage_taken)
+        on_path.discard(state)
+
+    return values
+
+def _round_transitions(state, character, enemy, policy, attack_damage, enemy_damage):
+    """
+    List every way one round can go from a state
+
+    Mirrors SimpleBattle.step: player acts, battle end is checked, enemy
+    attacks (into the shield first), battle end is checked, poison ticks
+    and effects wear off, battle end is checked, then the cooldown ticks
+    down.
+
+    Returns: List of (probability, kind, next_state, damage_taken)
+    """
+    character_hp, enemy_hp, cooldown, effect = state
+    choice = policy(character_hp, enemy_hp, cooldown)
+
+    # (probability, character_hp, enemy_hp, cooldown, effect, escaped)
+    if choice == '1':
+        outcomes = [(1.0, character_hp, max(0, enemy_hp - attack_damage), cooldown, effect, False)]
+    elif choice == '2' and cooldown == 0:
+        outcomes = [
+            (probability, new_character_hp, new_enemy_hp, ABILITY_COOLDOWN,
+             new_effect or effect, False)
+            for probability, new_character_hp, new_enemy_hp, new_effect
+            in _special_ability_outcomes(character, enemy, character_hp, enemy_hp)
+        ]
+    elif choice == '3':
+        outcomes = [
+            (0.5, character_hp, enemy_hp, cooldown, effect, True),
+            (0.5, character_hp, enemy_hp, cooldown, effect, False)
+        ]
+    else:
+        # Ability on cooldown or invalid choice: the turn is wasted
+        outcomes = [(1.0, character_hp, enemy_hp, cooldown, effect, False)]
+
+    transitions = []
+    for probability, new_character_hp, new_enemy_hp, new_cooldown, new_effect, escaped in outcomes:
+        if escaped:
+            transitions.append((probability, ESCAPE, None, 0))
+            continue
+        if new_enemy_hp <= 0:
+            transitions.append((probability, WIN, None, 0))
+            continue
+
+        damage = enemy_damage
+        if new_effect is not None and new_effect[0] == status_effects.SHIELD:
+            kind, turns_left, shield = new_effect
+            absorbed = min(shield, damage)
+            damage -= absorbed
+            # An empty shield is removed at once
+            new_effect = (kind, turns_left, shield - absorbed) if shield > absorbed else None
+
+        damage = min(damage, new_character_hp)
+        new_character_hp -= damage
+        if new_character_hp <= 0:
+            transitions.append((probability, LOSS, None, damage))
+            continue
+
+        if new_effect is not None:
+            kind, turns_left, amount = new_effect
+            if kind == status_effects.POISON:
+                new_enemy_hp -= min(amount, new_enemy_hp)
+            new_effect = (kind, turns_left - 1, amount) if turns_left > 1 else None
+        if new_enemy_hp <= 0:
+            transitions.append((probability, WIN, None, damage))
+            continue
+
+        if new_cooldown > 0:
+            new_cooldown -= 1
+        next_state = (new_character_hp, new_enemy_hp, new_cooldown, new_effect)
+        transitions.append((probability, CONTINUE, next_state, damage))
+
+    return transitions
+
+def _special_ability_outcomes(character, enemy, character_hp, enemy_hp):
+    """
+    Possible results of use_special_ability for the character's class
+
+    Uses the same formulas and effects as the ability helpers in
+    combat_system.
+
+    Returns: List of (probability, character_hp, enemy_hp, effect put on
+             or None)
+    """
+    char_class = character['class']
+
+    if char_class == 'Warrior':
+        damage = max(1, (character['strength'] * 2) - (enemy['strength'] // 4))
+        return [(1.0, character_hp, max(0, enemy_hp - damage), None)]
+    elif char_class == 'Mage':
+        damage = max(1, (character['magic'] * 2) - (enemy['magic'] // 4))
+        return [(1.0, character_hp, max(0, enemy_hp - damage), None)]
+    elif char_class == 'Rogue':
+        damage = max(1, (character['strength'] * 3) - (enemy['strength'] // 4))
+        poison, duration = combat_system.ROGUE_POISON
+        return [
+            (0.5, character_hp, max(0, enemy_hp - damage), (status_effects.POISON, duration, poison)),
+            (0.5, character_hp, enemy_hp, None)
+        ]
+    elif char_class == 'Cleric':
+        shield, duration = combat_system.CLERIC_SHIELD
+        return [(1.0, min(character_hp + 30, character['max_health']), enemy_hp,
+                 (status_effects.SHIELD, duration, shield))]
+    else:
+        return [(1.0, character_hp, enemy_hp, None)]
+
+def _summarize(values, states_explored):
+    """Turn a solved value tuple into the result dictionary"""
+    win, loss, escape, turns, damage_taken = values
+    return {
+        'win_probability': win,
+        'loss_probability': loss,
+        'escape_probability': escape,
+        'expected_turns': turns,
+        'expected_damage_taken': damage_taken,
+        'states_explored': states_explored
+    }
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== BATTLE SOLVER TEST ===")
+
+    # import character_manager
+    # hero = character_manager.create_character("Solver", "Rogue")
+    # for enemy_type in ["goblin", "orc", "dragon"]:
+    #     enemy = combat_system.create_enemy(enemy_type)
+    #     result = solve_battle(hero, enemy, ability_when_ready_policy)
+    #     print(f"{enemy_type}: {result['win_probability']:.4f} win, "
+    #           f"{result['expected_turns']:.2f} turns")
@@ -0,0 +1,304 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Hot Path Benchmarks
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Times the game's busiest functions on synthetic data.
+
+All data is generated from a fixed seed, and --scale multiplies its size
+(scale 1 = 100 quests in chains of 20, 100 items, 1000 save files), so
+runs on different commits measure the same work. Results are JSON; use
+compare.py to diff two runs.
+
+Run with: python benchmarks/bench_hot_paths.py --scale 1 --output after.json
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+
+import bench_utils
+
+import character_manager
+import inventory_system
+import quest_handler
+import combat_system
+import game_data
+import game_output
+from custom_exceptions import InsufficientResourcesError
+
+QUESTS_PER_SCALE = 100
+ITEMS_PER_SCALE = 100
+SAVES_PER_SCALE = 1000
+QUEST_CHAIN_LENGTH = 20
+
+ITEM_EFFECTS = {
+    'weapon': 'strength',
+    'armor': 'max_health',
+    'consumable': 'health'
+}
+
+# Every benchmark: name -> function(workspace) returning the thing to time
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Register a setup function that returns the call to time"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+# ============================================================================
+# SYNTHETIC DATA
+# ============================================================================
+
+def write_quest_file(filename, count, rng):
+    """
+    Write a quest file with count quests in prerequisite chains
+
+    Returns: List of quest IDs in file order
+    """
+    quest_ids = []
+    blocks = []
+    for number in range(count):
+        quest_id = f"quest_{number:05d}"
+        position = number % QUEST_CHAIN_LENGTH
+        prerequisite = quest_ids[-1] if position else "NONE"
+        blocks.append(
+            f"QUEST_ID: {quest_id}\n"
+            f"TITLE: Quest {number}\n"
+            f"DESCRIPTION: Synthetic quest number {number}\n"
+            f"REWARD_XP: {rng.randint(10, 500)}\n"
+            f"REWARD_GOLD: {rng.randint(5, 300)}\n"
+            f"REQUIRED_LEVEL: {1 + position // 4}\n"
+            f"PREREQUISITE: {prerequisite}\n"
+        )
+        quest_ids.append(quest_id)
+    with open(filename, 'w') as f:
+        f.write("\n".join(blocks))
+    return quest_ids
+
+def write_item_file(filename, count, rng):
+    """
+    Write an item file with count items of mixed types
+
+    Returns: List of item IDs in file order
+    """
+    item_ids = []
+    blocks = []
+    for number in range(count):
+        item_id = f"item_{number:05d}"
+        item_type = rng.choice(list(ITEM_EFFECTS))
+        blocks.append(
+            f"ITEM_ID: {item_id}\n"
+            f"NAME: Item {number}\n"
+            f"TYPE: {item_type}\n"
+            f"EFFECT: {ITEM_EFFECTS[item_type]}:{rng.randint(1, 20)}\n"
+            f"COST: {rng.randint(10, 400)}\n"
+            f"DESCRIPTION: Synthetic item number {number}\n"
+        )
+        item_ids.append(item_id)
+    with open(filename, 'w') as f:
+        f.write("\n".join(blocks))
+    return item_ids
+
+class Workspace:
+    """Temporary directory holding one scale's worth of synthetic data"""
+
+    def __init__(self, scale, seed):
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.directory = tempfile.mkdtemp(prefix="quest_bench_")
+        self.quest_file = os.path.join(self.directory, "quests.txt")
+        self.item_file = os.path.join(self.directory, "items.txt")
+        self.save_directory = os.path.join(self.directory, "save_games")
+
+        self.quest_ids = write_quest_file(self.quest_file, QUESTS_PER_SCALE * scale, self.rng)
+        self.item_ids = write_item_file(self.item_file, ITEMS_PER_SCALE * scale, self.rng)
+        self.quests = game_data.load_quests(self.quest_file)
+        self.items = game_data.load_items(self.item_file)
+
+        for number in range(SAVES_PER_SCALE * scale):
+            character = self.make_character(f"Saved{number:06d}")
+            character_manager.save_character(character, self.save_directory)
+
+    def make_character(self, name):
+        """A mid-game character with some inventory and quest history"""
+        character = character_manager.create_character(
+            name, self.rng.choice(character_manager.VALID_CLASSES)
+        )
+        character['level'] = 3
+        character['inventory'] = self.rng.sample(self.item_ids, 10)
+        # First half of every chain done, next quest active
+        for quest_id in self.quest_ids:
+            position = int(quest_id.split("_")[1]) % QUEST_CHAIN_LENGTH
+            if position < QUEST_CHAIN_LENGTH // 2:
+                character['completed_quests'].append(quest_id)
+            elif position == QUEST_CHAIN_LENGTH // 2:
+                character['active_quests'].append(quest_id)
+        return character
+
+    def cleanup(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+@benchmark("game_data.load_quests")
+def bench_load_quests(workspace):
+    return lambda: game_data.load_quests(workspace.quest_file)
+
+@benchmark("game_data.load_items")
+def bench_load_items(workspace):
+    return lambda: game_data.load_items(workspace.item_file)
+
+@benchmark("character_manager.save_character")
+def bench_save_character(workspace):
+    character = workspace.make_character("BenchSave")
+    directory = os.path.join(workspace.directory, "single_save")
+    return lambda: character_manager.save_character(character, directory)
+
+@benchmark("character_manager.load_character")
+def bench_load_character(workspace):
+    character = workspace.make_character("BenchLoad")
+    directory = os.path.join(workspace.directory, "single_load")
+    character_manager.save_character(character, directory)
+    return lambda: character_manager.load_character("BenchLoad", directory)
+
+@benchmark("character_manager.list_saved_characters")
+def bench_list_saved_characters(workspace):
+    return lambda: character_manager.list_saved_characters(workspace.save_directory)
+
+@benchmark("character_manager.validate_character_data")
+def bench_validate_character_data(workspace):
+    characters = [workspace.make_character(f"BenchValid{number}") for number in range(100)]
+
+    def validate_all():
+        for character in characters:
+            character_manager.validate_character_data(character, workspace.quests, workspace.items)
+    return validate_all
+
+@benchmark("quest_handler.get_available_quests")
+def bench_get_available_quests(workspace):
+    character = workspace.make_character("BenchQuests")
+    return lambda: quest_handler.get_available_quests(character, workspace.quests)
+
+@benchmark("quest_handler.get_quest_prerequisite_chain")
+def bench_get_quest_prerequisite_chain(workspace):
+    # Last quest of the last chain has the longest chain
+    last_quest = workspace.quest_ids[-1]
+    return lambda: quest_handler.get_quest_prerequisite_chain(last_quest, workspace.quests)
+
+@benchmark("inventory_system.add_count_remove")
+def bench_inventory_add_count_remove(workspace):
+    character = workspace.make_character("BenchInventory")
+    item_ids = workspace.item_ids[:inventory_system.MAX_INVENTORY_SIZE]
+
+    def fill_and_empty():
+        character['inventory'] = []
+        for item_id in item_ids:
+            inventory_system.add_item_to_inventory(character, item_id)
+        for item_id in item_ids:
+            inventory_system.count_item(character, item_id)
+        for item_id in item_ids:
+            inventory_system.remove_item_from_inventory(character, item_id)
+    return fill_and_empty
+
+@benchmark("inventory_system.purchase_item_refused")
+def bench_purchase_item_refused(workspace):
+    character = workspace.make_character("BenchBroke")
+    character['gold'] = 0
+    item_ids = workspace.item_ids
+
+    def buy_everything():
+        for item_id in item_ids:
+            try:
+                inventory_system.purchase_item(character, item_id, workspace.items[item_id])
+            except InsufficientResourcesError:
+                pass
+    return buy_everything
+
+@benchmark("inventory_system.try_purchase_item_refused")
+def bench_try_purchase_item_refused(workspace):
+    character = workspace.make_character("BenchBrokeFast")
+    character['gold'] = 0
+    item_ids = workspace.item_ids
+
+    def buy_everything():
+        for item_id in item_ids:
+            inventory_system.try_purchase_item(character, item_id, workspace.items[item_id])
+    return buy_everything
+
+@benchmark("combat_system.SimpleBattle")
+def bench_simple_battle(workspace):
+    seeds = iter(range(10 ** 9))
+
+    def fight():
+        character = character_manager.create_character("BenchFighter", "Warrior")
+        enemy = combat_system.create_enemy("orc")
+        battle = combat_system.SimpleBattle(character, enemy, seed=next(seeds))
+        battle.begin()
+        result = None
+        while result is None:
+            result = battle.step('1')
+    return fight
+
+# ============================================================================
+# RUNNING
+# ============================================================================
+
+def run_benchmarks(scale=1, seed=0, repeat=5, selected=None):
+    """
+    Run the benchmarks on freshly generated data
+
+    Args:
+        selected: Benchmark names to run (all if None)
+
+    Returns: Dictionary with 'info' (run metadata) and 'results'
+             {name: timing from bench_utils.time_call}
+    """
+    names = selected if selected else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {unknown}")
+
+    results = {}
+    with game_output.use_sink(game_output.NullSink()):
+        workspace = Workspace(scale, seed)
+        try:
+            for name in names:
+                func = BENCHMARKS[name](workspace)
+                results[name] = bench_utils.time_call(func, repeat=repeat)
+        finally:
+            workspace.cleanup()
+
+    return {
+        'info': bench_utils.get_run_info(suite="hot_paths", scale=scale, seed=seed),
+        'results': results
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths")
+    parser.add_argument("--scale", type=int, default=1, help="data size multiplier")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", action="append", default=None,
+                        help="run only this benchmark (may be given more than once)")
+    parser.add_argument("--output", default=None, help="JSON file (stdout if omitted)")
+    parser.add_argument("--list", action="store_true", help="list benchmark names")
+    args = parser.parse_args()
+
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+    else:
+        bench_utils.write_results(
+            run_benchmarks(args.scale, args.seed, args.repeat, args.only), args.output
+        )
@@ -0,0 +1,242 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Memory Benchmarks
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Measures bytes per character, quest and item with tracemalloc.
+
+Each measurement builds N entities inside a traced region and reports:
+- steady bytes: memory still held once building is done
+- peak bytes: most memory held at any point while building
+- top allocation sites (file:line) for the steady memory
+
+Every entity type can be measured in several representations: what the
+game uses now (dicts for characters, frozen game_records for quests and
+items), plain dicts, and compact alternatives (__slots__ classes and
+namedtuples) converted from those, to see what switching would save.
+
+Run with: python benchmarks/bench_memory.py --characters 10000 --catalog 10000
+Compare two runs with:
+    python benchmarks/compare.py old.json new.json --key steady_bytes_per_entity
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+import tracemalloc
+from collections import namedtuple
+
+import bench_utils
+
+import character_manager
+import content_generator
+import game_data
+import game_output
+
+TOP_SITES = 5
+
+# ============================================================================
+# COMPACT ALTERNATIVES
+# ============================================================================
+
+CHARACTER_FIELDS = ('name', 'class', 'level', 'health', 'max_health', 'strength',
+                    'magic', 'experience', 'gold', 'inventory', 'active_quests',
+                    'completed_quests')
+QUEST_FIELDS = ('quest_id', 'title', 'description', 'reward_xp', 'reward_gold',
+                'required_level', 'prerequisite')
+ITEM_FIELDS = ('item_id', 'name', 'type', 'effect', 'cost', 'description')
+
+def make_slots_class(name, fields):
+    """Build a class with __slots__ for the given fields"""
+    # 'class' is a keyword, so slot names get a trailing underscore if needed
+    slots = tuple(field + "_" if field == 'class' else field for field in fields)
+
+    def __init__(self, record):
+        for field, slot in zip(fields, slots):
+            setattr(self, slot, record[field])
+
+    return type(name, (), {'__slots__': slots, '__init__': __init__})
+
+SlotsCharacter = make_slots_class("SlotsCharacter", CHARACTER_FIELDS)
+SlotsQuest = make_slots_class("SlotsQuest", QUEST_FIELDS)
+SlotsItem = make_slots_class("SlotsItem", ITEM_FIELDS)
+
+TupleCharacter = namedtuple("TupleCharacter", CHARACTER_FIELDS, rename=True)
+TupleQuest = namedtuple("TupleQuest", QUEST_FIELDS)
+TupleItem = namedtuple("TupleItem", ITEM_FIELDS)
+
+# Representation name -> function(record dict) for each entity type
+REPRESENTATIONS = {
+    'character': {
+        'dict': None,
+        'slots': SlotsCharacter,
+        'tuple': lambda record: TupleCharacter(*(record[field] for field in CHARACTER_FIELDS))
+    },
+    'quest': {
+        'record': None,
+        'dict': dict,
+        'slots': SlotsQuest,
+        'tuple': lambda record: TupleQuest(**record)
+    },
+    'item': {
+        'record': None,
+        'dict': dict,
+        'slots': SlotsItem,
+        'tuple': lambda record: TupleItem(**record)
+    }
+}
+
+# ============================================================================
+# MEASURING
+# ============================================================================
+
+def measure(build, count):
+    """
+    Measure the memory used by the objects build() returns
+
+    Args:
+        build: Function with no arguments returning the built objects
+        count: Number of entities build() makes
+
+    Returns: Dictionary with count, steady/peak bytes (total and per
+             entity) and top_sites [{site, bytes, blocks}]
+    """
+    gc.collect()
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start()
+    try:
+        tracemalloc.clear_traces()
+        before = tracemalloc.take_snapshot()
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        built = build()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started_here:
+            tracemalloc.stop()
+
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    differences = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+    top_sites = []
+    for difference in differences[:TOP_SITES]:
+        frame = difference.traceback[0]
+        top_sites.append({
+            'site': f"{os.path.basename(frame.filename)}:{frame.lineno}",
+            'bytes': difference.size_diff,
+            'blocks': difference.count_diff
+        })
+
+    # Keep the objects alive until the snapshot is taken
+    del built
+    steady = current - base
+    peak_used = peak - base
+    return {
+        'count': count,
+        'steady_bytes': steady,
+        'peak_bytes': peak_used,
+        'steady_bytes_per_entity': steady / count if count else 0.0,
+        'peak_bytes_per_entity': peak_used / count if count else 0.0,
+        'top_sites': top_sites
+    }
+
+def build_characters(count, convert):
+    """Return a function that creates count characters"""
+    def build():
+        classes = character_manager.VALID_CLASSES
+        characters = []
+        for number in range(count):
+            character = character_manager.create_character(
+                f"Hero{number:07d}", classes[number % len(classes)]
+            )
+            characters.append(convert(character) if convert else character)
+        return characters
+    return build
+
+def build_catalog(load, filename, convert):
+    """Return a function that loads a data file (converting each record)"""
+    def build():
+        records = load(filename)
+        if convert:
+            return {record_id: convert(record) for record_id, record in records.items()}
+        return records
+    return build
+
+def run_memory_benchmarks(characters=10000, catalog=10000, seed=0, representations=None):
+    """
+    Measure every entity type in every representation
+
+    Args:
+        characters: Number of characters to create
+        catalog: Number of quests and of items in the generated packs
+        representations: Names to measure (all if None)
+
+    Returns: Dictionary with 'info' and 'results'
+             {"memory.<entity>.<representation>": measurement}
+    """
+    directory = tempfile.mkdtemp(prefix="quest_memory_")
+    quest_file = os.path.join(directory, "quests.txt")
+    item_file = os.path.join(directory, "items.txt")
+    content_generator.write_pack(
+        quest_file, content_generator.generate_quests(catalog, seed), content_generator.format_quest
+    )
+    content_generator.write_pack(
+        item_file, content_generator.generate_items(catalog, seed), content_generator.format_item
+    )
+
+    builders = {
+        'character': (characters, lambda convert: build_characters(characters, convert)),
+        'quest': (catalog, lambda convert: build_catalog(game_data.load_quests, quest_file, convert)),
+        'item': (catalog, lambda convert: build_catalog(game_data.load_items, item_file, convert))
+    }
+
+    results = {}
+    try:
+        with game_output.use_sink(game_output.NullSink()):
+            for entity, (count, make_build) in builders.items():
+                for name, convert in REPRESENTATIONS[entity].items():
+                    if representations and name not in representations:
+                        continue
+                    results[f"memory.{entity}.{name}"] = measure(make_build(convert), count)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        'info': bench_utils.get_run_info(suite="memory", characters=characters,
+                                         catalog=catalog, seed=seed),
+        'results': results
+    }
+
+def print_table(report):
+    """Print per-entity bytes as a table"""
+    print(f"{'measurement':<28}{'count':>8}{'steady B/each':>15}{'peak B/each':>13}  top site")
+    for name, result in report['results'].items():
+        top = result['top_sites'][0]['site'] if result['top_sites'] else ""
+        print(f"{name:<28}{result['count']:>8}{result['steady_bytes_per_entity']:>15.1f}"
+              f"{result['peak_bytes_per_entity']:>13.1f}  {top}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure memory per game entity")
+    parser.add_argument("--characters", type=int, default=10000)
+    parser.add_argument("--catalog", type=int, default=10000,
+                        help="quests and items in the generated packs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--representation", action="append", default=None,
+                        choices=["record", "dict", "slots", "tuple"],
+                        help="only measure this representation (may repeat)")
+    parser.add_argument("--output", default=None, help="JSON file (table only if omitted)")
+    args = parser.parse_args()
+
+    report = run_memory_benchmarks(args.characters, args.catalog, args.seed, args.representation)
+    print_table(report)
+    if args.output:
+        bench_utils.write_results(report, args.output)
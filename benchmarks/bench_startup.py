@@ -0,0 +1,171 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Startup Benchmarks
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Measures how long a fresh process takes to get going.
+
+- startup.interpreter: `python -c pass`, the floor nothing can beat
+- startup.import_main: `python -c "import main"`, plus a
+  `python -X importtime` breakdown of the slowest imports
+- startup.first_menu: `python main.py` until the main menu prompt shows
+  up (then it answers "3" to quit)
+
+Every measurement starts a new interpreter, so run it on a quiet machine.
+
+Run with: python benchmarks/bench_startup.py --repeat 10 --output startup.json
+Compare two runs with: python benchmarks/compare.py old.json new.json
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import bench_utils
+
+MENU_PROMPT = b"Select an option (1-3): "
+TOP_IMPORTS = 10
+# Give up on a process that has not shown the menu after this many seconds
+FIRST_MENU_TIMEOUT = 30
+
+# ============================================================================
+# MEASURING
+# ============================================================================
+
+def time_process(arguments):
+    """Return the seconds a command takes to run to the end"""
+    started = time.perf_counter()
+    subprocess.run(arguments, cwd=bench_utils.REPO_ROOT, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+def time_first_menu(python=sys.executable):
+    """
+    Start main.py and time how long it takes to show the main menu
+
+    Returns: Seconds from starting the process to seeing the prompt
+    Raises: RuntimeError if the prompt never shows up
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen([python, "main.py"], cwd=bench_utils.REPO_ROOT,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL)
+    seen = b""
+    try:
+        while MENU_PROMPT not in seen:
+            chunk = os.read(process.stdout.fileno(), 4096)
+            if not chunk or time.perf_counter() - started > FIRST_MENU_TIMEOUT:
+                raise RuntimeError("main.py never showed the main menu")
+            seen += chunk
+        elapsed = time.perf_counter() - started
+
+        # Quit from the menu
+        process.communicate(b"3\n", timeout=FIRST_MENU_TIMEOUT)
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+    return elapsed
+
+def parse_importtime(text):
+    """
+    Read `python -X importtime` output
+
+    Returns: Dictionary {module: (self microseconds, cumulative microseconds)}
+    """
+    modules = {}
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            # The header line
+            continue
+        modules[name.strip()] = (int(own), int(cumulative))
+    return modules
+
+def measure_imports(module="main", python=sys.executable):
+    """
+    Break down one module's import time with -X importtime
+
+    Returns: Dictionary with total_us (the module's cumulative time) and
+             top_imports [{module, self_us, cumulative_us}], slowest first
+    """
+    output = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=bench_utils.REPO_ROOT, capture_output=True,
+                            text=True, check=True)
+    modules = parse_importtime(output.stderr)
+    slowest = sorted(modules.items(), key=lambda entry: entry[1][0], reverse=True)
+    return {
+        'total_us': modules.get(module, (0, 0))[1],
+        'top_imports': [
+            {'module': name, 'self_us': own, 'cumulative_us': cumulative}
+            for name, (own, cumulative) in slowest[:TOP_IMPORTS]
+        ]
+    }
+
+def summarize(samples):
+    """Turn a list of seconds into the result fields compare.py reads"""
+    return {
+        'min_s': min(samples),
+        'median_s': statistics.median(samples),
+        'number': 1,
+        'repeat': len(samples)
+    }
+
+def run_startup_benchmarks(repeat=10, python=sys.executable):
+    """
+    Measure interpreter start, importing main and reaching the main menu
+
+    Returns: Dictionary with 'info' and 'results' {name: timing}
+    """
+    # Warm up the OS file cache and write any missing .pyc files first
+    time_process([python, "-c", "import main"])
+
+    results = {
+        'startup.interpreter': summarize(
+            [time_process([python, "-c", "pass"]) for _ in range(repeat)]
+        ),
+        'startup.import_main': summarize(
+            [time_process([python, "-c", "import main"]) for _ in range(repeat)]
+        ),
+        'startup.first_menu': summarize(
+            [time_first_menu(python) for _ in range(repeat)]
+        )
+    }
+    results['startup.import_main'].update(measure_imports("main", python))
+
+    return {
+        'info': bench_utils.get_run_info(suite="startup", repeat=repeat),
+        'results': results
+    }
+
+def print_table(report):
+    """Print the timings and the slowest imports"""
+    print(f"{'measurement':<24}{'median ms':>11}{'min ms':>9}")
+    for name, result in report['results'].items():
+        print(f"{name:<24}{result['median_s'] * 1000:>11.1f}{result['min_s'] * 1000:>9.1f}")
+
+    imports = report['results']['startup.import_main']
+    print(f"\nimport main: {imports['total_us'] / 1000:.1f} ms (-X importtime)")
+    print(f"{'module':<32}{'self us':>9}{'cumul. us':>11}")
+    for entry in imports['top_imports']:
+        print(f"{entry['module']:<32}{entry['self_us']:>9}{entry['cumulative_us']:>11}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure game startup time")
+    parser.add_argument("--repeat", type=int, default=10, help="processes started per measurement")
+    parser.add_argument("--output", default=None, help="JSON file (table only if omitted)")
+    args = parser.parse_args()
+
+    report = run_startup_benchmarks(args.repeat)
+    print_table(report)
+    if args.output:
+        bench_utils.write_results(report, args.output)
@@ -0,0 +1,135 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark Utilities
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Shared helpers for the benchmark scripts: timing, run metadata, JSON
+result files and comparing two result files.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Let benchmark scripts import the game modules
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+# Changes smaller than this fraction are reported as unchanged
+DEFAULT_THRESHOLD = 0.10
+
+# ============================================================================
+# TIMING
+# ============================================================================
+
+def time_call(func, repeat=5, number=None):
+    """
+    Time a function call the way timeit does
+
+    Args:
+        func: Function taking no arguments
+        repeat: Number of timing rounds
+        number: Calls per round (picked so a round takes ~0.2s if None)
+
+    Returns: Dictionary with per-call min_s, median_s, number and repeat
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    rounds = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'min_s': min(rounds),
+        'median_s': statistics.median(rounds),
+        'number': number,
+        'repeat': repeat
+    }
+
+# ============================================================================
+# RESULT FILES
+# ============================================================================
+
+def get_git_commit():
+    """Return the current commit hash, or None outside a git checkout"""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+def get_run_info(**settings):
+    """
+    Describe where and how a benchmark ran
+
+    Returns: Dictionary with commit, python, platform plus any settings
+    """
+    info = {
+        'commit': get_git_commit(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+    }
+    info.update(settings)
+    return info
+
+def write_results(results, filename=None):
+    """Write results as JSON to a file, or to stdout if filename is None"""
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if filename is None:
+        print(text)
+    else:
+        with open(filename, 'w') as f:
+            f.write(text + "\n")
+
+def load_results(filename):
+    """Read a JSON result file"""
+    with open(filename, 'r') as f:
+        return json.load(f)
+
+# ============================================================================
+# COMPARING RUNS
+# ============================================================================
+
+def compare_results(old, new, threshold=DEFAULT_THRESHOLD, key='median_s'):
+    """
+    Compare the benchmarks two result files have in common
+
+    Args:
+        old / new: Result dictionaries with a 'results' section
+        threshold: Fractional change needed to count as slower/faster
+        key: Which number to compare
+
+    Returns: List of (name, old_value, new_value, ratio, verdict) where
+             verdict is 'slower', 'faster' or 'same'
+    """
+    rows = []
+    for name in sorted(set(old['results']) & set(new['results'])):
+        old_value = old['results'][name][key]
+        new_value = new['results'][name][key]
+        ratio = new_value / old_value if old_value else float('inf')
+        if ratio > 1 + threshold:
+            verdict = 'slower'
+        elif ratio < 1 - threshold:
+            verdict = 'faster'
+        else:
+            verdict = 'same'
+        rows.append((name, old_value, new_value, ratio, verdict))
+    return rows
+
+def print_comparison(rows):
+    """Print compare_results rows as a table"""
+    print(f"{'benchmark':<44}{'old':>14}{'new':>14}{'ratio':>9}  verdict")
+    for name, old_value, new_value, ratio, verdict in rows:
+        print(f"{name:<44}{old_value:>14.6g}{new_value:>14.6g}{ratio:>9.2f}  {verdict}")
@@ -0,0 +1,234 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Worker Startup Benchmarks
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Compares ways of starting worker processes on a generated catalog:
+
+- spawn:       every worker imports the game and parses the data itself
+- fork:        the parent preloads, then forks (no gc.freeze)
+- fork_frozen: the parent preloads, calls gc.freeze, then forks
+
+For each one it reports how long start_pool takes (the preload, for the
+fork modes), how long after that each worker is ready, and
+how much of each worker's memory is still shared with other processes
+(from /proc/<pid>/smaps_rollup) right after starting and again after the
+workers have played some games and run full garbage collections.
+
+Every mode runs in a fresh interpreter, so they cannot affect each other.
+
+Run with: python benchmarks/bench_workers.py --workers 4 --catalog 20000
+Compare two runs with: python benchmarks/compare.py old.json new.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import bench_utils
+
+import content_generator
+import replay_driver
+import worker_pool
+
+MODES = {
+    'spawn': {'start_method': 'spawn'},
+    'fork': {'start_method': 'fork', 'freeze': False},
+    'fork_frozen': {'start_method': 'fork', 'freeze': True}
+}
+
+# Replies for the games workers play between the two memory readings
+CHURN_SCRIPT = ["1", "Churner", "Warrior", "3", "2", "", "6", "4", "1", "1", "1", "1",
+                "1", "1", "1", "1", "", "5", "L", "6", "3"]
+
+# ============================================================================
+# READING MEMORY
+# ============================================================================
+
+def read_smaps_rollup(pid):
+    """
+    Read a process's memory totals
+
+    Returns: Dictionary {field: kB} (Rss, Pss, Shared_Clean, ...),
+             or None if /proc is not available
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", 'r') as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    fields = {}
+    for line in lines[1:]:
+        parts = line.split()
+        if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+            fields[parts[0][:-1]] = int(parts[1])
+    return fields
+
+def summarize_memory(pids):
+    """
+    Average the memory of some worker processes
+
+    Returns: Dictionary with rss_kb, pss_kb, shared_kb, private_kb and
+             shared_fraction, or None if /proc is not available
+    """
+    readings = [read_smaps_rollup(pid) for pid in pids]
+    if not readings or None in readings:
+        return None
+
+    def mean(*names):
+        return statistics.mean(sum(reading.get(name, 0) for name in names) for reading in readings)
+
+    rss = mean('Rss')
+    shared = mean('Shared_Clean', 'Shared_Dirty')
+    return {
+        'rss_kb': rss,
+        'pss_kb': mean('Pss'),
+        'shared_kb': shared,
+        'private_kb': mean('Private_Clean', 'Private_Dirty'),
+        'shared_fraction': shared / rss if rss else 0.0
+    }
+
+# ============================================================================
+# MEASURING
+# ============================================================================
+
+def churn(games, delay):
+    """
+    Pool task: play some games and run full collections, like a worker
+    that has been up for a while, then hold the worker for a moment
+
+    Returns: Process ID of the worker
+    """
+    for seed in range(games):
+        replay_driver.run_script(CHURN_SCRIPT, seed=seed)
+        gc.collect()
+    time.sleep(delay)
+    return os.getpid()
+
+def measure_mode(mode, workers, quest_file, item_file, games=5):
+    """
+    Start workers one way and measure them (run in a fresh interpreter)
+
+    Returns: Dictionary with preload_s (time in start_pool: the preload
+             for fork modes, paid once), startup_s (from start_pool until
+             every worker is ready), median_s and min_s (per worker, from
+             the end of start_pool until that worker was ready),
+             memory_started and memory_after_churn
+    """
+    settings = MODES[mode]
+
+    started = time.monotonic()
+    pool = worker_pool.start_pool(workers, quest_file=quest_file, item_file=item_file, **settings)
+    pool_started = time.monotonic()
+    try:
+        ready = worker_pool.warm_up(pool, workers)
+        ready_times = [answered - pool_started for answered in ready.values()]
+        startup = max(ready.values()) - started
+        pids = sorted(ready)
+        memory_started = summarize_memory(pids)
+
+        # Every worker plays games; the delay spreads the tasks across them
+        list(pool.map(churn, [games] * workers, [0.2] * workers))
+        memory_after = summarize_memory(pids)
+    finally:
+        pool.shutdown()
+
+    return {
+        'workers': workers,
+        'preload_s': pool_started - started,
+        'startup_s': startup,
+        'median_s': statistics.median(ready_times),
+        'min_s': min(ready_times),
+        'number': 1,
+        'repeat': 1,
+        'memory_started': memory_started,
+        'memory_after_churn': memory_after
+    }
+
+def run_worker_benchmarks(workers=4, catalog=20000, seed=0, modes=None, games=5):
+    """
+    Measure every start mode on a generated catalog
+
+    Returns: Dictionary with 'info' and 'results' {"workers.<mode>": measurement}
+    """
+    if modes is None:
+        modes = [mode for mode in MODES if mode == 'spawn' or worker_pool.fork_available()]
+
+    directory = tempfile.mkdtemp(prefix="quest_workers_")
+    quest_file = os.path.join(directory, "quests.txt")
+    item_file = os.path.join(directory, "items.txt")
+    content_generator.write_pack(
+        quest_file, content_generator.generate_quests(catalog, seed), content_generator.format_quest
+    )
+    content_generator.write_pack(
+        item_file, content_generator.generate_items(catalog, seed), content_generator.format_item
+    )
+
+    results = {}
+    try:
+        for mode in modes:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--single-mode", mode,
+                 "--workers", str(workers), "--games", str(games),
+                 "--quest-file", quest_file, "--item-file", item_file],
+                cwd=bench_utils.REPO_ROOT, capture_output=True, text=True, check=True
+            )
+            results[f"workers.{mode}"] = json.loads(output.stdout)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        'info': bench_utils.get_run_info(suite="workers", workers=workers,
+                                         catalog=catalog, seed=seed, games=games),
+        'results': results
+    }
+
+def print_table(report):
+    """Print startup times and shared memory per mode"""
+    print(f"{'mode':<22}{'preload ms':>11}{'ready ms':>11}{'shared MB':>11}"
+          f"{'after churn':>13}{'private MB':>12}")
+    for name, result in report['results'].items():
+        started = result['memory_started'] or {}
+        after = result['memory_after_churn'] or {}
+        print(f"{name:<22}{result['preload_s'] * 1000:>11.1f}{result['median_s'] * 1000:>11.1f}"
+              f"{started.get('shared_kb', 0) / 1024:>11.1f}{after.get('shared_kb', 0) / 1024:>13.1f}"
+              f"{after.get('private_kb', 0) / 1024:>12.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure worker startup and shared memory")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--catalog", type=int, default=20000,
+                        help="quests and items in the generated packs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--games", type=int, default=5, help="games each worker plays")
+    parser.add_argument("--mode", action="append", default=None, choices=list(MODES),
+                        help="only measure this mode (may repeat)")
+    parser.add_argument("--output", default=None, help="JSON file (table only if omitted)")
+    # Used internally to measure one mode in a fresh interpreter
+    parser.add_argument("--single-mode", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--quest-file", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--item-file", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single_mode:
+        result = measure_mode(args.single_mode, args.workers, args.quest_file,
+                              args.item_file, args.games)
+        print(json.dumps(result))
+        sys.exit(0)
+
+    report = run_worker_benchmarks(args.workers, args.catalog, args.seed, args.mode, args.games)
+    print_table(report)
+    if args.output:
+        bench_utils.write_results(report, args.output)
@@ -0,0 +1,37 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark Comparison
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Compares two benchmark result files, e.g. from two commits.
+Exits with status 1 if anything got slower than the threshold allows.
+
+Run with: python benchmarks/compare.py before.json after.json
+"""
+
+import argparse
+import sys
+
+import bench_utils
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=bench_utils.DEFAULT_THRESHOLD,
+                        help="fractional change that counts as a difference")
+    parser.add_argument("--key", default="median_s", help="result field to compare")
+    args = parser.parse_args()
+
+    rows = bench_utils.compare_results(
+        bench_utils.load_results(args.old), bench_utils.load_results(args.new),
+        threshold=args.threshold, key=args.key
+    )
+    bench_utils.print_comparison(rows)
+
+    if any(verdict == 'slower' for *_, verdict in rows):
+        sys.exit(1)
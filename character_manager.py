@@ -11,14 +11,30 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+import game_output
+import metrics
 from custom_exceptions import (
     InvalidCharacterClassError,
+    InvalidCharacterNameError,
     CharacterNotFoundError,
     SaveFileCorruptedError,
     InvalidSaveDataError,
     CharacterDeadError
 )
 
+VALID_CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+
+# Names become file names, so only letters, digits, spaces, '_' and '-'
+MAX_NAME_LENGTH = 32
+NAME_PUNCTUATION = frozenset(" _-")
+
+# Stats made of a base value plus modifiers (health is spent and restored,
+# so it is kept on its own)
+DERIVED_STATS = ("max_health", "strength", "magic")
+
+# Modifier source for the permanent boosts consumables give
+CONSUMABLE_SOURCE = "consumables"
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -32,6 +48,8 @@ def create_character(name, character_class):
     Returns: Dictionary with character data including:
             - name, class, level, health, max_health, strength, magic
             - experience, gold, inventory, active_quests, completed_quests
+            - equipped_weapon, equipped_armor (None)
+            - base_stats, stat_modifiers (see recalculate_stats)
     
     Raises: InvalidCharacterClassError if class is not valid
     """
@@ -46,7 +64,6 @@ def create_character(name, character_class):
     # - level=1, experience=0, gold=100
     # - inventory=[], active_quests=[], completed_quests=[]
     
-    VALID_CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
     # Raise InvalidCharacterClassError if class not in valid list
     if character_class.capitalize() not in VALID_CLASSES:
         
@@ -64,7 +81,9 @@ def create_character(name, character_class):
         "gold": 100,
         "inventory": [],
         "active_quests": [],
-        "completed_quests": []
+        "completed_quests": [],
+        "equipped_weapon": None,
+        "equipped_armor": None
     }
     
     # 4. Class-specific stats
@@ -79,10 +98,39 @@ def create_character(name, character_class):
     
     # Update the base dictionary with the class-specific stats
     character.update(class_stats)
+    character['base_stats'] = {stat: class_stats[stat] for stat in DERIVED_STATS}
+    character['stat_modifiers'] = {}
     
     # 5. Return the complete character
     return character
 
+def is_valid_character_name(name):
+    """
+    Check that a name is safe to use in a save file name
+    
+    Returns: True if the name is 1-32 letters, digits, spaces, '_' or '-'
+             (no dots or path separators) and does not start or end with
+             a space
+    """
+    if not isinstance(name, str) or not 0 < len(name) <= MAX_NAME_LENGTH:
+        return False
+    if name != name.strip():
+        return False
+    return all(char.isalnum() or char in NAME_PUNCTUATION for char in name)
+
+def check_character_name(name):
+    """
+    Make sure a name is safe to use in a save file name
+    
+    Raises: InvalidCharacterNameError if it is not (see is_valid_character_name)
+    """
+    if not is_valid_character_name(name):
+        raise InvalidCharacterNameError(
+            f"Invalid character name {name!r}. Use up to {MAX_NAME_LENGTH} letters, "
+            f"digits, spaces, '_' or '-'."
+        )
+
+@metrics.timed("save_character_seconds")
 def save_character(character, save_directory="data/save_games"):
     """
     Save character to file
@@ -102,9 +150,17 @@ def save_character(character, save_directory="data/save_games"):
     INVENTORY: item1,item2,item3
     ACTIVE_QUESTS: quest1,quest2
     COMPLETED_QUESTS: quest1,quest2
+    EQUIPPED_WEAPON: iron_sword
+    EQUIPPED_ARMOR: 
+    BASE_STATS: max_health:120,strength:15,magic:5
+    STAT_MODIFIERS: weapon=strength:5;consumables=magic:2
+    
+    MAX_HEALTH, STRENGTH and MAGIC are the effective values (base plus
+    modifiers); loading rebuilds them from BASE_STATS and STAT_MODIFIERS.
     
     Returns: True if successful
-    Raises: PermissionError, IOError (let them propagate or handle)
+    Raises: PermissionError, IOError (let them propagate or handle),
+            InvalidCharacterNameError if the name is not safe as a file name
     """
     # TODO: Implement save functionality
     # Create save_directory if it doesn't exist
@@ -115,6 +171,7 @@ def save_character(character, save_directory="data/save_games"):
         os.makedirs(save_directory, exist_ok=True)
         
         # 2. Define the full path for the save file
+        check_character_name(character['name'])
         filename = f"{character['name']}_save.txt"
         filepath = os.path.join(save_directory, filename)
         
@@ -135,16 +192,30 @@ def save_character(character, save_directory="data/save_games"):
             f.write(f"ACTIVE_QUESTS: {','.join(character['active_quests'])}\n")
             f.write(f"COMPLETED_QUESTS: {','.join(character['completed_quests'])}\n")
             
+            # 5. Equipment and where the stats come from
+            f.write(f"EQUIPPED_WEAPON: {character.get('equipped_weapon') or ''}\n")
+            f.write(f"EQUIPPED_ARMOR: {character.get('equipped_armor') or ''}\n")
+            base_stats = character.get('base_stats')
+            if base_stats is None:
+                base_stats = {stat: character[stat] for stat in DERIVED_STATS}
+            f.write(f"BASE_STATS: {format_stats(base_stats)}\n")
+            modifiers = character.get('stat_modifiers') or {}
+            f.write("STAT_MODIFIERS: " + ";".join(
+                f"{source}={format_stats(stats)}" for source, stats in modifiers.items()
+            ) + "\n")
+            
+        metrics.inc("saves")
         return True
     
     except IOError as e:
         # Handle file-related errors 
-        print(f"Error saving character {character['name']}: {e}")
+        game_output.say("Error saving character {}: {}", character['name'], e)
         raise  # Re-raise the exception so the caller knows it failed
     except KeyError as e:
-        print(f"Error saving: character dictionary is missing key {e}")
+        game_output.say("Error saving: character dictionary is missing key {}", e)
         raise InvalidSaveDataError(f"Character data is missing key: {e}")
 
+@metrics.timed("load_character_seconds")
 def load_character(character_name, save_directory="data/save_games"):
     """
     Load character from save file
@@ -155,6 +226,8 @@ def load_character(character_name, save_directory="data/save_games"):
     
     Returns: Character dictionary
     Raises: 
+        InvalidCharacterNameError if the name is not safe as a file name
+            (a CharacterNotFoundError, so older handlers still catch it)
         CharacterNotFoundError if save file doesn't exist
         SaveFileCorruptedError if file exists but can't be read
         InvalidSaveDataError if data format is wrong
@@ -164,12 +237,28 @@ def load_character(character_name, save_directory="data/save_games"):
     # Try to read file → SaveFileCorruptedError
     # Validate data format → InvalidSaveDataError
     # Parse comma-separated lists back into Python lists
+    check_character_name(character_name)
     file_name = f"{character_name}_save.txt"
     file_path = os.path.join(save_directory, file_name)
 
     if not os.path.exists(file_path):
         raise CharacterNotFoundError(f"Save file not found for {character_name}")
 
+    data_map = read_save_file(file_path)
+    character = character_from_save_data(data_map)
+
+    # Same checks the save audit runs (without the catalogs)
+    validate_character_data(character)
+    metrics.inc("loads")
+    return character
+        
+def read_save_file(file_path):
+    """
+    Read a save file's "KEY: value" lines
+    
+    Returns: Dictionary {KEY: value string}
+    Raises: SaveFileCorruptedError if the file can't be read or a line is malformed
+    """
     try:
         data_map = {}
 
@@ -194,6 +283,18 @@ def load_character(character_name, save_directory="data/save_games"):
     except Exception as e:
         raise SaveFileCorruptedError(f"Could not read save file: {e}")
 
+    return data_map
+
+def character_from_save_data(data_map):
+    """
+    Build a character from a save file's fields (see read_save_file)
+    
+    Effective stats are rebuilt from BASE_STATS and STAT_MODIFIERS when
+    present, and health is kept within max_health.
+    
+    Returns: Character dictionary
+    Raises: InvalidSaveDataError if a field is missing or malformed
+    """
     # Convert comma-separated strings back into lists
     try:
         character = {
@@ -202,18 +303,34 @@ def load_character(character_name, save_directory="data/save_games"):
             "level": int(data_map["LEVEL"]),
             "experience": int(data_map["EXPERIENCE"]),
             "health": int(data_map["HEALTH"]),
+            "max_health": int(data_map["MAX_HEALTH"]),
             "strength": int(data_map["STRENGTH"]),
+            "magic": int(data_map["MAGIC"]),
             "gold": int(data_map["GOLD"]),
             "inventory": data_map["INVENTORY"].split(",") if data_map["INVENTORY"] else [],
             "active_quests": data_map["ACTIVE_QUESTS"].split(",") if data_map["ACTIVE_QUESTS"] else [],
             "completed_quests": data_map["COMPLETED_QUESTS"].split(",") if data_map["COMPLETED_QUESTS"] else [],
+            "equipped_weapon": data_map.get("EQUIPPED_WEAPON") or None,
+            "equipped_armor": data_map.get("EQUIPPED_ARMOR") or None,
         }
 
-        return character
+        # Saves from before BASE_STATS existed only have effective stats;
+        # those become the base stats
+        if "BASE_STATS" in data_map:
+            character['base_stats'] = parse_stats(data_map["BASE_STATS"])
+            modifiers = {}
+            for entry in data_map.get("STAT_MODIFIERS", "").split(";"):
+                if entry:
+                    source, stats = entry.split("=", 1)
+                    modifiers[source] = parse_stats(stats)
+            character['stat_modifiers'] = modifiers
+        recalculate_stats(character)
 
     except Exception as e:
         raise InvalidSaveDataError(f"Invalid save data: {e}")
-        
+
+    return character
+
 def list_saved_characters(save_directory="data/save_games"):
     """
     Get list of all saved character names
@@ -232,7 +349,7 @@ def list_saved_characters(save_directory="data/save_games"):
         for filename in all_files:
             if filename.endswith("_save.txt"):
                 # Get the name part before "_save.txt"
-                character_name = filename[:-10] # Slices off the last 10 characters
+                character_name = filename[:-len("_save.txt")]
                 saved_chars.append(character_name)
         
         return saved_chars
@@ -246,10 +363,12 @@ def delete_character(character_name, save_directory="data/save_games"):
     Delete a character's save file
     
     Returns: True if deleted successfully
-    Raises: CharacterNotFoundError if character doesn't exist
+    Raises: CharacterNotFoundError if character doesn't exist,
+            InvalidCharacterNameError if the name is not safe as a file name
     """
     # TODO: Implement character deletion
     # Verify file exists before attempting deletion
+    check_character_name(character_name)
     filename = f"{character_name}_save.txt"
     filepath = save_directory + "/" + filename
     
@@ -263,7 +382,7 @@ def delete_character(character_name, save_directory="data/save_games"):
         return True
     except OSError as e:
         # Handle errors during deletion
-        print(f"Error deleting file {filepath}: {e}")
+        game_output.say("Error deleting file {}: {}", filepath, e)
         raise
 
 # ============================================================================
@@ -293,7 +412,7 @@ def gain_experience(character, xp_amount):
         raise CharacterDeadError(f"{character['name']} is dead and cannot gain XP.")
         
     character['experience'] += xp_amount
-    print(f"{character['name']} gained {xp_amount} XP!")
+    game_output.say("{} gained {} XP!", character['name'], xp_amount)
     
     level_up_xp = character['level'] * 100
     
@@ -301,13 +420,11 @@ def gain_experience(character, xp_amount):
     while character['experience'] >= level_up_xp:
         character['experience'] -= level_up_xp
         character['level'] += 1
-        character['max_health'] += 10
-        character['strength'] += 2
-        character['magic'] += 2
+        add_base_stats(character, max_health=10, strength=2, magic=2)
         character['health'] = character['max_health'] # Full heal
         
-        print(f"*** LEVEL UP! *** {character['name']} is now Level {character['level']}!")
-        print(f"HP: {character['max_health']}, STR: {character['strength']}, MAG: {character['magic']}")
+        game_output.say("*** LEVEL UP! *** {} is now Level {}!", character['name'], character['level'])
+        game_output.say("HP: {}, STR: {}, MAG: {}", character['max_health'], character['strength'], character['magic'])
         
         # Recalculate cost for the *next* level
         level_up_xp = character['level'] * 100
@@ -386,11 +503,213 @@ def revive_character(character):
     
     return True
 
+# ============================================================================
+# STATS
+# ============================================================================
+
+def ensure_stat_sources(character):
+    """
+    Give a character base stats and modifiers if it has none yet (e.g. a
+    dictionary built by hand); its current stats become the base stats
+    
+    Returns: The character's base_stats dictionary
+    """
+    base_stats = character.get('base_stats')
+    if base_stats is None:
+        base_stats = {stat: character[stat] for stat in DERIVED_STATS}
+        character['base_stats'] = base_stats
+    if character.get('stat_modifiers') is None:
+        character['stat_modifiers'] = {}
+    return base_stats
+
+def recalculate_stats(character):
+    """
+    Rebuild the effective stats from base stats and modifiers
+    
+    character['max_health'], ['strength'] and ['magic'] hold the results,
+    so combat and the menus read them directly; they only change when a
+    base stat or a modifier does. Health is kept within the new max_health.
+    
+    character['stat_modifiers'] maps a source to what it adds, e.g.
+    {'weapon': {'strength': 5}, 'armor': {'max_health': 10}}
+    """
+    effective = dict(ensure_stat_sources(character))
+    for stats in character['stat_modifiers'].values():
+        for stat, amount in stats.items():
+            effective[stat] += amount
+    character.update(effective)
+    if character['health'] > character['max_health']:
+        character['health'] = character['max_health']
+
+def add_base_stats(character, **amounts):
+    """
+    Change base stats, e.g. add_base_stats(character, strength=2)
+    
+    Raises: ValueError for a stat that has no base value
+    """
+    base_stats = ensure_stat_sources(character)
+    for stat, amount in amounts.items():
+        if stat not in DERIVED_STATS:
+            raise ValueError(f"'{stat}' is not a base stat")
+        base_stats[stat] += amount
+    recalculate_stats(character)
+
+def add_stat_modifier(character, source, stat, amount):
+    """
+    Add to what one source (e.g. 'weapon') gives a stat
+    
+    Raises: ValueError for a stat that cannot be modified
+    """
+    if stat not in DERIVED_STATS:
+        raise ValueError(f"'{stat}' cannot be modified")
+    ensure_stat_sources(character)
+    stats = character['stat_modifiers'].setdefault(source, {})
+    stats[stat] = stats.get(stat, 0) + amount
+    recalculate_stats(character)
+
+def remove_stat_modifier(character, source):
+    """
+    Take away everything one source gives
+    
+    Returns: The removed {stat: amount} dictionary, or None if the source
+             gave nothing
+    """
+    ensure_stat_sources(character)
+    stats = character['stat_modifiers'].pop(source, None)
+    if stats is not None:
+        recalculate_stats(character)
+    return stats
+
+def format_stats(stats):
+    """Format {stat: amount} as "stat:amount,stat:amount" for save files"""
+    return ",".join(f"{stat}:{amount}" for stat, amount in stats.items())
+
+def parse_stats(text):
+    """
+    Parse "stat:amount,stat:amount" from a save file
+    
+    Returns: Dictionary {stat: amount}
+    Raises: ValueError for a malformed entry or an unknown stat
+    """
+    stats = {}
+    for entry in text.split(","):
+        if not entry:
+            continue
+        stat, amount = entry.split(":")
+        if stat not in DERIVED_STATS:
+            raise ValueError(f"Unknown stat '{stat}'")
+        stats[stat] = int(amount)
+    return stats
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
 
-def validate_character_data(character):
+# Every required field: (name, type, smallest allowed value or None).
+# Built once; find_character_errors walks it in one pass per character.
+CHARACTER_SCHEMA = (
+    ("name", str, None),
+    ("class", str, None),
+    ("level", int, 1),
+    ("health", int, 0),
+    ("max_health", int, 1),
+    ("strength", int, 0),
+    ("magic", int, 0),
+    ("experience", int, 0),
+    ("gold", int, 0),
+    ("inventory", list, None),
+    ("active_quests", list, None),
+    ("completed_quests", list, None)
+)
+
+# Fields only newer characters have: (name, allowed types)
+OPTIONAL_SCHEMA = (
+    ("equipped_weapon", (str, type(None))),
+    ("equipped_armor", (str, type(None))),
+    ("base_stats", (dict,)),
+    ("stat_modifiers", (dict,))
+)
+
+_MISSING = object()
+
+def _has_type(value, kind):
+    """True if value is a kind (bool does not count as int)"""
+    if isinstance(value, bool) and kind is not bool:
+        return False
+    return isinstance(value, kind)
+
+def find_character_errors(character, quests=None, items=None):
+    """
+    Check a character dictionary and collect every problem found
+    
+    Checks field types, ranges (level >= 1, health <= max_health, no
+    negative gold, ...), the class, and that no quest is both active and
+    completed. With catalogs, also checks that every quest and item ID
+    the character refers to exists. Each of these runs whenever the
+    fields it looks at have the right type, so one bad field does not
+    hide problems with the others.
+    
+    Args:
+        character: Character dictionary
+        quests: Quest catalog (any mapping of quest IDs), or None
+        items: Item catalog (any mapping of item IDs), or None
+    
+    Returns: List of (field, message) tuples, empty if the character is valid
+    """
+    errors = []
+    # Fields with the right type; each later check runs if its fields are here
+    typed = set()
+    for field, kind, minimum in CHARACTER_SCHEMA:
+        value = character.get(field, _MISSING)
+        if value is _MISSING:
+            errors.append((field, f"missing required field: {field}"))
+        elif not _has_type(value, kind):
+            errors.append((field, f"'{field}' should be {kind.__name__}, "
+                                  f"found {type(value).__name__}"))
+        else:
+            typed.add(field)
+            if minimum is not None and value < minimum:
+                errors.append((field, f"'{field}' is {value}, below {minimum}"))
+    for field, kinds in OPTIONAL_SCHEMA:
+        value = character.get(field)
+        if value is not None and not any(_has_type(value, kind) for kind in kinds):
+            errors.append((field, f"'{field}' has the wrong type ({type(value).__name__})"))
+        else:
+            typed.add(field)
+    
+    if "name" in typed and not is_valid_character_name(character['name']):
+        errors.append(("name", f"name {character['name']!r} is not safe as a file name"))
+    if "class" in typed and character['class'] not in VALID_CLASSES:
+        errors.append(("class", f"unknown class '{character['class']}'"))
+    if {"health", "max_health"} <= typed and character['health'] > character['max_health']:
+        errors.append(("health", f"health {character['health']} is above "
+                                 f"max_health {character['max_health']}"))
+    
+    quest_fields = [field for field in ("active_quests", "completed_quests") if field in typed]
+    if len(quest_fields) == 2:
+        active = character['active_quests']
+        completed = character['completed_quests']
+        if active and completed:
+            for quest_id in set(active).intersection(completed):
+                errors.append(("active_quests", f"quest '{quest_id}' is both active and completed"))
+    
+    if quests is not None:
+        for field in quest_fields:
+            for quest_id in character[field]:
+                if quest_id not in quests:
+                    errors.append((field, f"unknown quest '{quest_id}'"))
+    if items is not None:
+        if "inventory" in typed:
+            for item_id in character['inventory']:
+                if item_id not in items:
+                    errors.append(("inventory", f"unknown item '{item_id}'"))
+        for field in ("equipped_weapon", "equipped_armor"):
+            item_id = character.get(field)
+            if field in typed and item_id is not None and item_id not in items:
+                errors.append((field, f"unknown item '{item_id}'"))
+    return errors
+
+def validate_character_data(character, quests=None, items=None):
     """
     Validate that character dictionary has all required fields
     
@@ -398,40 +717,17 @@ def validate_character_data(character):
                     strength, magic, experience, gold, inventory,
                     active_quests, completed_quests
     
-    Returns: True if valid
-    Raises: InvalidSaveDataError if missing fields or invalid types
-    """
-    # TODO: Implement validation
-    # Check all required keys exist
-    # Check that numeric values are numbers
-    # Check that lists are actually lists
-    REQUIRED_KEYS = [
-        "name", "class", "level", "health", "max_health", 
-        "strength", "magic", "experience", "gold", "inventory",
-        "active_quests", "completed_quests"
-    ]
-    NUMERIC_KEYS = [
-        "level", "health", "max_health", "strength", 
-        "magic", "experience", "gold"
-    ]
-    LIST_KEYS = ["inventory", "active_quests", "completed_quests"]
+    Also checks ranges and, given the catalogs, quest and item IDs
+    (see find_character_errors).
     
-    try:
-        for key in REQUIRED_KEYS:
-            if key not in character:
-                raise InvalidSaveDataError(f"Loaded data missing required field: {key}")
-        
-        for key in NUMERIC_KEYS:
-            if not isinstance(character[key], int):
-                raise InvalidSaveDataError(f"Field '{key}' is not a number. Found: {type(character[key])}")
-                
-        for key in LIST_KEYS:
-             if not isinstance(character[key], list):
-                raise InvalidSaveDataError(f"Field '{key}' is not a list. Found: {type(character[key])}")
-                
-    except TypeError:
-        raise InvalidSaveDataError("A type mismatch error occurred during validation.")
-        
+    Returns: True if valid
+    Raises: InvalidSaveDataError listing every problem found
+    """
+    errors = find_character_errors(character, quests, items)
+    if errors:
+        raise InvalidSaveDataError(
+            "Invalid character data: " + "; ".join(message for _, message in errors)
+        )
     return True
 
 # ============================================================================
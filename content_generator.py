@@ -0,0 +1,344 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Content Generator Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Generates large, valid game content for scale testing:
+- quest packs with a chosen prerequisite depth and fan-out
+- item packs of any size
+- character saves with inventories and quest histories that fit the
+  generated quests
+
+Everything comes from one seed. Each character is built from its own
+seed-derived RNG, so the saves are the same however many worker
+processes write them.
+
+Run with:
+    python content_generator.py --quests 5000 --items 100000 --saves 1000000 --output generated
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import character_manager
+import inventory_system
+import game_output
+
+# Default shape of the quest prerequisite forest
+DEFAULT_MAX_DEPTH = 6
+DEFAULT_FAN_OUT = 3
+# Chance that a new quest starts a fresh chain instead of extending one
+ROOT_CHANCE = 0.15
+# Required level goes up this much per step down a chain
+LEVELS_PER_DEPTH = 2
+
+# Item type -> stat its effect changes, and the range of the bonus
+ITEM_TYPES = {
+    'weapon': ('strength', 2, 25),
+    'armor': ('max_health', 5, 60),
+    'consumable': ('health', 10, 100)
+}
+ITEM_WORDS = {
+    'weapon': ["Sword", "Axe", "Dagger", "Mace", "Spear", "Bow", "Staff"],
+    'armor': ["Tunic", "Mail", "Plate", "Cloak", "Shield", "Helm"],
+    'consumable': ["Potion", "Elixir", "Tonic", "Draught", "Salve"]
+}
+ADJECTIVES = ["Iron", "Steel", "Ancient", "Cursed", "Blessed", "Rusty",
+              "Gleaming", "Shadow", "Ember", "Frost", "Royal", "Crude"]
+QUEST_VERBS = ["Defeat", "Escort", "Recover", "Explore", "Defend", "Investigate"]
+QUEST_TARGETS = ["the Goblin Camp", "the Lost Caravan", "the Old Mine",
+                 "the Orc Warband", "the Sunken Temple", "the Dragon's Lair"]
+
+# Saves are handed to workers in chunks of this many characters
+SAVE_CHUNK_SIZE = 2000
+
+# ============================================================================
+# QUEST PACKS
+# ============================================================================
+
+def generate_quests(count, seed=0, max_depth=DEFAULT_MAX_DEPTH, fan_out=DEFAULT_FAN_OUT):
+    """
+    Generate quests whose prerequisites form a forest of chains
+
+    Args:
+        count: Number of quests
+        seed: Random seed
+        max_depth: Longest prerequisite chain (1 = no prerequisites)
+        fan_out: Most quests that can share one prerequisite
+
+    Returns: Dictionary {quest_id: quest_data}, in generation order
+    Raises: ValueError if max_depth or fan_out is less than 1
+    """
+    if max_depth < 1 or fan_out < 1:
+        raise ValueError("max_depth and fan_out must both be at least 1")
+
+    rng = random.Random(f"quests-{seed}")
+    quests = {}
+    # Quests that can still take another follow-up: [quest_id, depth, slots left]
+    open_parents = []
+
+    for number in range(count):
+        quest_id = f"quest_{number:06d}"
+
+        if open_parents and rng.random() >= ROOT_CHANCE:
+            position = rng.randrange(len(open_parents))
+            parent = open_parents[position]
+            prerequisite, depth = parent[0], parent[1] + 1
+            parent[2] -= 1
+            if parent[2] == 0:
+                # Swap-remove the full parent
+                open_parents[position] = open_parents[-1]
+                open_parents.pop()
+        else:
+            prerequisite, depth = "NONE", 0
+
+        if depth + 1 < max_depth:
+            open_parents.append([quest_id, depth, fan_out])
+
+        quests[quest_id] = {
+            'quest_id': quest_id,
+            'title': f"{rng.choice(QUEST_VERBS)} {rng.choice(QUEST_TARGETS)} #{number}",
+            'description': f"Generated quest {number} at chain depth {depth}.",
+            'reward_xp': rng.randint(25, 150) * (depth + 1),
+            'reward_gold': rng.randint(10, 100) * (depth + 1),
+            'required_level': 1 + depth * LEVELS_PER_DEPTH,
+            'prerequisite': prerequisite
+        }
+
+    return quests
+
+def format_quest(quest):
+    """Turn a quest dictionary into its block in the quest file format"""
+    return (
+        f"QUEST_ID: {quest['quest_id']}\n"
+        f"TITLE: {quest['title']}\n"
+        f"DESCRIPTION: {quest['description']}\n"
+        f"REWARD_XP: {quest['reward_xp']}\n"
+        f"REWARD_GOLD: {quest['reward_gold']}\n"
+        f"REQUIRED_LEVEL: {quest['required_level']}\n"
+        f"PREREQUISITE: {quest['prerequisite']}\n"
+    )
+
+# ============================================================================
+# ITEM PACKS
+# ============================================================================
+
+def generate_items(count, seed=0):
+    """
+    Generate items of every type with valid effects
+
+    Returns: Dictionary {item_id: item_data}, in generation order
+    """
+    rng = random.Random(f"items-{seed}")
+    types = list(ITEM_TYPES)
+    items = {}
+
+    for number in range(count):
+        item_id = f"item_{number:06d}"
+        item_type = rng.choice(types)
+        stat, low, high = ITEM_TYPES[item_type]
+        value = rng.randint(low, high)
+        items[item_id] = {
+            'item_id': item_id,
+            'name': f"{rng.choice(ADJECTIVES)} {rng.choice(ITEM_WORDS[item_type])} {number}",
+            'type': item_type,
+            'effect': f"{stat}:{value}",
+            'cost': value * rng.randint(3, 12),
+            'description': f"Generated {item_type} that gives {stat} +{value}."
+        }
+
+    return items
+
+def format_item(item):
+    """Turn an item dictionary into its block in the item file format"""
+    return (
+        f"ITEM_ID: {item['item_id']}\n"
+        f"NAME: {item['name']}\n"
+        f"TYPE: {item['type']}\n"
+        f"EFFECT: {item['effect']}\n"
+        f"COST: {item['cost']}\n"
+        f"DESCRIPTION: {item['description']}\n"
+    )
+
+def write_pack(filename, records, format_record):
+    """Write quest or item records to a data file, blocks separated by blank lines"""
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(filename, 'w') as f:
+        f.write("\n".join(format_record(record) for record in records.values()))
+
+# ============================================================================
+# CHARACTER SAVES
+# ============================================================================
+
+class QuestIndex:
+    """Quest forest in a form that is quick to walk for save generation"""
+
+    def __init__(self, quests):
+        self.quests = quests
+        self.roots = []
+        self.children = {}
+        for quest_id, quest in quests.items():
+            if quest['prerequisite'] == "NONE":
+                self.roots.append(quest_id)
+            else:
+                self.children.setdefault(quest['prerequisite'], []).append(quest_id)
+
+def generate_character(number, seed, quest_index, item_ids):
+    """
+    Generate one mid-game character
+
+    The character follows a few quest chains as far as its level allows,
+    leaving the next quest in a chain active, and carries a random mix of
+    items.
+
+    Returns: Character dictionary (same keys create_character makes)
+    """
+    rng = random.Random(f"save-{seed}-{number}")
+    character = character_manager.create_character(
+        f"Hero{number:07d}", rng.choice(character_manager.VALID_CLASSES)
+    )
+
+    level = min(1 + int(rng.expovariate(0.25)), 50)
+    character['level'] = level
+    character['experience'] = rng.randrange(level * 100)
+    character_manager.add_base_stats(character, max_health=(level - 1) * 10,
+                                     strength=(level - 1) * 2, magic=(level - 1) * 2)
+    character['health'] = rng.randint(1, character['max_health'])
+    character['gold'] = rng.randrange(50, 200 * level)
+
+    quests = quest_index.quests
+    if quest_index.roots:
+        for _ in range(rng.randint(0, 4)):
+            quest_id = rng.choice(quest_index.roots)
+            while quest_id is not None:
+                if (quest_id in character['completed_quests']
+                        or quest_id in character['active_quests']):
+                    break
+                if quests[quest_id]['required_level'] > level or rng.random() < 0.3:
+                    # Stop here; maybe working on this one right now
+                    if quests[quest_id]['required_level'] <= level:
+                        character['active_quests'].append(quest_id)
+                    break
+                character['completed_quests'].append(quest_id)
+                follow_ups = quest_index.children.get(quest_id)
+                quest_id = rng.choice(follow_ups) if follow_ups else None
+
+    if item_ids:
+        carried = rng.randint(0, inventory_system.MAX_INVENTORY_SIZE)
+        character['inventory'] = [rng.choice(item_ids) for _ in range(carried)]
+
+    return character
+
+# Catalog each worker process builds once and reuses for all its chunks
+_worker_catalog = {}
+
+def _get_catalog(seed, quest_settings, item_count):
+    key = (seed, tuple(sorted(quest_settings.items())), item_count)
+    if key not in _worker_catalog:
+        _worker_catalog.clear()
+        _worker_catalog[key] = (
+            QuestIndex(generate_quests(seed=seed, **quest_settings)),
+            list(generate_items(item_count, seed))
+        )
+    return _worker_catalog[key]
+
+def _write_save_chunk(job):
+    """Worker entry point: write one range of saves"""
+    start, stop, seed, save_directory, quest_settings, item_count = job
+    quest_index, item_ids = _get_catalog(seed, quest_settings, item_count)
+
+    with game_output.use_sink(game_output.NullSink()):
+        for number in range(start, stop):
+            character = generate_character(number, seed, quest_index, item_ids)
+            character_manager.save_character(character, save_directory)
+    return stop - start
+
+def generate_saves(count, save_directory, seed=0, quest_count=500,
+                   max_depth=DEFAULT_MAX_DEPTH, fan_out=DEFAULT_FAN_OUT,
+                   item_count=1000, workers=None):
+    """
+    Write count character saves, in parallel worker processes
+
+    The quest and item settings must match the packs the saves will be
+    used with, since saves refer to quest and item IDs.
+
+    Args:
+        workers: Number of processes (os.cpu_count() if None, 1 writes
+                 everything in this process)
+
+    Returns: Number of saves written
+    """
+    os.makedirs(save_directory, exist_ok=True)
+    quest_settings = {'count': quest_count, 'max_depth': max_depth, 'fan_out': fan_out}
+    jobs = [
+        (start, min(start + SAVE_CHUNK_SIZE, count), seed, save_directory,
+         quest_settings, item_count)
+        for start in range(0, count, SAVE_CHUNK_SIZE)
+    ]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        return sum(_write_save_chunk(job) for job in jobs)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_write_save_chunk, jobs))
+
+def generate_content(output_directory, quest_count=500, item_count=1000, save_count=1000,
+                     seed=0, max_depth=DEFAULT_MAX_DEPTH, fan_out=DEFAULT_FAN_OUT, workers=None):
+    """
+    Write a full content set: quests.txt, items.txt and save_games/
+
+    Returns: Dictionary with the paths written and the counts
+    """
+    quest_file = os.path.join(output_directory, "quests.txt")
+    item_file = os.path.join(output_directory, "items.txt")
+    save_directory = os.path.join(output_directory, "save_games")
+
+    write_pack(quest_file, generate_quests(quest_count, seed, max_depth, fan_out), format_quest)
+    write_pack(item_file, generate_items(item_count, seed), format_item)
+    saves = generate_saves(save_count, save_directory, seed, quest_count,
+                           max_depth, fan_out, item_count, workers)
+
+    return {
+        'quest_file': quest_file,
+        'item_file': item_file,
+        'save_directory': save_directory,
+        'quests': quest_count,
+        'items': item_count,
+        'saves': saves
+    }
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate game content for scale testing")
+    parser.add_argument("--output", default="generated", help="directory to write into")
+    parser.add_argument("--quests", type=int, default=500)
+    parser.add_argument("--depth", type=int, default=DEFAULT_MAX_DEPTH,
+                        help="longest prerequisite chain")
+    parser.add_argument("--fan-out", type=int, default=DEFAULT_FAN_OUT,
+                        help="most follow-up quests per quest")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--saves", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    summary = generate_content(args.output, args.quests, args.items, args.saves,
+                               args.seed, args.depth, args.fan_out, args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {summary['quests']} quests, {summary['items']} items and "
+          f"{summary['saves']} saves to {args.output} in {elapsed:.1f}s")
@@ -59,6 +59,16 @@ class CharacterNotFoundError(CharacterError):
     """Raised when trying to load a character that doesn't exist"""
     pass
 
+class InvalidCharacterNameError(CharacterNotFoundError):
+    """
+    Raised when a character name cannot be used (e.g. as a file name)
+    
+    Subclasses CharacterNotFoundError because load_character and
+    delete_character used to raise that for these names, so existing
+    handlers still catch it.
+    """
+    pass
+
 class CharacterDeadError(CharacterError):
     """Raised when trying to perform actions with a dead character"""
     pass
@@ -0,0 +1,291 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Encounter System Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Handles party-vs-horde encounters with any number of combatants.
+Turn order comes from an initiative heap keyed by speed, and targets
+are picked from indexed lists, so each action costs O(log n) no matter
+how many combatants are in the fight.
+
+This is a library module for simulations and tests. The game itself
+(GameSession in main.py) still fights one enemy at a time with
+SimpleBattle and never creates an Encounter. Encounters are fully
+automatic and use basic attacks only: no abilities, status effects,
+items or fleeing.
+"""
+
+import heapq
+import random
+
+import character_manager
+import combat_system
+from custom_exceptions import (
+    InvalidTargetError,
+    CombatNotActiveError,
+    CharacterDeadError
+)
+
+# Speed used when a combatant has no 'speed' stat of its own
+DEFAULT_SPEED = 10
+CLASS_SPEEDS = {"Warrior": 9, "Mage": 10, "Rogue": 14, "Cleric": 10}
+
+# A combatant with speed S acts every ACTION_TIME / S time units
+ACTION_TIME = 100.0
+
+PARTY = 0
+HORDE = 1
+
+# ============================================================================
+# ENCOUNTER SETUP
+# ============================================================================
+
+def create_horde(enemy_type, count):
+    """
+    Create several enemies of the same type with numbered names
+
+    Returns: List of enemy dictionaries
+    Raises: InvalidTargetError if enemy_type not recognized
+    """
+    horde = []
+    for number in range(1, count + 1):
+        enemy = combat_system.create_enemy(enemy_type)
+        enemy['name'] = f"{enemy['name']} {number}"
+        horde.append(enemy)
+    return horde
+
+def get_speed(combatant):
+    """
+    Get a combatant's speed for the initiative order
+
+    Returns: Positive integer speed
+    """
+    if 'speed' in combatant:
+        return max(1, combatant['speed'])
+    return CLASS_SPEEDS.get(combatant.get('class'), DEFAULT_SPEED)
+
+# ============================================================================
+# ENCOUNTER
+# ============================================================================
+
+class Encounter:
+    """
+    Multi-combatant battle between a party of characters and a horde
+
+    Everyone makes basic attacks automatically (no class abilities,
+    status effects, items or fleeing). The fastest combatant always acts
+    next, so a Rogue (speed 14) gets about three turns for every two of
+    an Orc (speed 9). Not used by GameSession; see the module docstring.
+    """
+
+    def __init__(self, party, horde, rng=None, seed=None, targeting='random'):
+        """
+        Initialize an encounter
+
+        Args:
+            party: List of character dictionaries
+            horde: List of enemy dictionaries
+            rng / seed: Same as SimpleBattle
+            targeting: 'random' (any living opponent) or 'weakest'
+                       (the living opponent with the lowest health)
+        Raises: InvalidTargetError if a side is empty or targeting is unknown
+        """
+        if not party or not horde:
+            raise InvalidTargetError("An encounter needs at least one combatant per side.")
+        if targeting not in ('random', 'weakest'):
+            raise InvalidTargetError(f"Unknown targeting mode '{targeting}'.")
+
+        if rng is None:
+            if seed is None:
+                seed = random.randrange(2 ** 32)
+            rng = random.Random(seed)
+        self.rng = rng
+        self.seed = seed
+        self.targeting = targeting
+
+        self.combatants = list(party) + list(horde)
+        self.sides = [PARTY] * len(party) + [HORDE] * len(horde)
+        self.combat_active = False
+        self.actions_taken = 0
+        self.result = None
+
+        # Living combatant indexes per side, plus each one's position in
+        # that list, so removing the dead and picking a target are O(1)
+        self.alive = [[], []]
+        self.alive_position = {}
+        # Lazy min-heaps of (health, index) per side for 'weakest' targeting
+        self.health_heaps = [[], []]
+        # Initiative heap of (next_action_time, index)
+        self.initiative = []
+
+    def begin(self):
+        """
+        Set up the initiative order
+
+        Raises: CharacterDeadError if every party member is already dead
+        """
+        self.alive = [[], []]
+        self.alive_position = {}
+        self.health_heaps = [[], []]
+        self.initiative = []
+        self.actions_taken = 0
+        self.result = None
+
+        for index, combatant in enumerate(self.combatants):
+            if combatant['health'] <= 0:
+                continue
+            side = self.sides[index]
+            self.alive_position[index] = len(self.alive[side])
+            self.alive[side].append(index)
+            self.health_heaps[side].append((combatant['health'], index))
+            self.initiative.append((ACTION_TIME / get_speed(combatant), index))
+
+        if not self.alive[PARTY]:
+            raise CharacterDeadError("Cannot start encounter, the whole party is dead.")
+        if not self.alive[HORDE]:
+            raise InvalidTargetError("Cannot start encounter, the horde is already defeated.")
+
+        heapq.heapify(self.initiative)
+        heapq.heapify(self.health_heaps[PARTY])
+        heapq.heapify(self.health_heaps[HORDE])
+        self.combat_active = True
+        combat_system.display_battle_log(
+            "{} heroes face {} enemies!", len(self.alive[PARTY]), len(self.alive[HORDE])
+        )
+
+    def run(self):
+        """
+        Fight until one side is defeated
+
+        Returns: Result dictionary (see finish_encounter)
+        """
+        self.begin()
+        result = None
+        while result is None:
+            result = self.step()
+        return result
+
+    def step(self):
+        """
+        Let the next combatant in initiative order act
+
+        Returns: Result dictionary if the encounter ended, else None
+        Raises: CombatNotActiveError if the encounter is not running
+        """
+        if not self.combat_active:
+            raise CombatNotActiveError("step called when the encounter is not active.")
+
+        # Dead combatants stay in the heap and are skipped when they come up
+        while True:
+            action_time, index = heapq.heappop(self.initiative)
+            if index in self.alive_position:
+                break
+
+        attacker = self.combatants[index]
+        target_index = self.choose_target(1 - self.sides[index])
+        target = self.combatants[target_index]
+
+        damage = combat_system.calculate_attack_damage(attacker, target)
+        target['health'] = max(0, target['health'] - damage)
+        self.actions_taken += 1
+        combat_system.display_battle_log(
+            "{} hits {} for {} damage.", attacker['name'], target['name'], damage
+        )
+
+        target_side = self.sides[target_index]
+        if target['health'] <= 0:
+            self.remove_combatant(target_index)
+            combat_system.display_battle_log("{} falls!", target['name'])
+            if not self.alive[target_side]:
+                return self.finish_encounter(self.sides[index])
+        elif self.targeting == 'weakest':
+            heapq.heappush(self.health_heaps[target_side], (target['health'], target_index))
+
+        heapq.heappush(self.initiative, (action_time + ACTION_TIME / get_speed(attacker), index))
+        return None
+
+    def choose_target(self, side):
+        """
+        Pick a living combatant on a side
+
+        Returns: Index of the target in self.combatants
+        """
+        if self.targeting == 'random':
+            living = self.alive[side]
+            return living[self.rng.randrange(len(living))]
+
+        # 'weakest': throw away entries for the dead or for old health values
+        heap = self.health_heaps[side]
+        while True:
+            health, index = heap[0]
+            if index in self.alive_position and self.combatants[index]['health'] == health:
+                return index
+            heapq.heappop(heap)
+
+    def remove_combatant(self, index):
+        """Remove a dead combatant from its side's living list in O(1)"""
+        living = self.alive[self.sides[index]]
+        position = self.alive_position.pop(index)
+        last = living.pop()
+        if last != index:
+            # Move the last living combatant into the freed slot
+            living[position] = last
+            self.alive_position[last] = position
+
+    def finish_encounter(self, winning_side):
+        """
+        Grant rewards and build the result once one side is defeated
+
+        The horde's XP and gold are split evenly between surviving
+        party members.
+
+        Returns: Dictionary with winner ('party' or 'horde'), actions,
+                 survivors (names), xp_gained and gold_gained per survivor
+        """
+        self.combat_active = False
+        survivors = [self.combatants[index] for index in self.alive[winning_side]]
+        xp_each = 0
+        gold_each = 0
+
+        if winning_side == PARTY:
+            total_xp = 0
+            total_gold = 0
+            for index, combatant in enumerate(self.combatants):
+                if self.sides[index] == HORDE:
+                    rewards = combat_system.get_victory_rewards(combatant)
+                    total_xp += rewards['xp']
+                    total_gold += rewards['gold']
+
+            xp_each = total_xp // len(survivors)
+            gold_each = total_gold // len(survivors)
+            for character in survivors:
+                character_manager.gain_experience(character, xp_each)
+                character_manager.add_gold(character, gold_each)
+            combat_system.display_battle_log("The party is victorious!")
+        else:
+            combat_system.display_battle_log("The party has been wiped out...")
+
+        self.result = {
+            'winner': 'party' if winning_side == PARTY else 'horde',
+            'actions': self.actions_taken,
+            'survivors': [combatant['name'] for combatant in survivors],
+            'xp_gained': xp_each,
+            'gold_gained': gold_each
+        }
+        return self.result
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== ENCOUNTER SYSTEM TEST ===")
+
+    # party = [character_manager.create_character(f"Hero{i}", "Warrior") for i in range(5)]
+    # horde = create_horde("goblin", 45)
+    # encounter = Encounter(party, horde, seed=1, targeting='weakest')
+    # print(encounter.run())
@@ -11,6 +11,10 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import game_output
+import metrics
+import shared_catalog
+from game_records import QuestRecord, ItemRecord
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
@@ -21,6 +25,7 @@ from custom_exceptions import (
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
+@metrics.timed("load_quests_seconds")
 def load_quests(filename="data/quests.txt"):
     """
     Load quest data from file
@@ -34,7 +39,8 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
-    Returns: Dictionary of quests {quest_id: quest_data_dict}
+    Returns: Dictionary of quests {quest_id: QuestRecord} (read-only,
+             dict-like records)
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
     # TODO: Implement this function
@@ -64,13 +70,14 @@ def load_quests(filename="data/quests.txt"):
             # 3. Validate the parsed data
             validate_quest_data(quest_data)
             
-            # 4. Add to the main dictionary
-            quest_id = quest_data['quest_id']
+            # 4. Add to the main dictionary, as a shareable frozen record
+            quest = QuestRecord.from_dict(quest_data)
+            quest_id = quest.quest_id
             if quest_id in all_quests:
                 # This is a form of corruption/invalid data
                 raise InvalidDataFormatError(f"Duplicate QUEST_ID found: {quest_id}")
                 
-            all_quests[quest_id] = quest_data
+            all_quests[quest_id] = quest
             
     except InvalidDataFormatError as e:
         # Re-raise the specific error from our helpers
@@ -96,7 +103,8 @@ def load_items(filename="data/items.txt"):
     COST: 100
     DESCRIPTION: Item description
     
-    Returns: Dictionary of items {item_id: item_data_dict}
+    Returns: Dictionary of items {item_id: ItemRecord} (read-only,
+             dict-like records)
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
     # TODO: Implement this function
@@ -126,12 +134,13 @@ def load_items(filename="data/items.txt"):
             # 3. Validate
             validate_item_data(item_data)
             
-            # 4. Add to main dictionary
-            item_id = item_data['item_id']
+            # 4. Add to main dictionary, as a shareable frozen record
+            item = ItemRecord.from_dict(item_data)
+            item_id = item.item_id
             if item_id in all_items:
                 raise InvalidDataFormatError(f"Duplicate ITEM_ID found: {item_id}")
                 
-            all_items[item_id] = item_data
+            all_items[item_id] = item
             
     except InvalidDataFormatError as e:
         raise e
@@ -266,10 +275,10 @@ EFFECT: max_health:10
 COST: 30
 DESCRIPTION: A tunic made of boiled leather.
 """)
-        print("Default data files created successfully.")
+        game_output.say("Default data files created successfully.")
         
     except IOError as e:
-        print(f"Error creating default data files: {e}")
+        game_output.say("Error creating default data files: {}", e)
         # In a real game, you might want to raise this
         # but for setup, printing the error is fine.
 
@@ -376,6 +385,28 @@ def parse_item_block(lines):
         
     return item_data
 
+# ============================================================================
+# SHARED CATALOG
+# ============================================================================
+
+def publish_catalog(quests, items, name=None):
+    """
+    Put parsed quests and items in shared memory for worker processes
+
+    Returns: shared_catalog.SharedCatalog (unlink() it when the workers
+             are done; using it in a with block does that)
+    """
+    return shared_catalog.publish(quests, items, name)
+
+def attach_catalog(name):
+    """
+    Read a catalog another process published, without parsing or copying
+
+    Returns: Dictionary with read-only 'quests' and 'items' mappings
+    Raises: MissingDataFileError, CorruptedDataError
+    """
+    return shared_catalog.attach(name)
+
 # ============================================================================
 # TESTING
 # ============================================================================
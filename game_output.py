@@ -0,0 +1,209 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Output Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+All game text goes through this module instead of print().
+
+Messages are passed as a template plus arguments, e.g.
+    game_output.say("{} gained {} XP!", name, xp)
+and are only formatted if the current sink actually shows them. The sink
+defaults to the console and can be swapped for:
+- NullSink: drops everything, no formatting at all (headless runs)
+- BufferedSink: collects a whole screen and writes it in one go
+- EventSink: keeps (template, args) pairs unformatted, for tools and tests
+
+Code running for one player on another thread (e.g. a background save)
+uses bind_sink() so its messages go to that player's sink, not whichever
+sink the main thread has at the moment.
+"""
+
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# ============================================================================
+# SINKS
+# ============================================================================
+
+class ConsoleSink:
+    """Writes every message straight to a stream (stdout by default)"""
+
+    # False only for sinks that throw messages away
+    shows_output = True
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def write(self, template, args):
+        stream = self.stream or sys.stdout
+        stream.write(render(template, args) + "\n")
+
+    def flush(self):
+        stream = self.stream or sys.stdout
+        stream.flush()
+
+class NullSink:
+    """Drops every message without formatting it"""
+
+    shows_output = False
+
+    def write(self, template, args):
+        pass
+
+    def flush(self):
+        pass
+
+class BufferedSink:
+    """
+    Collects messages and writes them all at once on flush()
+
+    Formatting is also put off until flush(), so a screen that is never
+    shown costs almost nothing.
+    """
+
+    shows_output = True
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.pending = []
+
+    def write(self, template, args):
+        self.pending.append((template, args))
+
+    def flush(self):
+        if not self.pending:
+            return
+        # Swap first, so a message added from a save thread is not lost
+        pending, self.pending = self.pending, []
+        text = "".join(render(template, args) + "\n" for template, args in pending)
+        stream = self.stream or sys.stdout
+        stream.write(text)
+        stream.flush()
+
+class EventSink:
+    """
+    Records messages as structured events instead of text
+
+    Each event is a (template, args) tuple; use render() to get the text.
+    """
+
+    shows_output = True
+
+    def __init__(self):
+        self.events = []
+
+    def write(self, template, args):
+        self.events.append((template, args))
+
+    def flush(self):
+        pass
+
+    def get_text(self):
+        """Return every recorded message as formatted lines"""
+        return [render(template, args) for template, args in self.events]
+
+# ============================================================================
+# MODULE-LEVEL SINK
+# ============================================================================
+
+_sink = ConsoleSink()
+
+# Quick check for callers that want to skip building arguments entirely
+active = True
+
+# Sink bound to the current thread/context by bind_sink (None: use _sink)
+_bound_sink = ContextVar("game_output_sink", default=None)
+
+def say(template, *args):
+    """
+    Send one line of game text to the current sink
+
+    Args:
+        template: Message text, with {} placeholders for args
+        args: Values for the placeholders
+    """
+    sink = _bound_sink.get()
+    if sink is None:
+        if active:
+            _sink.write(template, args)
+    elif sink.shows_output:
+        sink.write(template, args)
+
+def ask(prompt):
+    """
+    Show any buffered output, then read a line from the player
+
+    Returns: The line the player typed (without the newline)
+    """
+    get_sink().flush()
+    return input(prompt)
+
+def flush():
+    """Flush the current sink (ends a screen for BufferedSink)"""
+    get_sink().flush()
+
+def get_sink():
+    """Return the current sink (the bound one, if any)"""
+    sink = _bound_sink.get()
+    if sink is None:
+        return _sink
+    return sink
+
+def set_sink(sink):
+    """
+    Replace the current sink
+
+    Returns: The previous sink
+    """
+    global _sink, active
+    previous = _sink
+    _sink = sink
+    active = sink.shows_output
+    return previous
+
+@contextmanager
+def use_sink(sink):
+    """Use a sink for the duration of a with block"""
+    previous = set_sink(sink)
+    try:
+        yield sink
+    finally:
+        set_sink(previous)
+
+@contextmanager
+def bind_sink(sink):
+    """
+    Use a sink for a with block in this thread/context only
+
+    Unlike use_sink this does not touch the module-level sink, so other
+    threads keep writing wherever they were.
+    """
+    token = _bound_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _bound_sink.reset(token)
+
+def render(template, args):
+    """Format a template with its arguments"""
+    if args:
+        return template.format(*args)
+    return template
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== GAME OUTPUT TEST ===")
+
+    # events = EventSink()
+    # with use_sink(events):
+    #     say("{} gained {} XP!", "Hero", 50)
+    # print(events.events)
+    # print(events.get_text())
@@ -0,0 +1,144 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Records Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Immutable quest and item records.
+
+game_data.load_quests/load_items return these instead of plain dicts.
+A record:
+- is frozen, so one record can be shared by every session (and used as
+  a cache key) without anyone changing it underneath the others
+- keeps its fields in __slots__, with no per-record dict of keys
+- interns the strings that repeat across records (IDs, prerequisites,
+  item types and effects), so each distinct value is stored once
+- reads like a read-only dict: record['title'], record.get('cost'),
+  'prerequisite' in record, dict(record)
+"""
+
+import sys
+from collections.abc import Mapping
+
+QUEST_FIELDS = ('quest_id', 'title', 'description', 'reward_xp', 'reward_gold',
+                'required_level', 'prerequisite')
+ITEM_FIELDS = ('item_id', 'name', 'type', 'effect', 'cost', 'description')
+
+# ============================================================================
+# RECORD TYPES
+# ============================================================================
+
+class GameRecord(Mapping):
+    """Frozen record with a read-only mapping interface"""
+
+    __slots__ = ()
+
+    # Field names, in order (set by each record type)
+    FIELDS = ()
+    # Fields whose values repeat across records and get interned
+    INTERNED = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+
+    def __init__(self, **fields):
+        """
+        Create a record from keyword fields
+
+        Raises: TypeError if a field is missing or unknown
+        """
+        if fields.keys() != self._field_set:
+            missing = [field for field in self.FIELDS if field not in fields]
+            unknown = [field for field in fields if field not in self._field_set]
+            raise TypeError(f"{type(self).__name__}: missing fields {missing}, "
+                            f"unknown fields {unknown}")
+        for field, value in fields.items():
+            if field in self.INTERNED and type(value) is str:
+                value = sys.intern(value)
+            object.__setattr__(self, field, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a record from a parsed dictionary (or any mapping)"""
+        return cls(**data)
+
+    # --- Frozen ---
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} records are read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} records are read-only")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (type(self).from_dict, (dict(self),))
+
+    # --- Mapping interface ---
+
+    def __getitem__(self, field):
+        if field in self._field_set:
+            return getattr(self, field)
+        raise KeyError(field)
+
+    def __contains__(self, field):
+        return field in self._field_set
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def values_tuple(self):
+        """Return the field values, in FIELDS order"""
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    # --- Hashing and comparing ---
+
+    def __hash__(self):
+        return hash((type(self), self.values_tuple()))
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return self.values_tuple() == other.values_tuple()
+        # Equal to a plain dict with the same fields
+        return Mapping.__eq__(self, other)
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+class QuestRecord(GameRecord):
+    """One quest from quests.txt"""
+
+    __slots__ = QUEST_FIELDS
+    FIELDS = QUEST_FIELDS
+    INTERNED = ('quest_id', 'prerequisite')
+
+class ItemRecord(GameRecord):
+    """One item from items.txt"""
+
+    __slots__ = ITEM_FIELDS
+    FIELDS = ITEM_FIELDS
+    INTERNED = ('item_id', 'type', 'effect')
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== GAME RECORDS TEST ===")
+
+    # potion = ItemRecord(item_id="health_potion", name="Health Potion", type="consumable",
+    #                     effect="health:20", cost=25, description="Restores 20 HP")
+    # print(potion['cost'], dict(potion), hash(potion))
@@ -0,0 +1,359 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Server Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Runs many game sessions at once over TCP (plain telnet works as a client).
+
+Every connection gets its own GameSession; all of them share one copy of
+the quest and item data. Sessions only do CPU work on the event loop.
+Save files are written on a thread pool, and if a session saves again
+while its last save is still being written only the newest state is
+kept, so slow disks never hold up other players.
+
+Run with: python game_server.py --port 4000
+"""
+
+import argparse
+import asyncio
+import collections
+import copy
+import io
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import character_manager
+import game_output
+import main
+import perf_stats
+
+# Telnet "Go Ahead": sent after each prompt so clients know it's their turn
+GO_AHEAD = b"\xff\xf9"
+ENCODING = "utf-8"
+
+# Only the most recent command timings are kept for the latency report
+LATENCY_SAMPLES = 100000
+
+# ============================================================================
+# BACKGROUND SAVES
+# ============================================================================
+
+class SaveQueue:
+    """
+    Writes one session's saves on a thread pool
+
+    At most one write per session is running at a time. Saves requested
+    while one is running replace each other, so only the newest one is
+    written next. Anything a save prints goes to the session's own output.
+    """
+
+    def __init__(self, loop, executor, save_directory, stats,
+                 save_function=character_manager.save_character):
+        self.loop = loop
+        self.executor = executor
+        self.save_directory = save_directory
+        self.stats = stats
+        self.save_function = save_function
+        self.in_flight = None
+        self.pending = None
+        self.output = None
+
+    def submit(self, session):
+        """Save a snapshot of the session's character (used as save_handler)"""
+        # Copy now: the session keeps changing the character while we write
+        snapshot = copy.deepcopy(session.character)
+        self.output = session.output
+        if self.in_flight is not None:
+            if self.pending is not None:
+                self.stats['saves_coalesced'] += 1
+            self.pending = snapshot
+            return
+        self._start(snapshot)
+
+    def _start(self, snapshot):
+        self.in_flight = self.loop.run_in_executor(
+            self.executor, self._write, snapshot, self.output
+        )
+        self.in_flight.add_done_callback(self._finished)
+
+    def _write(self, snapshot, output):
+        # Runs on a pool thread: the module-level sink belongs to whichever
+        # session the event loop is running right now, so bind ours
+        with game_output.bind_sink(output):
+            return self.save_function(snapshot, self.save_directory)
+
+    def _finished(self, future):
+        self.in_flight = None
+        if future.cancelled() or future.exception() is not None:
+            self.stats['save_errors'] += 1
+        else:
+            self.stats['saves_written'] += 1
+
+        if self.pending is not None:
+            snapshot = self.pending
+            self.pending = None
+            self._start(snapshot)
+
+    async def drain(self):
+        """Wait until every requested save has been written"""
+        while self.in_flight is not None:
+            try:
+                await self.in_flight
+            except Exception:
+                # Already counted in _finished
+                pass
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class GameServer:
+    """
+    asyncio TCP server hosting one GameSession per connection
+    """
+
+    def __init__(self, host="127.0.0.1", port=4000, shared_data=None,
+                 save_directory="data/save_games", save_workers=4,
+                 track_memory=False):
+        """
+        Set up a server (call start() to begin listening)
+
+        Args:
+            host / port: Address to listen on (port 0 picks a free port)
+            shared_data: Dictionary with 'quests' and 'items' (loaded with
+                         main.load_game_data() if None)
+            save_directory: Where all sessions save
+            save_workers: Threads used for writing save files
+            track_memory: Use tracemalloc to report memory per connection
+        """
+        self.host = host
+        self.port = port
+        self.shared_data = shared_data
+        self.save_directory = save_directory
+        self.save_workers = save_workers
+        self.track_memory = track_memory
+
+        self.server = None
+        self.executor = None
+        self.sessions = set()
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self.stats = {
+            'connections_total': 0,
+            'commands': 0,
+            'saves_written': 0,
+            'saves_coalesced': 0,
+            'save_errors': 0
+        }
+        self._memory_baseline = 0
+        self._started_tracemalloc = False
+
+    async def start(self):
+        """Load the game data and start listening"""
+        if self.shared_data is None:
+            with game_output.use_sink(game_output.NullSink()):
+                self.shared_data = main.load_game_data()
+
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self._memory_baseline = tracemalloc.get_traced_memory()[0]
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.save_workers, thread_name_prefix="game-save"
+        )
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Start (if needed) and serve until cancelled"""
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        """Stop listening and wait for pending saves"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    async def handle_connection(self, reader, writer):
+        """Play one session for one connected client"""
+        self.stats['connections_total'] += 1
+        output = io.StringIO()
+        saves = SaveQueue(asyncio.get_running_loop(), self.executor, self.save_directory, self.stats)
+        session = main.GameSession(
+            self.shared_data,
+            save_directory=self.save_directory,
+            output_stream=output,
+            save_handler=saves.submit
+        )
+        self.sessions.add(session)
+
+        try:
+            prompt = self.run_command(session, None)
+            while prompt is not None:
+                await self.send_screen(writer, output, prompt)
+                line = await reader.readline()
+                if not line:
+                    break
+                prompt = self.run_command(session, line.decode(ENCODING, errors="replace"))
+            # Whatever the session said on its way out
+            await self.send_screen(writer, output, None)
+        except ConnectionError:
+            pass
+        finally:
+            if not session.finished:
+                session.close()
+            await saves.drain()
+            self.sessions.discard(session)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def run_command(self, session, line):
+        """
+        Advance a session by one reply and time it
+
+        Returns: The session's next prompt, or None once it has ended
+        """
+        started = time.perf_counter()
+        if line is None:
+            prompt = session.start()
+        else:
+            prompt = session.send(line)
+        self.latencies.append(time.perf_counter() - started)
+        self.stats['commands'] += 1
+        return prompt
+
+    async def send_screen(self, writer, output, prompt):
+        """Send a session's pending text plus its prompt to the client"""
+        text = output.getvalue()
+        output.seek(0)
+        output.truncate()
+
+        data = text.replace("\n", "\r\n").encode(ENCODING)
+        if prompt is not None:
+            data += prompt.replace("\n", "\r\n").encode(ENCODING) + GO_AHEAD
+        if data:
+            writer.write(data)
+            await writer.drain()
+
+    def get_stats(self):
+        """
+        Report server activity
+
+        Returns: Dictionary with connection, command and save counts,
+                 latency summary (see perf_stats.summarize_latencies) and,
+                 when tracking memory, traced bytes per open connection
+        """
+        report = dict(self.stats)
+        report['connections_open'] = len(self.sessions)
+        report['latency'] = perf_stats.summarize_latencies(list(self.latencies))
+
+        if self.track_memory and tracemalloc.is_tracing():
+            used = tracemalloc.get_traced_memory()[0] - self._memory_baseline
+            report['traced_memory_bytes'] = used
+            report['memory_per_connection_bytes'] = used // max(1, len(self.sessions))
+        return report
+
+# ============================================================================
+# LOCAL CLIENT
+# ============================================================================
+
+class LocalClient:
+    """
+    Minimal client that talks to a GameServer like a telnet user would
+
+    send() returns everything the server showed up to the next prompt.
+    """
+
+    def __init__(self, host="127.0.0.1", port=4000):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.closed = False
+
+    async def connect(self):
+        """
+        Connect and read the first screen
+
+        Returns: Text of the first screen, ending with its prompt
+        """
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        return await self.read_screen()
+
+    async def send(self, line):
+        """
+        Send one reply
+
+        Returns: Text of the next screen (the last one if the session ended)
+        """
+        self.writer.write((line + "\r\n").encode(ENCODING))
+        await self.writer.drain()
+        return await self.read_screen()
+
+    async def read_screen(self):
+        """Read until the next prompt, or until the server hangs up"""
+        try:
+            data = await self.reader.readuntil(GO_AHEAD)
+            data = data[:-len(GO_AHEAD)]
+        except asyncio.IncompleteReadError as e:
+            data = e.partial
+            self.closed = True
+        return data.decode(ENCODING).replace("\r\n", "\n")
+
+    async def close(self):
+        """Hang up"""
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        self.closed = True
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+async def serve(host, port, save_directory, track_memory):
+    """Run a server until interrupted, then print its stats"""
+    server = GameServer(host, port, save_directory=save_directory, track_memory=track_memory)
+    await server.start()
+    print(f"Quest Chronicles server listening on {server.host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+        print(server.get_stats())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host Quest Chronicles over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--save-directory", default="data/save_games")
+    parser.add_argument("--track-memory", action="store_true",
+                        help="report traced memory per connection")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.save_directory, args.track_memory))
+    except KeyboardInterrupt:
+        pass
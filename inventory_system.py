@@ -16,9 +16,20 @@ from custom_exceptions import (
     InsufficientResourcesError,
     InvalidItemTypeError
 )
+from status_codes import (
+    OK,
+    ITEM_NOT_FOUND,
+    WRONG_ITEM_TYPE,
+    INVALID_ITEM_EFFECT,
+    INVENTORY_FULL,
+    NOT_ENOUGH_GOLD
+)
 
 import character_manager
 #the character manager's heal function
+import game_output
+import metrics
+import tracing
 
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
@@ -27,6 +38,7 @@ MAX_INVENTORY_SIZE = 20
 # INVENTORY MANAGEMENT
 # ============================================================================
 
+@tracing.traced("inventory_system.add_item_to_inventory")
 def add_item_to_inventory(character, item_id):
     """
     Add an item to character's inventory
@@ -48,8 +60,10 @@ def add_item_to_inventory(character, item_id):
         )
     
     character['inventory'].append(item_id)
+    record_inventory_size(character)
     return True
 
+@tracing.traced("inventory_system.remove_item_from_inventory")
 def remove_item_from_inventory(character, item_id):
     """
     Remove an item from character's inventory
@@ -64,12 +78,22 @@ def remove_item_from_inventory(character, item_id):
     # TODO: Implement item removal
     # Check if item exists in inventory
     # Remove item from list
-    if item_id not in character['inventory']:
+    if try_remove_item_from_inventory(character, item_id) != OK:
         raise ItemNotFoundError(f"Cannot remove: {item_id} not found in inventory.")
-        
-    character['inventory'].remove(item_id)
     return True
 
+def try_remove_item_from_inventory(character, item_id):
+    """
+    Remove an item from inventory without raising
+    
+    Returns: OK, or ITEM_NOT_FOUND if the item is not in inventory
+    """
+    if item_id not in character['inventory']:
+        return ITEM_NOT_FOUND
+    character['inventory'].remove(item_id)
+    record_inventory_size(character)
+    return OK
+
 def has_item(character, item_id):
     """
     Check if character has a specific item
@@ -115,6 +139,7 @@ def clear_inventory(character):
 # ITEM USAGE
 # ============================================================================
 
+@tracing.traced("inventory_system.use_item")
 def use_item(character, item_id, item_data):
     """
     Use a consumable item from inventory
@@ -139,30 +164,46 @@ def use_item(character, item_id, item_data):
     # Parse effect (format: "stat_name:value" e.g., "health:20")
     # Apply effect to character
     # Remove item from inventory
-    if not has_item(character, item_id):
+    status, effect = _use_item(character, item_id, item_data)
+    if status == ITEM_NOT_FOUND:
         raise ItemNotFoundError(f"Cannot use: {item_id} not in inventory.")
-        
-    if item_data['type'] != 'consumable':
+    if status == WRONG_ITEM_TYPE:
         raise InvalidItemTypeError(f"Cannot 'use' item of type: {item_data['type']}.")
-        
-    try:
-        stat_name, value = parse_item_effect(item_data['effect'])
-        
-        # We must use our helper to apply the effect
-        apply_stat_effect(character, stat_name, value)
-        
-        # We must remove the item *after* it's successfully used
-        remove_item_from_inventory(character, item_id)
-        
-        return f"Used {item_data.get('name', item_id)}. {stat_name} increased by {value}."
-        
-    except ValueError as e:
-        # This catches errors from parse_item_effect
-        raise InvalidItemTypeError(f"Item {item_id} has invalid effect data: {e}")
-    except ItemNotFoundError:
-        # This should not happen, but good to be safe
-        return "Error: Item was used but could not be removed."
+    if status == INVALID_ITEM_EFFECT:
+        raise InvalidItemTypeError(
+            f"Item {item_id} has invalid effect data: "
+            f"Invalid effect string format: '{item_data['effect']}'"
+        )
+    
+    stat_name, value = effect
+    return f"Used {item_data.get('name', item_id)}. {stat_name} increased by {value}."
+
+def try_use_item(character, item_id, item_data):
+    """
+    Use a consumable item without raising
+    
+    Returns: OK, ITEM_NOT_FOUND, WRONG_ITEM_TYPE or INVALID_ITEM_EFFECT
+    """
+    return _use_item(character, item_id, item_data)[0]
+
+def _use_item(character, item_id, item_data):
+    # Shared by use_item and try_use_item; returns (status, parsed effect)
+    # so the effect string is only split once
+    if item_id not in character['inventory']:
+        return ITEM_NOT_FOUND, None
+    if item_data['type'] != 'consumable':
+        return WRONG_ITEM_TYPE, None
+    effect = split_item_effect(item_data['effect'])
+    if effect is None:
+        return INVALID_ITEM_EFFECT, None
+    
+    # We must use our helper to apply the effect
+    apply_stat_effect(character, effect[0], effect[1])
+    
+    # We must remove the item *after* it's successfully used
+    return try_remove_item_from_inventory(character, item_id), effect
 
+@tracing.traced("inventory_system.equip_weapon")
 def equip_weapon(character, item_id, item_data):
     """
     Equip a weapon
@@ -173,6 +214,7 @@ def equip_weapon(character, item_id, item_data):
         item_data: Item information dictionary
     
     Weapon effect format: "strength:5" (adds 5 to strength)
+    The bonus is kept as the character's 'weapon' stat modifier.
     
     If character already has weapon equipped:
     - Unequip current weapon (remove bonus)
@@ -208,9 +250,9 @@ def equip_weapon(character, item_id, item_data):
     # Now, equip the new weapon
     try:
         stat_name, value = parse_item_effect(item_data['effect'])
-        apply_stat_effect(character, stat_name, value)
+        character_manager.add_stat_modifier(character, 'weapon', stat_name, value)
         
-        # Store equipped item info so we can unequip it later
+        # Store the equipped item so we can unequip it later
         character['equipped_weapon'] = item_id
         
         # Remove from general inventory
@@ -221,6 +263,7 @@ def equip_weapon(character, item_id, item_data):
     except ValueError as e:
         return f"Error equipping {item_id}: Invalid effect data. {e}"
 
+@tracing.traced("inventory_system.equip_armor")
 def equip_armor(character, item_id, item_data):
     """
     Equip armor
@@ -231,6 +274,10 @@ def equip_armor(character, item_id, item_data):
         item_data: Item information dictionary
     
     Armor effect format: "max_health:10" (adds 10 to max_health)
+    The bonus is kept as the character's 'armor' stat modifier. Current
+    health does not go up with it (otherwise taking armor off and putting
+    it back on would heal for free); unequipping only lowers health if it
+    is above the new max_health.
     
     If character already has armor equipped:
     - Unequip current armor (remove bonus)
@@ -261,9 +308,9 @@ def equip_armor(character, item_id, item_data):
     # Equip new armor
     try:
         stat_name, value = parse_item_effect(item_data['effect'])
-        apply_stat_effect(character, stat_name, value)
+        character_manager.add_stat_modifier(character, 'armor', stat_name, value)
         
-        character['equipped_armor'] = {item_id}
+        character['equipped_armor'] = item_id
         remove_item_from_inventory(character, item_id)
         
         return f"{unequipped_msg}Equipped {item_data.get('name', item_id)}."
@@ -271,6 +318,7 @@ def equip_armor(character, item_id, item_data):
     except ValueError as e:
         return f"Error equipping {item_id}: Invalid effect data. {e}"
 
+@tracing.traced("inventory_system.unequip_weapon")
 def unequip_weapon(character):
     """
     Remove equipped weapon and return it to inventory
@@ -290,17 +338,10 @@ def unequip_weapon(character):
     if get_inventory_space_remaining(character) <= 0:
         raise InventoryFullError("Cannot unequip weapon: Inventory is full.")
 
-    equipped = character['equipped_weapon']
-    item_id = equipped['id']
-    effect_string = equipped['effect']
+    item_id = character['equipped_weapon']
     
-    try:
-        # Remove the stat bonus by applying the *negative* value
-        stat_name, value = parse_item_effect(effect_string)
-        apply_stat_effect(character, stat_name, -value) # Apply negative
-    except ValueError:
-        print(f"Warning: Could not parse effect for equipped item {item_id}.")
-        # Continue anyway, still need to unequip it
+    # Drop the weapon's stat modifier; the stats are rebuilt without it
+    character_manager.remove_stat_modifier(character, 'weapon')
         
     # Add item back to inventory
     add_item_to_inventory(character, item_id)
@@ -310,6 +351,7 @@ def unequip_weapon(character):
     
     return item_id
 
+@tracing.traced("inventory_system.unequip_armor")
 def unequip_armor(character):
     """
     Remove equipped armor and return it to inventory
@@ -324,15 +366,8 @@ def unequip_armor(character):
     if get_inventory_space_remaining(character) <= 0:
         raise InventoryFullError("Cannot unequip armor: Inventory is full.")
 
-    equipped = character['equipped_armor']
-    item_id = equipped['id']
-    effect_string = equipped['effect']
-    
-    try:
-        stat_name, value = parse_item_effect(effect_string)
-        apply_stat_effect(character, stat_name, -value) # Apply negative
-    except ValueError:
-        print(f"Warning: Could not parse effect for equipped item {item_id}.")
+    item_id = character['equipped_armor']
+    character_manager.remove_stat_modifier(character, 'armor')
         
     add_item_to_inventory(character, item_id)
     character['equipped_armor'] = None
@@ -343,6 +378,7 @@ def unequip_armor(character):
 # SHOP SYSTEM
 # ============================================================================
 
+@tracing.traced("inventory_system.purchase_item")
 def purchase_item(character, item_id, item_data):
     """
     Purchase an item from a shop
@@ -362,18 +398,29 @@ def purchase_item(character, item_id, item_data):
     # Check if inventory has space
     # Subtract gold from character
     # Add item to inventory
-    cost = item_data['cost']
+    status = try_purchase_item(character, item_id, item_data)
 
     # Not enough gold → raise the test’s expected error
-    if character['gold'] < cost:
+    if status == NOT_ENOUGH_GOLD:
         raise InsufficientResourcesError(
-            f"Cannot buy {item_id}: Costs {cost} gold, "
+            f"Cannot buy {item_id}: Costs {item_data['cost']} gold, "
             f"you only have {character['gold']}."
         )
-
-    # Inventory limit check (typical pattern: max size = 20)
-    if len(character['inventory']) >= 20:
+    if status == INVENTORY_FULL:
         raise InventoryFullError("Inventory is full, cannot purchase item.")
+    return True
+
+def try_purchase_item(character, item_id, item_data):
+    """
+    Purchase an item without raising
+    
+    Returns: OK, NOT_ENOUGH_GOLD or INVENTORY_FULL
+    """
+    cost = item_data['cost']
+    if character['gold'] < cost:
+        return NOT_ENOUGH_GOLD
+    if len(character['inventory']) >= MAX_INVENTORY_SIZE:
+        return INVENTORY_FULL
 
     # Subtract gold
     character['gold'] -= cost
@@ -381,9 +428,12 @@ def purchase_item(character, item_id, item_data):
     # Add item to inventory
     character['inventory'].append(item_id)
 
-    return True
+    metrics.inc("purchases")
+    record_inventory_size(character)
+    return OK
 
 
+@tracing.traced("inventory_system.sell_item")
 def sell_item(character, item_id, item_data):
     """
     Sell an item for half its purchase cost
@@ -413,6 +463,19 @@ def sell_item(character, item_id, item_data):
 # HELPER FUNCTIONS
 # ============================================================================
 
+def record_inventory_size(character):
+    """
+    Record a character's inventory size (if metrics are on)
+    
+    Goes into one histogram and one high-water gauge for every character:
+    a label per character name would add a new series for each player
+    ever seen.
+    """
+    if metrics.enabled:
+        size = len(character['inventory'])
+        metrics.observe("inventory_items", size)
+        metrics.raise_gauge("inventory_items_max", size)
+
 def parse_item_effect(effect_string):
     """
     Parse item effect string into stat name and value
@@ -426,14 +489,27 @@ def parse_item_effect(effect_string):
     # TODO: Implement effect parsing
     # Split on ":"
     # Convert value to integer
-    try:
-        parts = effect_string.split(':')
-        stat_name = parts[0]
-        value = int(parts[1])
-        return (stat_name, value)
-    except (IndexError, ValueError):
+    effect = split_item_effect(effect_string)
+    if effect is None:
         # Raise an error that the calling function can catch
         raise ValueError(f"Invalid effect string format: '{effect_string}'")
+    return effect
+
+def split_item_effect(effect_string):
+    """
+    Parse an item effect string without raising
+    
+    Returns: Tuple of (stat_name, value), or None if the string is not
+             in "stat_name:value" format
+    """
+    parts = effect_string.split(':')
+    if len(parts) < 2:
+        return None
+    number = parts[1].strip()
+    digits = number[1:] if number[:1] in ('-', '+') else number
+    if not digits.isdecimal():
+        return None
+    return (parts[0], int(number))
 
 def apply_stat_effect(character, stat_name, value):
     """
@@ -442,6 +518,9 @@ def apply_stat_effect(character, stat_name, value):
     Valid stats: health, max_health, strength, magic
     
     Note: health cannot exceed max_health
+    
+    max_health, strength and magic boosts are kept as the character's
+    consumables stat modifier, apart from its base stats.
     """
     # TODO: Implement stat application
     # Add value to character[stat_name]
@@ -451,19 +530,16 @@ def apply_stat_effect(character, stat_name, value):
         # as it handles the max_health clamp
         character_manager.heal_character(character, value)
     
-    elif stat_name == 'max_health':
-        character['max_health'] += value
-        # If we *add* max_health, we should also get that health
-        character_manager.heal_character(character, value)
-        
-    elif stat_name == 'strength':
-        character['strength'] += value
-        
-    elif stat_name == 'magic':
-        character['magic'] += value
+    elif stat_name in character_manager.DERIVED_STATS:
+        character_manager.add_stat_modifier(
+            character, character_manager.CONSUMABLE_SOURCE, stat_name, value
+        )
+        if stat_name == 'max_health':
+            # If we *add* max_health, we should also get that health
+            character_manager.heal_character(character, value)
         
     else:
-        print(f"Warning: Invalid stat name '{stat_name}' in apply_stat_effect")
+        game_output.say("Warning: Invalid stat name '{}' in apply_stat_effect", stat_name)
 
 def display_inventory(character, item_data_dict):
     """
@@ -478,9 +554,9 @@ def display_inventory(character, item_data_dict):
     # TODO: Implement inventory display
     # Count items (some may appear multiple times)
     # Display with item names from item_data_dict
-    print("--- INVENTORY ---")
+    game_output.say("--- INVENTORY ---")
     if not character['inventory']:
-        print(" (Empty)")
+        game_output.say(" (Empty)")
         return
 
     # 1. Count the items
@@ -494,12 +570,12 @@ def display_inventory(character, item_data_dict):
         item_info = item_data_dict.get(item_id)
         
         if item_info:
-            print(f"- {item_info.get('name', item_id)} (x{quantity})")
+            game_output.say("- {} (x{})", item_info.get('name', item_id), quantity)
         else:
             # Fallback in case item data is missing
-            print(f"- {item_id} (x{quantity}) [Unknown Item]")
+            game_output.say("- {} (x{}) [Unknown Item]", item_id, quantity)
             
-    print(f"Space remaining: {get_inventory_space_remaining(character)}")
+    game_output.say("Space remaining: {}", get_inventory_space_remaining(character))
 
 # ============================================================================
 # TESTING
@@ -0,0 +1,363 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Load Generator Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Simulates many players at once to measure how much game logic one CPU
+core can keep up with.
+
+Bot players pick weighted random actions (explore, buy, sell, accept and
+complete quests, equip, use items) and carry them out with the same
+module calls the menus in main.py use, saving after every action like
+the real game does. Each action is timed, and the report gives
+throughput plus p50/p95/p99 latency per action type.
+
+Run with: python load_generator.py --players 100 --actions 200
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import character_manager
+import inventory_system
+import quest_handler
+import combat_system
+import game_data
+import game_output
+import main
+import perf_stats
+from custom_exceptions import GameError
+
+# Relative weight of each action in a bot's mix
+DEFAULT_ACTION_MIX = {
+    'explore': 35,
+    'buy': 15,
+    'sell': 10,
+    'accept_quest': 15,
+    'complete_quest': 10,
+    'equip': 10,
+    'use_item': 5
+}
+
+# Battles end in a few dozen rounds; this just stops a broken one
+MAX_BATTLE_ROUNDS = 500
+
+# ============================================================================
+# BOT PLAYER
+# ============================================================================
+
+class BotPlayer:
+    """One simulated player with its own character and random choices"""
+
+    def __init__(self, number, shared_data, save_directory, rng):
+        self.rng = rng
+        self.shared_data = shared_data
+        self.save_directory = save_directory
+        char_class = rng.choice(character_manager.VALID_CLASSES)
+        self.character = character_manager.create_character(f"Bot{number}", char_class)
+
+    def perform(self, action):
+        """
+        Carry out one action
+
+        Buying, accepting quests and using items go through the non-raising
+        try_* calls, since bots are refused those often.
+
+        Returns: A status code (status_codes.OK when done) or None
+        Raises: GameError when the game refuses another action, which is
+                normal for a bot
+        """
+        return getattr(self, "do_" + action)()
+
+    def autosave(self):
+        """Save like GameSession does after every action"""
+        character_manager.save_character(self.character, self.save_directory)
+
+    def do_explore(self):
+        character = self.character
+        if character_manager.is_character_dead(character):
+            character_manager.revive_character(character)
+
+        enemy = combat_system.get_random_enemy_for_level(character['level'])
+        battle = combat_system.SimpleBattle(character, enemy, seed=self.rng.randrange(2 ** 32))
+        battle.begin()
+        result = None
+        rounds = 0
+        while result is None and rounds < MAX_BATTLE_ROUNDS:
+            # Special ability when ready, otherwise attack
+            choice = '2' if battle.ability_cooldown == 0 else '1'
+            result = battle.step(choice)
+            rounds += 1
+
+    def do_buy(self):
+        items = self.shared_data['items']
+        item_id = self.rng.choice(list(items))
+        return inventory_system.try_purchase_item(self.character, item_id, items[item_id])
+
+    def do_sell(self):
+        inventory = self.character['inventory']
+        if not inventory:
+            return
+        item_id = self.rng.choice(inventory)
+        inventory_system.sell_item(self.character, item_id, self.shared_data['items'][item_id])
+
+    def do_accept_quest(self):
+        quests = self.shared_data['quests']
+        available = quest_handler.get_available_quests(self.character, quests)
+        if not available:
+            return
+        quest = self.rng.choice(available)
+        return quest_handler.try_accept_quest(self.character, quest['quest_id'], quests)
+
+    def do_complete_quest(self):
+        active = self.character['active_quests']
+        if not active:
+            return
+        quest_id = self.rng.choice(active)
+        quest_handler.complete_quest(self.character, quest_id, self.shared_data['quests'])
+
+    def do_equip(self):
+        items = self.shared_data['items']
+        gear = [item_id for item_id in self.character['inventory']
+                if items[item_id]['type'] in ('weapon', 'armor')]
+        if not gear:
+            return
+        item_id = self.rng.choice(gear)
+        if items[item_id]['type'] == 'weapon':
+            inventory_system.equip_weapon(self.character, item_id, items[item_id])
+        else:
+            inventory_system.equip_armor(self.character, item_id, items[item_id])
+
+    def do_use_item(self):
+        items = self.shared_data['items']
+        consumables = [item_id for item_id in self.character['inventory']
+                       if items[item_id]['type'] == 'consumable']
+        if not consumables:
+            return
+        item_id = self.rng.choice(consumables)
+        return inventory_system.try_use_item(self.character, item_id, items[item_id])
+
+# ============================================================================
+# RUNNING LOAD
+# ============================================================================
+
+def run_load(players=100, actions_per_player=100, seed=0, action_mix=None,
+             shared_data=None, save_directory=None, first_player=0):
+    """
+    Run bot players in this process and collect raw timings
+
+    Players take turns one action at a time, like interleaved sessions
+    on one server core.
+
+    Args:
+        players: Number of bots
+        actions_per_player: Actions each bot performs
+        seed: Seed for the bots' choices and battles
+        action_mix: Dictionary {action: weight} (DEFAULT_ACTION_MIX if None)
+        shared_data: Dictionary with 'quests' and 'items'
+        save_directory: Where bots save (a temporary directory if None)
+        first_player: Number of the first bot (keeps names unique across
+                      worker processes)
+
+    Returns: Dictionary with elapsed seconds, latencies {action: [seconds]},
+             rejected {action: count} and errors {action: [messages]}
+    """
+    if action_mix is None:
+        action_mix = DEFAULT_ACTION_MIX
+    for action in action_mix:
+        if not hasattr(BotPlayer, "do_" + action):
+            raise ValueError(f"Unknown bot action '{action}'")
+
+    if shared_data is None:
+        with game_output.use_sink(game_output.NullSink()):
+            shared_data = main.load_game_data()
+
+    temporary = save_directory is None
+    if temporary:
+        save_directory = tempfile.mkdtemp(prefix="quest_load_")
+
+    rng = random.Random(seed)
+    actions = list(action_mix)
+    weights = [action_mix[action] for action in actions]
+    latencies = {action: [] for action in actions + ['autosave']}
+    rejected = {action: 0 for action in actions}
+    errors = {action: [] for action in actions}
+
+    try:
+        with game_output.use_sink(game_output.NullSink()):
+            bots = [
+                BotPlayer(first_player + number, shared_data, save_directory,
+                          random.Random(rng.randrange(2 ** 32)))
+                for number in range(players)
+            ]
+
+            clock = time.perf_counter
+            started = clock()
+            for _ in range(actions_per_player):
+                for bot in bots:
+                    action = bot.rng.choices(actions, weights)[0]
+                    action_start = clock()
+                    try:
+                        if bot.perform(action):
+                            # A try_* call refused the action
+                            rejected[action] += 1
+                    except GameError:
+                        rejected[action] += 1
+                    except Exception as e:
+                        # A bug in the game code, not a refused action
+                        errors[action].append(f"{type(e).__name__}: {e}")
+                    save_start = clock()
+                    bot.autosave()
+                    save_end = clock()
+                    latencies[action].append(save_start - action_start)
+                    latencies['autosave'].append(save_end - save_start)
+            elapsed = clock() - started
+    finally:
+        if temporary:
+            shutil.rmtree(save_directory, ignore_errors=True)
+
+    return {
+        'elapsed': elapsed,
+        'latencies': latencies,
+        'rejected': rejected,
+        'errors': errors
+    }
+
+def _run_worker(job):
+    """Worker entry point: job is keyword arguments for run_load plus catalog_name"""
+    job = dict(job)
+    job['shared_data'] = main.attach_game_data(job.pop('catalog_name'))
+    return run_load(**job)
+
+def generate_load(players=100, actions_per_player=100, seed=0, action_mix=None, workers=1):
+    """
+    Run bot players, optionally split across worker processes
+
+    Returns: Report dictionary (see build_report)
+    """
+    if workers <= 1:
+        runs = [run_load(players, actions_per_player, seed, action_mix)]
+    else:
+        # The data is parsed once here; workers attach to it in shared memory
+        with game_output.use_sink(game_output.NullSink()):
+            shared_data = main.load_game_data()
+        catalog = game_data.publish_catalog(shared_data['quests'], shared_data['items'])
+
+        share, extra = divmod(players, workers)
+        jobs = []
+        first_player = 0
+        for worker in range(workers):
+            count = share + (1 if worker < extra else 0)
+            jobs.append({
+                'players': count,
+                'actions_per_player': actions_per_player,
+                'seed': seed + worker,
+                'action_mix': action_mix,
+                'first_player': first_player,
+                'catalog_name': catalog.name
+            })
+            first_player += count
+        with catalog, ProcessPoolExecutor(max_workers=workers) as pool:
+            runs = list(pool.map(_run_worker, jobs))
+
+    return build_report(runs, players, workers)
+
+def build_report(runs, players, workers):
+    """
+    Combine raw timings from one or more runs
+
+    Returns: Dictionary with players, workers, actions, elapsed (slowest
+             worker), actions_per_second, mean_action_seconds (action plus
+             autosave) and by_action {action: latency summary + rejected
+             + errors}
+    """
+    latencies = {}
+    rejected = {}
+    errors = {}
+    for run in runs:
+        for action, values in run['latencies'].items():
+            latencies.setdefault(action, []).extend(values)
+        for action, count in run['rejected'].items():
+            rejected[action] = rejected.get(action, 0) + count
+        for action, messages in run['errors'].items():
+            errors.setdefault(action, []).extend(messages)
+
+    elapsed = max(run['elapsed'] for run in runs)
+    busy_time = sum(sum(values) for values in latencies.values())
+    total_actions = sum(len(values) for action, values in latencies.items()
+                        if action != 'autosave')
+
+    by_action = {}
+    for action, values in latencies.items():
+        summary = perf_stats.summarize_latencies(values)
+        if action != 'autosave':
+            summary['rejected'] = rejected.get(action, 0)
+            summary['errors'] = len(errors.get(action, []))
+            summary['first_error'] = errors[action][0] if errors.get(action) else None
+        by_action[action] = summary
+
+    return {
+        'players': players,
+        'workers': workers,
+        'actions': total_actions,
+        'elapsed': elapsed,
+        'actions_per_second': total_actions / elapsed if elapsed else 0.0,
+        'mean_action_seconds': busy_time / total_actions if total_actions else 0.0,
+        'by_action': by_action
+    }
+
+def players_per_core(report, think_time):
+    """
+    Estimate how many real players one core could serve
+
+    A player who spends think_time seconds between commands uses
+    mean_action_seconds / think_time of a core.
+
+    Returns: Estimated number of players
+    """
+    if report['mean_action_seconds'] == 0:
+        return 0
+    return int(think_time / report['mean_action_seconds'])
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def print_report(report, think_time):
+    """Print a report as a table"""
+    print(f"{report['players']} players, {report['actions']} actions "
+          f"in {report['elapsed']:.2f}s on {report['workers']} worker(s) "
+          f"= {report['actions_per_second']:.0f} actions/s")
+    print(f"~{players_per_core(report, think_time)} players per core "
+          f"at {think_time:g}s between commands")
+    print(f"{'action':<16}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'rejected':>10}{'errors':>8}")
+    for action, summary in report['by_action'].items():
+        print(f"{action:<16}{summary['count']:>8}{summary['p50_ms']:>10.3f}"
+              f"{summary['p95_ms']:>10.3f}{summary['p99_ms']:>10.3f}"
+              f"{summary.get('rejected', ''):>10}{summary.get('errors', ''):>8}")
+    for action, summary in report['by_action'].items():
+        if summary.get('first_error'):
+            print(f"First {action} error: {summary['first_error']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate many players")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--actions", type=int, default=100, help="actions per player")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--think-time", type=float, default=5.0,
+                        help="seconds a real player waits between commands")
+    args = parser.parse_args()
+
+    report = generate_load(args.players, args.actions, args.seed, workers=args.workers)
+    print_report(report, args.think_time)
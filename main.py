@@ -9,628 +9,981 @@ AI Usage: Used an AI assistant to help explain and break down the
 
 This is the main game file that ties all modules together.
 Demonstrates module integration and complete game flow.
+
+All game state lives in a GameSession, so one process can host many
+games at once. Menu methods are generators: each one yields the prompt
+it wants answered and receives the player's reply, so a session never
+blocks on input() itself. GameSession.run() plays a session on the
+console; start()/send() let other code (servers, scripts) drive it one
+line at a time.
 """
 
-# Import all our custom modules
-import character_manager
-import inventory_system
-import quest_handler
-import combat_system
-import game_data
-from custom_exceptions import *
+import contextvars
+import importlib.util
+import random
+import sys
+import time
+
+import game_output
+import metrics
+import tracing
+from custom_exceptions import (
+    MissingDataFileError,
+    InvalidDataFormatError,
+    CorruptedDataError,
+    InvalidCharacterClassError,
+    InvalidCharacterNameError,
+    CharacterNotFoundError,
+    CharacterDeadError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError,
+    InventoryFullError,
+    ItemNotFoundError,
+    InsufficientResourcesError,
+    InvalidItemTypeError,
+    QuestNotFoundError,
+    QuestRequirementsNotMetError,
+    QuestAlreadyCompletedError,
+    QuestNotActiveError,
+    InsufficientLevelError
+)
 
 # ============================================================================
-# GAME STATE
+# LAZY IMPORTS
 # ============================================================================
 
-# Global variables for game data
-current_character = None
-all_quests = {}
-all_items = {}
-game_running = False
+def lazy_import(name):
+    """
+    Import a module the first time one of its attributes is used
+
+    Returns: The module (the real one if it was already imported)
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+# The main menu needs none of the game subsystems, so they are only
+# really imported once a game starts
+character_manager = lazy_import("character_manager")
+inventory_system = lazy_import("inventory_system")
+quest_handler = lazy_import("quest_handler")
+combat_system = lazy_import("combat_system")
+game_data = lazy_import("game_data")
 
 # ============================================================================
-# MAIN MENU
+# SHARED GAME DATA
 # ============================================================================
 
-def main_menu():
-    """
-    Display main menu and get player choice
-    
-    Options:
-    1. New Game
-    2. Load Game
-    3. Exit
-    
-    Returns: Integer choice (1-3)
-    """
-    # TODO: Implement main menu display
-    # Show options
-    # Get user input
-    # Validate input (1-3)
-    # Return choice
-    print("\n" + "=" * 20)
-    print("      MAIN MENU")
-    print("=" * 20)
-    print("1. New Game")
-    print("2. Load Game")
-    print("3. Exit")
-    
-    while True:
-        choice = input("Select an option (1-3): ")
-        if choice in ['1', '2', '3']:
-            return int(choice)
-        else:
-            print("Invalid choice. Please enter 1, 2, or 3.")
+# Quests and items are loaded once per process and shared by every session.
+# Sessions only ever read them. Keyed by (quest_file, item_file).
+_shared_game_data = {}
 
-def new_game():
+def load_game_data(quest_file="data/quests.txt", item_file="data/items.txt"):
     """
-    Start a new game
-    
-    Prompts for:
-    - Character name
-    - Character class
-    
-    Creates character and starts game loop
+    Load all quest and item data from files
+
+    Only the first call for a pair of files reads them; later calls with
+    the same files return the same data.
+
+    Args:
+        quest_file / item_file: Data files to read
+
+    Returns: Dictionary with 'quests' and 'items'
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError,
+            QuestNotFoundError (invalid prerequisite)
     """
-    global current_character
-    
-    # TODO: Implement new game creation
-    # Get character name from user
-    # Get character class from user
-    # Try to create character with character_manager.create_character()
-    # Handle InvalidCharacterClassError
-    # Save character
-    # Start game loop
-    print("\n--- NEW GAME ---")
-    name = input("Enter your character's name: ").strip()
-    if not name:
-        print("Name cannot be empty. Returning to main menu.")
-        return
+    data = _shared_game_data.get((quest_file, item_file))
+    if data is None:
+        # 1. CALL game_data
+        # This will raise MissingDataFileError or InvalidDataFormatError
+        quests = game_data.load_quests(quest_file)
+        items = game_data.load_items(item_file)
 
-    # Use the VALID_CLASSES constant from the module
-    print(f"Valid classes are: {', '.join(character_manager.VALID_CLASSES)}")
-    char_class = input("Choose your class: ").strip().capitalize()
-    
-    try:
-        # 1. CALL character_manager
-        current_character = character_manager.create_character(name, char_class)
-        print(f"\nCharacter {name} the {char_class} has been created!")
-        
-        # 2. CALL save_game helper
-        save_game()
-        print(f"Game saved. Welcome, {name}!")
-        
-        # 3. START game loop
-        game_loop()
-        
-    except InvalidCharacterClassError as e:
-        # 3. CATCH exception
-        print(f"Error: {e}")
-        print("Returning to main menu.")
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
+        # 2. CALL quest_handler (validation)
+        quest_handler.validate_quest_prerequisites(quests)
+        game_output.say("Game data and quest prerequisites validated.")
 
+        data = _shared_game_data[(quest_file, item_file)] = {'quests': quests, 'items': items}
 
-def load_game():
+    return data
+
+def attach_game_data(catalog_name, quest_file="data/quests.txt", item_file="data/items.txt"):
     """
-    Load an existing saved game
-    
-    Shows list of saved characters
-    Prompts user to select one
+    Share a catalog published with game_data.publish_catalog instead of
+    reading the data files (for worker processes)
+
+    Args:
+        catalog_name: Name of the published catalog
+        quest_file / item_file: Files the catalog was loaded from, so that
+                                load_game_data for them returns it
+
+    Returns: Dictionary with 'quests' and 'items'
     """
-    global current_character
-    print("\n--- LOAD GAME ---")
-    
-    # 1. CALL character_manager
-    saved_chars = character_manager.list_saved_characters()
-    
-    if not saved_chars:
-        print("No saved games found.")
-        return
-        
-    print("Available characters:")
-    for i, name in enumerate(saved_chars, 1):
-        print(f"{i}. {name}")
-        
-    choice = input("Enter the name of the character to load: ").strip()
-    
-    try:
-        # 2. CALL character_manager
-        current_character = character_manager.load_character(choice)
-        print(f"\nWelcome back, {current_character['name']}!")
-        
-        # 3. START game loop
-        game_loop()
-        
-    except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
-        # 4. CATCH exceptions
-        print(f"Error loading game: {e}")
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-
-    # TODO: Implement game loading
-    # Get list of saved characters
-    # Display them to user
-    # Get user choice
-    # Try to load character with character_manager.load_character()
-    # Handle CharacterNotFoundError and SaveFileCorruptedError
-    # Start game loop
-    
+    data = _shared_game_data[(quest_file, item_file)] = game_data.attach_catalog(catalog_name)
+    return data
 
 # ============================================================================
-# GAME LOOP
+# GAME SESSION
 # ============================================================================
 
-def game_loop():
+# Game menu choice -> action name, used by profiling and tracing tools
+GAME_ACTIONS = {
+    1: 'view_stats',
+    2: 'inventory',
+    3: 'quests',
+    4: 'explore',
+    5: 'shop',
+    6: 'save_and_quit'
+}
+
+class GameSession:
     """
-    Main game loop - shows game menu and processes actions
+    One player's game: their character, their screen, their input
+
+    Holds a reference to the shared quest/item data instead of a copy.
     """
-    global game_running, current_character
-    
-    game_running = True
-    
-    while game_running:
-        
-        # 1. Check for death first!
-        # We also check if current_character is None, just in case
-        if current_character and character_manager.is_character_dead(current_character):
-            # Call the correct function and get return values
-            current_character, game_running = handle_character_death(current_character)
-            # If they quit, game_running will be False and the loop will exit
-            continue
-            
-        # 2. Display menu and get choice
-        choice = game_menu()
-        
-        # 3. Execute action
-        if choice == 1:
-            view_character_stats()
-        elif choice == 2:
-            view_inventory()
-        elif choice == 3:
-            quest_menu()
-        elif choice == 4:
-            explore()
-        elif choice == 5:
-            shop()
-        elif choice == 6:
-            save_game()
-            print("\nGame saved. Goodbye!")
-            game_running = False # Exit the loop
-            
-        # 4. Save after every action (unless quitting)
-        if game_running:
+
+    def __init__(self, shared_data=None, save_directory="data/save_games",
+                 input_stream=None, output_stream=None, seed=None,
+                 save_handler=None):
+        """
+        Create a session
+
+        Args:
+            shared_data: Dictionary with 'quests' and 'items' (loaded with
+                         load_game_data() when the session starts if None)
+            save_directory: Where this session's saves go
+            input_stream: Where run() reads replies (stdin by default)
+            output_stream: Where the session's screens are written
+                           (stdout by default)
+            seed: Seed for this session's battles (random if None)
+            save_handler: Function(session) that takes over writing saves,
+                          e.g. to do it in the background (None writes
+                          them right away)
+        """
+        self.shared_data = shared_data
+        self.save_directory = save_directory
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+        self.output = game_output.BufferedSink(output_stream)
+        self.rng = random.Random(seed)
+        self.save_handler = save_handler
+
+        self.character = None
+        self.game_running = False
+        self.finished = False
+        self._flow = None
+        # Name of the game menu action in progress (None between actions)
+        self.current_action = None
+        # Last action started, kept after it finishes
+        self.last_action = None
+        # Trace span of the action in progress, and of the last one started
+        self.action_span = None
+        self.last_action_span = None
+        # Processing time of the action in progress so far (metrics only)
+        self.action_seconds = 0.0
+
+    @property
+    def quests(self):
+        return self.shared_data['quests']
+
+    @property
+    def items(self):
+        return self.shared_data['items']
+
+    # ------------------------------------------------------------------------
+    # Driving the session
+    # ------------------------------------------------------------------------
+
+    def start(self):
+        """
+        Begin the session and run it up to the first prompt
+
+        Returns: The first prompt, or None if the session ended already
+        """
+        self._flow = self.run_flow()
+        self.finished = False
+        return self._advance(None)
+
+    def send(self, line):
+        """
+        Give the player's reply to the current prompt
+
+        Returns: The next prompt, or None once the session has ended
+        """
+        if self.finished or self._flow is None:
+            return None
+        return self._advance(line.rstrip("\r\n"))
+
+    def run(self):
+        """Play the whole session, reading replies from the input stream"""
+        self.play(self.run_flow())
+
+    def play(self, flow):
+        """
+        Drive any menu generator with replies from the input stream
+
+        Stops early if the input stream runs out (end of file).
+        """
+        self._flow = flow
+        self.finished = False
+        prompt = self._advance(None)
+
+        while prompt is not None:
+            line = self._read_line(prompt)
+            if line is None:
+                self.close()
+                break
+            prompt = self._advance(line)
+
+    def close(self):
+        """Stop the session wherever it is"""
+        if self._flow is not None:
+            with game_output.use_sink(self.output):
+                self._flow.close()
+        self.output.flush()
+        self.finished = True
+
+    def _advance(self, reply):
+        action = self.current_action
+        self.last_action = None
+        started = time.perf_counter() if metrics.enabled else 0.0
+
+        # Anything any module says while this session runs goes to its screen
+        with game_output.use_sink(self.output):
             try:
-                # We auto-save the character after every action
-                character_manager.save_character(current_character)
-            except IOError as e:
-                print(f"!! CRITICAL: Failed to auto-save game: {e} !!")
+                if tracing.enabled:
+                    # A private context copy keeps this session's current span
+                    # away from other sessions sharing the thread
+                    prompt = contextvars.copy_context().run(self._send_traced, reply)
+                else:
+                    prompt = self._flow.send(reply)
+            except StopIteration:
+                prompt = None
+                self.finished = True
+        self.output.flush()
+
+        if metrics.enabled:
+            # Add up the steps of an action (not the time waiting for the
+            # player) and record the total once, when the action ends
+            self.action_seconds += time.perf_counter() - started
+            finished = action or self.last_action
+            if self.current_action is None and finished is not None:
+                metrics.observe("game_action_seconds", self.action_seconds,
+                                {'action': finished})
+                self.action_seconds = 0.0
+        return prompt
+
+    def _send_traced(self, reply):
+        # The action span stays open while waiting for replies, so its
+        # busy_ms attribute adds up only the time spent processing them
+        span = self.action_span
+        self.last_action_span = None
+        tracing.set_current(span)
+        started = time.perf_counter()
+        try:
+            return self._flow.send(reply)
+        finally:
+            span = span or self.action_span or self.last_action_span
+            if span is not None:
+                busy = span.attributes.get('busy_ms', 0.0)
+                span.set('busy_ms', busy + (time.perf_counter() - started) * 1000)
+
+    def _read_line(self, prompt):
+        if self.input_stream is None and self.output_stream is None:
+            try:
+                return input(prompt)
+            except EOFError:
+                return None
+
+        stream = self.output_stream or sys.stdout
+        stream.write(prompt)
+        stream.flush()
+        line = (self.input_stream or sys.stdin).readline()
+        if not line:
+            return None
+        return line.rstrip("\r\n")
+
+    # ------------------------------------------------------------------------
+    # Main menu
+    # ------------------------------------------------------------------------
+
+    def run_flow(self):
+        """Whole-game flow: welcome, the main menu, then data loading"""
+        display_welcome()
+
+        # Main menu loop
+        while True:
+            choice = yield from self.main_menu()
+
+            # Quest and item data is only read once a game starts, so the
+            # menu comes up (and quitting is) as fast as possible
+            if choice in (1, 2) and self.shared_data is None:
+                if not self.setup_game_data():
+                    return
+
+            if choice == 1:
+                yield from self.new_game()
+            elif choice == 2:
+                yield from self.load_game()
+            elif choice == 3:
+                game_output.say("\nThanks for playing Quest Chronicles!")
+                break
+            # No else needed, main_menu() guarantees a valid choice
 
+    def setup_game_data(self):
+        """
+        Load the shared game data, creating default files the first time
 
+        Returns: True if data is ready, False if the game cannot start
+        """
+        try:
+            self.shared_data = load_game_data()
+            game_output.say("Game data loaded successfully!")
+        except MissingDataFileError as e:
+            metrics.count_error(e)
+            game_output.say("First time setup: No data files found. Creating defaults...")
+            try:
+                # CALL game_data
+                game_data.create_default_data_files()
+                self.shared_data = load_game_data()
+                game_output.say("Default data files created and loaded!")
+            except Exception as e:
+                game_output.say("CRITICAL ERROR: Could not create data files: {}", e)
+                return False
+        except (InvalidDataFormatError, CorruptedDataError, QuestNotFoundError) as e:
+            metrics.count_error(e)
+            game_output.say("CRITICAL ERROR: Game data is corrupted: {}", e)
+            game_output.say("Please check your .txt files in the /data/ directory.")
+            return False
+        except Exception as e:
+            game_output.say("An unexpected error occurred during data load: {}", e)
+            return False
+        return True
+
+    def main_menu(self):
+        """
+        Display main menu and get player choice
+
+        Options:
+        1. New Game
+        2. Load Game
+        3. Exit
+
+        Returns: Integer choice (1-3)
+        """
+        game_output.say("\n====================")
+        game_output.say("      MAIN MENU")
+        game_output.say("====================")
+        game_output.say("1. New Game")
+        game_output.say("2. Load Game")
+        game_output.say("3. Exit")
+
+        while True:
+            choice = yield "Select an option (1-3): "
+            if choice in ['1', '2', '3']:
+                return int(choice)
+            else:
+                game_output.say("Invalid choice. Please enter 1, 2, or 3.")
+
+    def new_game(self):
+        """
+        Start a new game
+
+        Prompts for:
+        - Character name
+        - Character class
+
+        Creates character and starts game loop
+        """
+        game_output.say("\n--- NEW GAME ---")
+        name = (yield "Enter your character's name: ").strip()
+        if not name:
+            game_output.say("Name cannot be empty. Returning to main menu.")
+            return
+        if not character_manager.is_valid_character_name(name):
+            # Names become save file names, so nothing like "../x" gets through
+            game_output.say("Names can only use letters, digits, spaces, '_' and '-' "
+                            "(up to {} characters). Returning to main menu.",
+                            character_manager.MAX_NAME_LENGTH)
+            return
 
-def game_menu():
-    """
-    Display game menu and get player choice
-    
-    Options:
-    1. View Character Stats
-    2. View Inventory
-    3. Quest Menu
-    4. Explore (Find Battles)
-    5. Shop
-    6. Save and Quit
-    
-    Returns: Integer choice (1-6)
-    """
-    # TODO: Implement game menu
-    print("\n" + "=" * 20)
-    print("      GAME MENU")
-    print("=" * 20)
-    print(f"Name: {current_character['name']} | Level: {current_character['level']}")
-    print(f"HP: {current_character['health']}/{current_character['max_health']} | Gold: {current_character['gold']}")
-    print("-" * 20)
-    print("1. View Character Stats")
-    print("2. View Inventory")
-    print("3. Quest Menu")
-    print("4. Explore (Find Battle)")
-    print("5. Shop")
-    print("6. Save and Quit to Main Menu")
-    
-    while True:
-        choice = input("Select an option (1-6): ")
-        if choice.isdigit() and 1 <= int(choice) <= 6:
-            return int(choice)
-        else:
-            print("Invalid choice. Please enter a number 1-6.")
+        game_output.say("Valid classes are: {}", ', '.join(character_manager.VALID_CLASSES))
+        char_class = (yield "Choose your class: ").strip().capitalize()
 
+        try:
+            # 1. CALL character_manager
+            self.character = character_manager.create_character(name, char_class)
+            game_output.say("\nCharacter {} the {} has been created!", name, char_class)
+
+            # 2. CALL save_game helper
+            self.save_game()
+            game_output.say("Game saved. Welcome, {}!", name)
+        except InvalidCharacterClassError as e:
+            # 3. CATCH exception
+            metrics.count_error(e)
+            game_output.say("Error: {}", e)
+            game_output.say("Returning to main menu.")
+            return
+        except Exception as e:
+            game_output.say("An unexpected error occurred: {}", e)
+            return
 
-# ============================================================================
-# GAME ACTIONS
-# ============================================================================
+        # 4. START game loop
+        yield from self.game_loop()
+
+    def load_game(self):
+        """
+        Load an existing saved game
+
+        Shows list of saved characters
+        Prompts user to select one
+        """
+        game_output.say("\n--- LOAD GAME ---")
+
+        # 1. CALL character_manager
+        saved_chars = character_manager.list_saved_characters(self.save_directory)
+
+        if not saved_chars:
+            game_output.say("No saved games found.")
+            return
+
+        game_output.say("Available characters:")
+        for i, name in enumerate(saved_chars, 1):
+            game_output.say("{}. {}", i, name)
+
+        choice = (yield "Enter the name of the character to load: ").strip()
 
-def view_character_stats():
-    """Display character information"""
-    global current_character
-    
-    # TODO: Implement stats display
-    # Show: name, class, level, health, stats, gold, etc.
-    # Use character_manager functions
-    # Show quest progress using quest_handler
-     
-    print("\n--- CHARACTER STATS ---")
-    print(f"  Name: {current_character['name']}")
-    print(f"  Class: {current_character['class']}")
-    print(f"  Level: {current_character['level']}")
-    print(f"  Health: {current_character['health']}/{current_character['max_health']}")
-    print(f"  XP: {current_character['experience']}")
-    print(f"  Strength: {current_character['strength']}")
-    print(f"  Magic: {current_character['magic']}")
-    print(f"  Gold: {current_character['gold']}")
-    
-    # Call quest_handler for progress
-    quest_handler.display_character_quest_progress(current_character, all_quests)
-    
-    input("\nPress Enter to continue...")
-
-
-def view_inventory():
-    """Display and manage inventory"""
-    global current_character, all_items
-    
-    # TODO: Implement inventory menu
-    # Show current inventory
-    # Options: Use item, Equip weapon/armor, Drop item
-    # Handle exceptions from inventory_system
-    while True:
-        print("\n--- INVENTORY ---")
-        # 1. CALL inventory_system
-        inventory_system.display_inventory(current_character, all_items)
-        
-        print("\n(U)se, (E)quip, (S)ell, (B)ack")
-        choice = input("Choose an action: ").strip().upper()
-
-        if choice == 'B':
-            break
-        elif choice not in ['U', 'E', 'S']:
-            print("Invalid choice.")
-            continue
-            
         try:
-            item_id = input("Enter the Item ID to use/equip/sell: ").strip()
-            
-            # We need the item's data to use or equip it
-            if item_id not in all_items:
-                print("That is not a valid item ID.")
+            # 2. CALL character_manager
+            self.character = character_manager.load_character(choice, self.save_directory)
+            game_output.say("\nWelcome back, {}!", self.character['name'])
+        except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError,
+                InvalidCharacterNameError) as e:
+            # 3. CATCH exceptions
+            metrics.count_error(e)
+            game_output.say("Error loading game: {}", e)
+            return
+        except Exception as e:
+            game_output.say("An unexpected error occurred: {}", e)
+            return
+
+        # 4. START game loop
+        yield from self.game_loop()
+
+    # ------------------------------------------------------------------------
+    # Game loop
+    # ------------------------------------------------------------------------
+
+    def game_loop(self):
+        """
+        Main game loop - shows game menu and processes actions
+        """
+        self.game_running = True
+
+        while self.game_running:
+
+            # 1. Check for death first!
+            if self.character and character_manager.is_character_dead(self.character):
+                # If they quit, game_running will be False and the loop will exit
+                yield from self.handle_character_death()
                 continue
-                
-            item_data = all_items[item_id]
-
-            if choice == 'U':
-                # 2. CALL inventory_system
-                result = inventory_system.use_item(current_character, item_id, item_data)
-                print(result)
-            
-            elif choice == 'S':
-                # 3. CALL inventory_system
-                gold = inventory_system.sell_item(current_character, item_id, item_data)
-                print(f"You sold {item_data['name']} for {gold} gold.")
-                
-            elif choice == 'E':
-                # 4. CALL inventory_system
-                if item_data['type'] == 'weapon':
-                    result = inventory_system.equip_weapon(current_character, item_id, item_data)
-                    print(result)
-                elif item_data['type'] == 'armor':
-                    result = inventory_system.equip_armor(current_character, item_id, item_data)
-                    print(result)
-                else:
-                    print("You can only equip 'weapon' or 'armor' type items.")
 
-        except (ItemNotFoundError, InvalidItemTypeError, InsufficientResourcesError, InventoryFullError) as e:
-            # 5. CATCH exceptions
-            print(f"Error: {e}")
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-        
-        input("\nPress Enter to continue...")
-
-def quest_menu():
-    """Quest management menu"""
-    global current_character, all_quests
-    
-    while True:
-        print("\n--- QUEST MENU ---")
-        print("1. View Active Quests")
-        print("2. View Available Quests")
-        print("3. View Completed Quests")
-        print("4. Accept Quest")
-        print("5. Abandon Quest")
-        print("6. Back to Game Menu")
-        
-        choice = input("Select an option (1-6): ").strip()
-        
-        try:
-            if choice == '1':
-                active = quest_handler.get_active_quests(current_character, all_quests)
-                quest_handler.display_quest_list(active)
-            
-            elif choice == '2':
-                available = quest_handler.get_available_quests(current_character, all_quests)
-                quest_handler.display_quest_list(available)
-            
-            elif choice == '3':
-                completed = quest_handler.get_completed_quests(current_character, all_quests)
-                quest_handler.display_quest_list(completed)
-            
-            elif choice == '4':
-                quest_id = input("Enter Quest ID to accept: ").strip()
-                quest_handler.accept_quest(current_character, quest_id, all_quests)
-                print(f"Quest '{quest_id}' accepted!")
-            
-            elif choice == '5':
-                quest_id = input("Enter Quest ID to abandon: ").strip()
-                quest_handler.abandon_quest(current_character, quest_id)
-                print(f"Quest '{quest_id}' abandoned.")
-            
-            elif choice == '6':
-                break
+            # 2. Display menu and get choice
+            choice = yield from self.game_menu()
+            self.current_action = self.last_action = GAME_ACTIONS[choice]
+            self.action_seconds = 0.0
+            self.action_span = self.last_action_span = tracing.start_span(
+                "game_action", action=self.current_action, character=self.character['name']
+            )
+            tracing.set_current(self.action_span)
+
+            try:
+                # 3. Execute action
+                if choice == 1:
+                    yield from self.view_character_stats()
+                elif choice == 2:
+                    yield from self.view_inventory()
+                elif choice == 3:
+                    yield from self.quest_menu()
+                elif choice == 4:
+                    yield from self.explore()
+                elif choice == 5:
+                    yield from self.shop()
+                elif choice == 6:
+                    self.save_game()
+                    game_output.say("\nGame saved. Goodbye!")
+                    self.game_running = False # Exit the loop
+
+                # 4. Save after every action (unless quitting)
+                if self.game_running:
+                    self.autosave()
+            finally:
+                tracing.finish(self.action_span)
+                tracing.set_current(None)
+                self.action_span = None
+            self.current_action = None
+
+    def game_menu(self):
+        """
+        Display game menu and get player choice
+
+        Options:
+        1. View Character Stats
+        2. View Inventory
+        3. Quest Menu
+        4. Explore (Find Battles)
+        5. Shop
+        6. Save and Quit
+
+        Returns: Integer choice (1-6)
+        """
+        character = self.character
+        game_output.say("\n====================")
+        game_output.say("      GAME MENU")
+        game_output.say("====================")
+        game_output.say("Name: {} | Level: {}", character['name'], character['level'])
+        game_output.say("HP: {}/{} | Gold: {}", character['health'], character['max_health'], character['gold'])
+        game_output.say("--------------------")
+        game_output.say("1. View Character Stats")
+        game_output.say("2. View Inventory")
+        game_output.say("3. Quest Menu")
+        game_output.say("4. Explore (Find Battle)")
+        game_output.say("5. Shop")
+        game_output.say("6. Save and Quit to Main Menu")
+
+        while True:
+            choice = yield "Select an option (1-6): "
+            if choice.isdigit() and 1 <= int(choice) <= 6:
+                return int(choice)
             else:
-                print("Invalid choice. Please enter a number 1-6.")
-                
-        except (QuestNotFoundError, QuestRequirementsNotMetError, 
-                QuestAlreadyCompletedError, QuestNotActiveError, 
-                InsufficientLevelError) as e:
-            # CATCH ALL QUEST EXCEPTIONS
-            print(f"Error: {e}")
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            
-        input("\nPress Enter to continue...")
-    # TODO: Implement quest menu
-    # Show:
-    #   1. View Active Quests
-    #   2. View Available Quests
-    #   3. View Completed Quests
-    #   4. Accept Quest
-    #   5. Abandon Quest
-    #   6. Complete Quest (for testing)
-    #   7. Back
-    # Handle exceptions from quest_handler
-    
-def explore():
-    """Find and fight random enemies"""
-    global current_character
-    
-    # TODO: Implement exploration
-    # Generate random enemy based on character level
-    # Start combat with combat_system.SimpleBattle
-    # Handle combat results (XP, gold, death)
-    # Handle exceptions
-    print("\nYou venture out into the wilderness...")
-    
-    try:
-        # 1. CALL combat_system
-        enemy = combat_system.get_random_enemy_for_level(current_character['level'])
-        
-        # 2. Instantiate battle
-        battle = combat_system.SimpleBattle(current_character, enemy)
-        
-        # 3. CALL combat_system
-        result = battle.start_battle()
-        
-        print(f"Battle finished. Winner: {result['winner']}")
-        if result['winner'] == 'player':
-            print(f"You gained {result['xp_gained']} XP and {result['gold_gained']} gold.")
-        
-    except CharacterDeadError as e:
-        # 4. CATCH exception
-        print(f"Error: {e}")
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        
-    input("\nPress Enter to continue...")
-
-def shop():
-    """Shop menu for buying/selling items"""
-    global current_character, all_items
-    
-    # TODO: Implement shop
-    # Show available items for purchase
-    # Show current gold
-    # Options: Buy item, Sell item, Back
-    # Handle exceptions from inventory_system
-    while True:
-        print("\n--- THE SHOP ---")
-        print(f"Your Gold: {current_character['gold']}")
-        
-        print("\n(B)uy, (S)ell, (L)eave Shop")
-        choice = input("Choose an action: ").strip().upper()
-        
-        if choice == 'L':
-            break
-        elif choice not in ['B', 'S']:
-            print("Invalid choice.")
-            continue
-            
-        try:
+                game_output.say("Invalid choice. Please enter a number 1-6.")
+
+    # ------------------------------------------------------------------------
+    # Game actions
+    # ------------------------------------------------------------------------
+
+    def view_character_stats(self):
+        """Display character information"""
+        character = self.character
+        game_output.say("\n--- CHARACTER STATS ---")
+        game_output.say("  Name: {}", character['name'])
+        game_output.say("  Class: {}", character['class'])
+        game_output.say("  Level: {}", character['level'])
+        game_output.say("  Health: {}/{}", character['health'], character['max_health'])
+        game_output.say("  XP: {}", character['experience'])
+        game_output.say("  Strength: {}", character['strength'])
+        game_output.say("  Magic: {}", character['magic'])
+        game_output.say("  Gold: {}", character['gold'])
+
+        # Call quest_handler for progress
+        quest_handler.display_character_quest_progress(character, self.quests)
+
+        yield "\nPress Enter to continue..."
+
+    def view_inventory(self):
+        """Display and manage inventory"""
+        while True:
+            game_output.say("\n--- INVENTORY ---")
+            # 1. CALL inventory_system
+            inventory_system.display_inventory(self.character, self.items)
+
+            game_output.say("\n(U)se, (E)quip, (S)ell, (B)ack")
+            choice = (yield "Choose an action: ").strip().upper()
+
             if choice == 'B':
-                print("\nItems for sale:")
-                for item_id, item_data in all_items.items():
-                    print(f"  - [{item_id}] {item_data['name']} (Cost: {item_data['cost']} G)")
-                
-                item_id = input("Enter Item ID to buy: ").strip()
-                
-                if item_id in all_items:
-                    item_data = all_items[item_id]
-                    # CALL inventory_system
-                    inventory_system.purchase_item(current_character, item_id, item_data)
-                    print(f"You bought {item_data['name']}.")
-                else:
-                    print("Invalid Item ID.")
+                break
+            elif choice not in ['U', 'E', 'S']:
+                game_output.say("Invalid choice.")
+                continue
+
+            item_id = (yield "Enter the Item ID to use/equip/sell: ").strip()
 
-            elif choice == 'S':
-                if not current_character['inventory']:
-                    print("Your inventory is empty.")
+            try:
+                # We need the item's data to use or equip it
+                if item_id not in self.items:
+                    game_output.say("That is not a valid item ID.")
                     continue
-                    
-                print("\nYour inventory to sell:")
-                inventory_system.display_inventory(current_character, all_items)
-                
-                item_id = input("Enter Item ID to sell: ").strip()
-                
-                if item_id in all_items:
-                    item_data = all_items[item_id]
-                    # CALL inventory_system
-                    gold = inventory_system.sell_item(current_character, item_id, item_data)
-                    print(f"You sold {item_data['name']} for {gold} gold.")
+
+                item_data = self.items[item_id]
+
+                if choice == 'U':
+                    # 2. CALL inventory_system
+                    result = inventory_system.use_item(self.character, item_id, item_data)
+                    game_output.say(result)
+
+                elif choice == 'S':
+                    # 3. CALL inventory_system
+                    gold = inventory_system.sell_item(self.character, item_id, item_data)
+                    game_output.say("You sold {} for {} gold.", item_data['name'], gold)
+
+                elif choice == 'E':
+                    # 4. CALL inventory_system
+                    if item_data['type'] == 'weapon':
+                        result = inventory_system.equip_weapon(self.character, item_id, item_data)
+                        game_output.say(result)
+                    elif item_data['type'] == 'armor':
+                        result = inventory_system.equip_armor(self.character, item_id, item_data)
+                        game_output.say(result)
+                    else:
+                        game_output.say("You can only equip 'weapon' or 'armor' type items.")
+
+            except (ItemNotFoundError, InvalidItemTypeError, InsufficientResourcesError, InventoryFullError) as e:
+                # 5. CATCH exceptions
+                metrics.count_error(e)
+                game_output.say("Error: {}", e)
+            except Exception as e:
+                game_output.say("An unexpected error occurred: {}", e)
+
+            yield "\nPress Enter to continue..."
+
+    def quest_menu(self):
+        """Quest management menu"""
+        while True:
+            game_output.say("\n--- QUEST MENU ---")
+            game_output.say("1. View Active Quests")
+            game_output.say("2. View Available Quests")
+            game_output.say("3. View Completed Quests")
+            game_output.say("4. Accept Quest")
+            game_output.say("5. Abandon Quest")
+            game_output.say("6. Back to Game Menu")
+
+            choice = (yield "Select an option (1-6): ").strip()
+
+            if choice == '6':
+                break
+
+            try:
+                if choice == '1':
+                    active = quest_handler.get_active_quests(self.character, self.quests)
+                    quest_handler.display_quest_list(active)
+
+                elif choice == '2':
+                    available = quest_handler.get_available_quests(self.character, self.quests)
+                    quest_handler.display_quest_list(available)
+
+                elif choice == '3':
+                    completed = quest_handler.get_completed_quests(self.character, self.quests)
+                    quest_handler.display_quest_list(completed)
+
+                elif choice == '4':
+                    quest_id = (yield "Enter Quest ID to accept: ").strip()
+                    quest_handler.accept_quest(self.character, quest_id, self.quests)
+                    game_output.say("Quest '{}' accepted!", quest_id)
+
+                elif choice == '5':
+                    quest_id = (yield "Enter Quest ID to abandon: ").strip()
+                    quest_handler.abandon_quest(self.character, quest_id)
+                    game_output.say("Quest '{}' abandoned.", quest_id)
+
                 else:
-                    print("Invalid Item ID.")
+                    game_output.say("Invalid choice. Please enter a number 1-6.")
+
+            except (QuestNotFoundError, QuestRequirementsNotMetError,
+                    QuestAlreadyCompletedError, QuestNotActiveError,
+                    InsufficientLevelError) as e:
+                # CATCH ALL QUEST EXCEPTIONS
+                metrics.count_error(e)
+                game_output.say("Error: {}", e)
+            except Exception as e:
+                game_output.say("An unexpected error occurred: {}", e)
 
-        except (ItemNotFoundError, InsufficientResourcesError, InventoryFullError) as e:
-            # CATCH ALL SHOP EXCEPTIONS
-            print(f"Error: {e}")
+            yield "\nPress Enter to continue..."
+
+    def explore(self):
+        """Find and fight random enemies"""
+        game_output.say("\nYou venture out into the wilderness...")
+
+        try:
+            # 1. CALL combat_system
+            enemy = combat_system.get_random_enemy_for_level(self.character['level'])
+
+            # 2. Instantiate battle with this session's own random rolls
+            battle = combat_system.SimpleBattle(
+                self.character, enemy, seed=self.rng.randrange(2 ** 32)
+            )
+
+            # 3. CALL combat_system, one round per player decision
+            battle.begin()
+            result = None
+            while result is None:
+                battle.display_turn_options()
+                choice = yield "Choose your action (1-3): "
+                result = battle.step(choice)
+
+            game_output.say("Battle finished. Winner: {}", result['winner'])
+            if result['winner'] == 'player':
+                game_output.say("You gained {} XP and {} gold.", result['xp_gained'], result['gold_gained'])
+
+        except CharacterDeadError as e:
+            # 4. CATCH exception
+            metrics.count_error(e)
+            game_output.say("Error: {}", e)
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+            game_output.say("An unexpected error occurred: {}", e)
 
-        input("\nPress Enter to continue...")
+        yield "\nPress Enter to continue..."
 
+    def shop(self):
+        """Shop menu for buying/selling items"""
+        while True:
+            game_output.say("\n--- THE SHOP ---")
+            game_output.say("Your Gold: {}", self.character['gold'])
 
-# ============================================================================
-# HELPER FUNCTIONS
-# ============================================================================
+            game_output.say("\n(B)uy, (S)ell, (L)eave Shop")
+            choice = (yield "Choose an action: ").strip().upper()
 
-def save_game():
-    """Save current game state"""
-    global current_character
-    
-    # TODO: Implement save
-    # Use character_manager.save_character()
-    # Handle any file I/O exceptions
-    if current_character:
-        try:
-            # CALL character_manager
-            character_manager.save_character(current_character)
-        except IOError as e:
-            print(f"Error saving game: {e}")
-    else:
-        # This case handles when we are in the main menu, not in a game
-        pass
-
-def load_game_data():
-    """Load all quest and item data from files"""
-    global all_quests, all_items
-    
-    # TODO: Implement data loading
-    # Try to load quests with game_data.load_quests()
-    # Try to load items with game_data.load_items()
-    # Handle MissingDataFileError, InvalidDataFormatError
-    # If files missing, create defaults with game_data.create_default_data_files()
-    # 1. CALL game_data
-    # This will raise MissingDataFileError or InvalidDataFormatError
-    all_quests = game_data.load_quests()
-    all_items = game_data.load_items()
-    
-    # 2. CALL quest_handler (validation)
-    quest_handler.validate_quest_prerequisites(all_quests)
-    print("Game data and quest prerequisites validated.")
-
-def handle_character_death():
-    """Handle character death"""
-    global current_character, game_running
-    
-    # TODO: Implement death handling
-    # Display death message
-    # Offer: Revive (costs gold) or Quit
-    # If revive: use character_manager.revive_character()
-    # If quit: set game_running = False
-    print("\n" + "!" * 20)
-    print("      YOU ARE DEAD")
-    print("!" * 20)
-
-    revive_cost = 100 * current_character['level']
-    print(f"Reviving will cost {revive_cost} gold.")
-
-    while True:
-        choice = input(f"(R)evive (Cost: {revive_cost} G) or (Q)uit: ").strip().upper()
-
-    if choice == 'Q':
-        print("You leave this world behind...")
-        current_character = None
-        game_running = False
-        return current_character, game_running
-
-    elif choice == 'R':
-        try:
-            character_manager.add_gold(current_character, -revive_cost)
-            character_manager.revive_character(current_character)
-            print(f"You paid {revive_cost} gold and have been revived!")
-            print(f"Health: {current_character['health']}/{current_character['max_health']}")
-            return current_character, game_running
-        except ValueError:
-            print("Not enough gold to revive. You are lost...")
-            current_character = None
-            game_running = False
-            return current_character, game_running
+            if choice == 'L':
+                break
+            elif choice not in ['B', 'S']:
+                game_output.say("Invalid choice.")
+                continue
 
-    else:
-        print("Invalid choice. Please select R or Q.")
+            try:
+                if choice == 'B':
+                    game_output.say("\nItems for sale:")
+                    for item_id, item_data in self.items.items():
+                        game_output.say("  - [{}] {} (Cost: {} G)", item_id, item_data['name'], item_data['cost'])
+
+                    item_id = (yield "Enter Item ID to buy: ").strip()
+
+                    if item_id in self.items:
+                        item_data = self.items[item_id]
+                        # CALL inventory_system
+                        inventory_system.purchase_item(self.character, item_id, item_data)
+                        game_output.say("You bought {}.", item_data['name'])
+                    else:
+                        game_output.say("Invalid Item ID.")
+
+                elif choice == 'S':
+                    if not self.character['inventory']:
+                        game_output.say("Your inventory is empty.")
+                        continue
+
+                    game_output.say("\nYour inventory to sell:")
+                    inventory_system.display_inventory(self.character, self.items)
+
+                    item_id = (yield "Enter Item ID to sell: ").strip()
+
+                    if item_id in self.items:
+                        item_data = self.items[item_id]
+                        # CALL inventory_system
+                        gold = inventory_system.sell_item(self.character, item_id, item_data)
+                        game_output.say("You sold {} for {} gold.", item_data['name'], gold)
+                    else:
+                        game_output.say("Invalid Item ID.")
+
+            except (ItemNotFoundError, InsufficientResourcesError, InventoryFullError) as e:
+                # CATCH ALL SHOP EXCEPTIONS
+                metrics.count_error(e)
+                game_output.say("Error: {}", e)
+            except Exception as e:
+                game_output.say("An unexpected error occurred: {}", e)
+
+            yield "\nPress Enter to continue..."
+
+    # ------------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------------
+
+    def save_game(self):
+        """Save current game state"""
+        if self.character:
+            try:
+                # CALL character_manager
+                self.write_save()
+            except IOError as e:
+                game_output.say("Error saving game: {}", e)
+
+    def autosave(self):
+        """Save the character after an action"""
+        with tracing.span("autosave", character=self.character['name']):
+            try:
+                self.write_save()
+            except IOError as e:
+                game_output.say("!! CRITICAL: Failed to auto-save game: {} !!", e)
+
+    def write_save(self):
+        """Write the character's save file, or hand it to the save handler"""
+        if self.save_handler is not None:
+            self.save_handler(self)
+        else:
+            character_manager.save_character(self.character, self.save_directory)
+
+    def handle_character_death(self):
+        """
+        Handle character death
+
+        Offers: Revive (costs gold) or Quit
+        """
+        game_output.say("\n!!!!!!!!!!!!!!!!!!!!")
+        game_output.say("      YOU ARE DEAD")
+        game_output.say("!!!!!!!!!!!!!!!!!!!!")
+
+        revive_cost = 100 * self.character['level']
+        game_output.say("Reviving will cost {} gold.", revive_cost)
+
+        while True:
+            choice = (yield f"(R)evive (Cost: {revive_cost} G) or (Q)uit: ").strip().upper()
+
+            if choice == 'Q':
+                game_output.say("You leave this world behind...")
+                self.character = None
+                self.game_running = False
+                return
+
+            elif choice == 'R':
+                try:
+                    character_manager.add_gold(self.character, -revive_cost)
+                    character_manager.revive_character(self.character)
+                    game_output.say("You paid {} gold and have been revived!", revive_cost)
+                    game_output.say("Health: {}/{}", self.character['health'], self.character['max_health'])
+                except ValueError:
+                    game_output.say("Not enough gold to revive. You are lost...")
+                    self.character = None
+                    self.game_running = False
+                return
 
+            else:
+                game_output.say("Invalid choice. Please select R or Q.")
 
 def display_welcome():
     """Display welcome message"""
-    print("=" * 50)
-    print("     QUEST CHRONICLES - A MODULAR RPG ADVENTURE")
-    print("=" * 50)
-    print("\nWelcome to Quest Chronicles!")
-    print("Build your character, complete quests, and become a legend!")
-    print()
+    game_output.say("==================================================")
+    game_output.say("     QUEST CHRONICLES - A MODULAR RPG ADVENTURE")
+    game_output.say("==================================================")
+    game_output.say("\nWelcome to Quest Chronicles!")
+    game_output.say("Build your character, complete quests, and become a legend!")
+    game_output.say("")
 
 # ============================================================================
-# MAIN EXECUTION
+# CONSOLE SHORTCUTS
 # ============================================================================
+# The original one-player functions, now played through a console session.
 
-def main():
-    """Main game execution function"""
-    
-    # Display welcome message
-    display_welcome()
-    
-    # Load game data
-    try:
-        load_game_data()
-        print("Game data loaded successfully!")
-    except MissingDataFileError:
-        print("First time setup: No data files found. Creating defaults...")
-        try:
-            # CALL game_data
-            game_data.create_default_data_files()
-            load_game_data()
-            print("Default data files created and loaded!")
-        except Exception as e:
-            print(f"CRITICAL ERROR: Could not create data files: {e}")
-            return
-    except (InvalidDataFormatError, CorruptedDataError, QuestNotFoundError) as e:
-        print(f"CRITICAL ERROR: Game data is corrupted: {e}")
-        print("Please check your .txt files in the /data/ directory.")
+_console_session = None
+
+def get_console_session():
+    """Return the session used by the module-level menu functions"""
+    global _console_session
+    if _console_session is None:
+        _console_session = GameSession()
+    return _console_session
+
+def main_menu():
+    """
+    Display main menu and get player choice
+
+    Returns: Integer choice (1-3)
+    """
+    session = get_console_session()
+    choice = []
+
+    def flow():
+        choice.append((yield from session.main_menu()))
+
+    session.play(flow())
+    return choice[0] if choice else 3
+
+def new_game():
+    """Start a new game on the console session"""
+    session = get_console_session()
+    if session.shared_data is None and not session.setup_game_data():
         return
-    except Exception as e:
-        print(f"An unexpected error occurred during data load: {e}")
+    session.play(session.new_game())
+
+def load_game():
+    """Load an existing saved game on the console session"""
+    session = get_console_session()
+    if session.shared_data is None and not session.setup_game_data():
         return
-    
-    # Main menu loop
-    while True:
-        choice = main_menu()
-        
-        if choice == 1:
-            new_game()
-        elif choice == 2:
-            load_game()
-        elif choice == 3:
-            print("\nThanks for playing Quest Chronicles!")
-            break
-        # No else needed, main_menu() guarantees a valid choice
+    session.play(session.load_game())
+
+def game_loop():
+    """Run the game loop for the console session's current character"""
+    session = get_console_session()
+    session.play(session.game_loop())
+
+def save_game():
+    """Save the console session's current character"""
+    get_console_session().save_game()
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def parse_arguments(argv=None):
+    """Read main.py's command-line options"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play Quest Chronicles")
+    parser.add_argument("--profile", action="store_true",
+                        help="run under cProfile and write pstats + collapsed stacks")
+    parser.add_argument("--profile-output", default="quest_profile.pstats",
+                        help="pstats file name (collapsed stacks go to NAME.collapsed)")
+    parser.add_argument("--replay", default=None, metavar="SCRIPT",
+                        help="play a replay_driver script instead of reading the keyboard")
+    parser.add_argument("--trace-io", action="store_true",
+                        help="count open()/write() calls per game action")
+    parser.add_argument("--metrics-output", default=None, metavar="FILE",
+                        help="record metrics and write them on exit "
+                             "(JSON if FILE ends in .json, else Prometheus text)")
+    parser.add_argument("--trace-output", default=None, metavar="FILE",
+                        help="record trace spans and write them on exit as JSON lines")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Main game execution function"""
+    args = parse_arguments(argv)
+    session = get_console_session()
+    if args.metrics_output:
+        metrics.enable()
+    if args.trace_output:
+        tracing.enable()
+
+    if args.replay:
+        import replay_driver
+        replies = replay_driver.load_script(args.replay)
+        play = lambda: replay_driver.play_replies(session, replies, sys.stdout)
+    else:
+        play = session.run
+
+    tracer = None
+    if args.trace_io:
+        import profiling
+        tracer = profiling.IOTracer(session)
+        untraced_play = play
+
+        def play():
+            with tracer:
+                untraced_play()
+
+    if args.profile:
+        import profiling
+        profiling.profile_call(play, args.profile_output)
+        print(f"\nProfile written to {args.profile_output} "
+              f"(collapsed stacks: {args.profile_output}.collapsed)")
+    else:
+        play()
+
+    if tracer is not None:
+        print("\nFile I/O per action:")
+        for line in tracer.format_report():
+            print(line)
+
+    if args.metrics_output:
+        if args.metrics_output.endswith(".json"):
+            metrics.write_json(args.metrics_output)
+        else:
+            metrics.write_prometheus(args.metrics_output)
+    if args.trace_output:
+        tracing.dump_jsonl(args.trace_output)
 
 if __name__ == "__main__":
     main()
-
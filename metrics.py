@@ -0,0 +1,299 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Metrics Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Counters, timing histograms and gauges for the whole game.
+
+Metrics are off by default. While off, instrumented code only checks
+the module-level `enabled` flag (the same idea as game_output.active),
+so it costs next to nothing. While on, updates take a lock, as saves
+record from pool threads. Call enable() to start recording, then
+export with to_prometheus() (Prometheus text format) or snapshot()
+(a JSON-ready dictionary).
+
+    metrics.inc("saves")
+    metrics.observe("save_character_seconds", elapsed)
+    metrics.observe("inventory_items", 7)
+
+    @metrics.timed("load_quests_seconds")
+    def load_quests(...):
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Prefix for every exported metric name
+PREFIX = "quest_"
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Histograms that are not timings, with their own bucket bounds
+METRIC_BUCKETS = {
+    'battle_seconds': (0.001, 0.01, 0.1, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0),
+    'inventory_items': (0, 1, 2, 5, 10, 15, 20),
+}
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+GAUGE = 'gauge'
+
+# Every metric the game records: name -> (kind, help text)
+METRIC_HELP = {
+    'saves': (COUNTER, "Character saves written"),
+    'loads': (COUNTER, "Character saves loaded"),
+    'battles': (COUNTER, "Battles finished, by winner"),
+    'purchases': (COUNTER, "Shop purchases"),
+    'game_errors': (COUNTER, "GameError exceptions caught by the game, by type"),
+    'save_character_seconds': (HISTOGRAM, "Time spent in save_character"),
+    'load_character_seconds': (HISTOGRAM, "Time spent in load_character"),
+    'load_quests_seconds': (HISTOGRAM, "Time spent in load_quests"),
+    'battle_seconds': (HISTOGRAM, "Time from SimpleBattle.begin to the end of the battle"),
+    'game_action_seconds': (HISTOGRAM, "Processing time per game loop action, by action"),
+    'inventory_items': (HISTOGRAM, "Inventory size after each change"),
+    'inventory_items_max': (GAUGE, "Largest inventory any character has had"),
+}
+
+enabled = False
+
+# name -> {label key: value}; histogram values are [bucket counts..., sum, count]
+_values = {}
+# Held for every read-modify-write of _values
+_lock = threading.Lock()
+
+# ============================================================================
+# SWITCHING ON AND OFF
+# ============================================================================
+
+def enable():
+    """Start recording metrics"""
+    global enabled
+    enabled = True
+
+def disable():
+    """Stop recording metrics (recorded values are kept)"""
+    global enabled
+    enabled = False
+
+def reset():
+    """Forget every recorded value"""
+    with _lock:
+        _values.clear()
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+def _label_key(labels):
+    if not labels:
+        return ()
+    return tuple(sorted(labels.items()))
+
+def inc(name, amount=1, labels=None):
+    """Add to a counter"""
+    if not enabled:
+        return
+    key = _label_key(labels)
+    with _lock:
+        series = _values.setdefault(name, {})
+        series[key] = series.get(key, 0) + amount
+
+def count_error(error):
+    """Count a caught GameError by its exact type"""
+    if not enabled:
+        return
+    inc("game_errors", labels={'type': type(error).__name__})
+
+def set_gauge(name, value, labels=None):
+    """Set a gauge to a value"""
+    if not enabled:
+        return
+    key = _label_key(labels)
+    with _lock:
+        _values.setdefault(name, {})[key] = value
+
+def raise_gauge(name, value, labels=None):
+    """Set a gauge to a value if it is higher (keeps the largest value seen)"""
+    if not enabled:
+        return
+    key = _label_key(labels)
+    with _lock:
+        series = _values.setdefault(name, {})
+        current = series.get(key)
+        if current is None or value > current:
+            series[key] = value
+
+def observe(name, value, labels=None):
+    """Record one measurement (usually seconds) in a histogram"""
+    if not enabled:
+        return
+    buckets = METRIC_BUCKETS.get(name, DEFAULT_BUCKETS)
+    key = _label_key(labels)
+    position = len(buckets)
+    for index, bound in enumerate(buckets):
+        if value <= bound:
+            position = index
+            break
+    with _lock:
+        series = _values.setdefault(name, {})
+        counts = series.get(key)
+        if counts is None:
+            counts = series[key] = [0] * (len(buckets) + 2)
+        if position < len(buckets):
+            counts[position] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+def timed(name, labels=None):
+    """Decorator: record how long each call takes in a histogram"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - started, labels)
+        return wrapper
+    return decorate
+
+@contextmanager
+def timer(name, labels=None):
+    """Context manager: record how long a with block takes"""
+    if not enabled:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, labels)
+
+# ============================================================================
+# EXPORTING
+# ============================================================================
+
+def get_value(name, labels=None):
+    """
+    Get a recorded value
+
+    Returns: Counter/gauge value, histogram (count, sum), or None
+    """
+    with _lock:
+        value = _values.get(name, {}).get(_label_key(labels))
+        if isinstance(value, list):
+            value = list(value)
+    if isinstance(value, list):
+        return (value[-1], value[-2])
+    return value
+
+def snapshot():
+    """
+    Get every recorded value as plain data
+
+    Returns: Dictionary {name: {'kind', 'help', 'series': [{'labels', ...}]}}
+             where counters/gauges have 'value' and histograms have
+             'buckets' {upper bound: cumulative count}, 'sum' and 'count'
+    """
+    with _lock:
+        # Copy, so exporting never sees a half-made update
+        values = {name: {key: list(value) if isinstance(value, list) else value
+                         for key, value in series.items()}
+                  for name, series in _values.items()}
+
+    report = {}
+    for name in sorted(values):
+        kind, help_text = METRIC_HELP.get(name, (_guess_kind(values[name]), ""))
+        series = []
+        for key, value in sorted(values[name].items()):
+            entry = {'labels': dict(key)}
+            if isinstance(value, list):
+                cumulative = 0
+                buckets = {}
+                for bound, count in zip(METRIC_BUCKETS.get(name, DEFAULT_BUCKETS), value):
+                    cumulative += count
+                    buckets[str(bound)] = cumulative
+                entry['buckets'] = buckets
+                entry['sum'] = value[-2]
+                entry['count'] = value[-1]
+            else:
+                entry['value'] = value
+            series.append(entry)
+        report[name] = {'kind': kind, 'help': help_text, 'series': series}
+    return report
+
+def to_json():
+    """Return snapshot() as JSON text"""
+    import json
+
+    return json.dumps(snapshot(), indent=2, sort_keys=True)
+
+def to_prometheus():
+    """Return every recorded value in the Prometheus text format"""
+    lines = []
+    for name, metric in snapshot().items():
+        full_name = PREFIX + name
+        if metric['kind'] == COUNTER:
+            full_name += "_total"
+        if metric['help']:
+            lines.append(f"# HELP {full_name} {metric['help']}")
+        lines.append(f"# TYPE {full_name} {metric['kind']}")
+
+        for entry in metric['series']:
+            labels = entry['labels']
+            if metric['kind'] == HISTOGRAM:
+                for bound, count in entry['buckets'].items():
+                    lines.append(f"{full_name}_bucket{_format_labels(labels, le=bound)} {count}")
+                lines.append(f"{full_name}_bucket{_format_labels(labels, le='+Inf')} {entry['count']}")
+                lines.append(f"{full_name}_sum{_format_labels(labels)} {entry['sum']}")
+                lines.append(f"{full_name}_count{_format_labels(labels)} {entry['count']}")
+            else:
+                lines.append(f"{full_name}{_format_labels(labels)} {entry['value']}")
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(filename):
+    """Write to_prometheus() to a file (e.g. for node_exporter's textfile collector)"""
+    with open(filename, 'w') as f:
+        f.write(to_prometheus())
+
+def write_json(filename):
+    """Write to_json() to a file"""
+    with open(filename, 'w') as f:
+        f.write(to_json() + "\n")
+
+def _format_labels(labels, **extra):
+    pairs = dict(labels)
+    pairs.update(extra)
+    if not pairs:
+        return ""
+    inside = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs.items())
+    return "{" + inside + "}"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _guess_kind(series):
+    value = next(iter(series.values()), None)
+    return HISTOGRAM if isinstance(value, list) else COUNTER
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== METRICS TEST ===")
+
+    # enable()
+    # inc("saves")
+    # observe("save_character_seconds", 0.002)
+    # print(to_prometheus())
@@ -0,0 +1,71 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Performance Stats Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Small helpers for summarizing timing measurements (percentiles, means)
+shared by the server, load generator and benchmark tools.
+"""
+
+# ============================================================================
+# PERCENTILES
+# ============================================================================
+
+def percentile(values, pct):
+    """
+    Get a percentile of a list of numbers
+
+    Uses linear interpolation between the two nearest ranks.
+
+    Args:
+        values: List of numbers (does not need to be sorted)
+        pct: Percentile from 0 to 100
+
+    Returns: The percentile value (0.0 for an empty list)
+    Raises: ValueError if pct is outside 0-100
+    """
+    if not 0 <= pct <= 100:
+        raise ValueError(f"Percentile must be between 0 and 100, got {pct}")
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = position - lower
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+def summarize_latencies(seconds):
+    """
+    Summarize a list of latencies measured in seconds
+
+    Returns: Dictionary with count and mean/p50/p95/p99/max in milliseconds
+    """
+    if not seconds:
+        return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0,
+                'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+
+    ordered = sorted(seconds)
+    return {
+        'count': len(ordered),
+        'mean_ms': sum(ordered) / len(ordered) * 1000,
+        'p50_ms': percentile(ordered, 50) * 1000,
+        'p95_ms': percentile(ordered, 95) * 1000,
+        'p99_ms': percentile(ordered, 99) * 1000,
+        'max_ms': ordered[-1] * 1000
+    }
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== PERF STATS TEST ===")
+
+    # print(percentile([1, 2, 3, 4], 50))
+    # print(summarize_latencies([0.001, 0.002, 0.010]))
@@ -0,0 +1,196 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Profiling Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Tools behind main.py's --profile and --trace-io options.
+
+- profile_call() runs a function under cProfile and writes a .pstats
+  file plus a collapsed-stack file ("a;b;c 123" lines, microseconds)
+  that flame graph tools read.
+- IOTracer counts open() calls and file write() calls, split by the
+  game menu action that was running at the time.
+
+cProfile only records caller -> callee pairs, not whole stacks, so the
+collapsed stacks are rebuilt from the caller graph: a function's time is
+split between its callers in proportion to the time each call edge took.
+That is exact for functions with one caller and an estimate otherwise.
+"""
+
+import builtins
+import cProfile
+import os
+import pstats
+
+# Stacks deeper than this are cut off (recursion through the caller graph)
+MAX_STACK_DEPTH = 64
+# Paths worth less than this many microseconds are dropped
+MIN_STACK_MICROSECONDS = 1
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+
+def profile_call(func, output="quest_profile.pstats"):
+    """
+    Run a function under cProfile
+
+    Writes output (pstats) and output + ".collapsed" (collapsed stacks).
+
+    Returns: Whatever func returned
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func)
+    finally:
+        profiler.create_stats()
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(output)
+        write_collapsed_stacks(stats, output + ".collapsed")
+
+def format_function(function):
+    """Turn a pstats function key (file, line, name) into a frame label"""
+    filename, line, name = function
+    if filename == '~':
+        # Built-in function
+        return name
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+def collapse_stacks(stats):
+    """
+    Rebuild call stacks from a pstats caller graph
+
+    Returns: Dictionary {"root;...;leaf": microseconds of self time}
+    """
+    # function -> (total_time, self_time, {callee: edge_total_time})
+    entries = stats.stats
+    callees = {function: {} for function in entries}
+    roots = []
+    for function, (_, _, self_time, total_time, callers) in entries.items():
+        if not callers:
+            roots.append(function)
+        for caller, edge in callers.items():
+            if caller in callees:
+                # edge is (calls, primitive calls, self time, total time)
+                callees[caller][function] = edge[3]
+
+    collapsed = {}
+    # (function, fraction of its total time on this path, path labels, path set)
+    stack = [(root, 1.0, [format_function(root)], {root}) for root in roots]
+    while stack:
+        function, fraction, labels, on_path = stack.pop()
+        _, _, self_time, total_time, _ = entries[function]
+
+        microseconds = self_time * fraction * 1e6
+        if microseconds >= MIN_STACK_MICROSECONDS:
+            key = ";".join(labels)
+            collapsed[key] = collapsed.get(key, 0) + microseconds
+
+        if len(labels) >= MAX_STACK_DEPTH:
+            continue
+        for callee, edge_time in callees[function].items():
+            if callee in on_path:
+                continue
+            callee_total = entries[callee][3]
+            if callee_total <= 0:
+                continue
+            callee_fraction = fraction * edge_time / callee_total
+            if entries[callee][3] * callee_fraction * 1e6 < MIN_STACK_MICROSECONDS:
+                continue
+            stack.append((callee, callee_fraction,
+                          labels + [format_function(callee)], on_path | {callee}))
+
+    return collapsed
+
+def write_collapsed_stacks(stats, filename):
+    """Write collapse_stacks output, one "stack microseconds" line per stack"""
+    collapsed = collapse_stacks(stats)
+    with open(filename, 'w') as f:
+        for key in sorted(collapsed):
+            f.write(f"{key} {int(round(collapsed[key]))}\n")
+
+# ============================================================================
+# I/O TRACING
+# ============================================================================
+
+class CountingFile:
+    """Wraps a file object and counts its write() calls"""
+
+    def __init__(self, file, tracer):
+        self._file = file
+        self._tracer = tracer
+
+    def write(self, data):
+        self._tracer.count('writes')
+        return self._file.write(data)
+
+    def writelines(self, lines):
+        self._tracer.count('writes')
+        return self._file.writelines(lines)
+
+    def __enter__(self):
+        self._file.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._file.__exit__(*exc_info)
+
+    def __iter__(self):
+        return iter(self._file)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+class IOTracer:
+    """
+    Counts open()/write() calls per game action while active
+
+    Use as a context manager around a session's play. Calls made outside
+    any game menu action (menus, loading, character creation) are counted
+    under 'other'.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.counts = {}
+        self._original_open = None
+
+    def count(self, kind):
+        action = self.session.current_action or 'other'
+        counts = self.counts.setdefault(action, {'opens': 0, 'writes': 0})
+        counts[kind] += 1
+
+    def _open(self, *args, **kwargs):
+        self.count('opens')
+        return CountingFile(self._original_open(*args, **kwargs), self)
+
+    def __enter__(self):
+        self._original_open = builtins.open
+        builtins.open = self._open
+        return self
+
+    def __exit__(self, *exc_info):
+        builtins.open = self._original_open
+        return False
+
+    def format_report(self):
+        """Return the counts as table lines"""
+        lines = [f"{'action':<16}{'opens':>8}{'writes':>8}"]
+        for action in sorted(self.counts):
+            counts = self.counts[action]
+            lines.append(f"{action:<16}{counts['opens']:>8}{counts['writes']:>8}")
+        return lines
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== PROFILING TEST ===")
+
+    # profile_call(lambda: sum(range(10 ** 6)), "test.pstats")
+    # print(open("test.pstats.collapsed").read())
@@ -17,13 +17,24 @@ from custom_exceptions import (
     QuestNotActiveError,
     InsufficientLevelError
 )
+from status_codes import (
+    OK,
+    QUEST_NOT_FOUND,
+    QUEST_ALREADY_COMPLETED,
+    QUEST_ALREADY_ACTIVE,
+    LEVEL_TOO_LOW,
+    PREREQUISITE_NOT_MET
+)
 
 #MUST import character_manager to grant rewards
 import character_manager
+import game_output
+import tracing
 # ============================================================================
 # QUEST MANAGEMENT
 # ============================================================================
 
+@tracing.traced("quest_handler.accept_quest")
 def accept_quest(character, quest_id, quest_data_dict):
     """
     Accept a new quest
@@ -53,39 +64,46 @@ def accept_quest(character, quest_id, quest_data_dict):
     # Check not already completed
     # Check not already active
     # Add to character['active_quests']
-    # 1. Check quest exists
-    if quest_id not in quest_data_dict:
-        raise QuestNotFoundError(f"Quest '{quest_id}' does not exist.")
-        
-    quest_info = quest_data_dict[quest_id]
+    status = try_accept_quest(character, quest_id, quest_data_dict)
+    if status == OK:
+        return True
 
-    # 2. Check not already completed
-    if is_quest_completed(character, quest_id):
+    # Only a refused quest pays for building the error message
+    if status == QUEST_NOT_FOUND:
+        raise QuestNotFoundError(f"Quest '{quest_id}' does not exist.")
+    if status == QUEST_ALREADY_COMPLETED:
         raise QuestAlreadyCompletedError(f"Quest '{quest_id}' has already been completed.")
-
-    # 3. Check not already active
-    if is_quest_active(character, quest_id):
+    if status == QUEST_ALREADY_ACTIVE:
         # We'll use QuestRequirementsNotMetError as a general "can't accept"
         raise QuestRequirementsNotMetError(f"Quest '{quest_id}' is already active.")
 
-    # 4. Check level requirement
-    if character['level'] < quest_info['required_level']:
+    quest_info = quest_data_dict[quest_id]
+    if status == LEVEL_TOO_LOW:
         raise InsufficientLevelError(
             f"Cannot accept '{quest_id}'. "
             f"Requires level {quest_info['required_level']}, "
             f"you are level {character['level']}."
         )
+    raise QuestRequirementsNotMetError(
+        f"Cannot accept '{quest_id}'. "
+        f"Prerequisite quest '{quest_info['prerequisite']}' is not completed."
+    )
 
-    # 5. Check prerequisite
-    prereq = quest_info['prerequisite']
-    if prereq != "NONE" and not is_quest_completed(character, prereq):
-        raise QuestRequirementsNotMetError(
-            f"Cannot accept '{quest_id}'. "
-            f"Prerequisite quest '{prereq}' is not completed."
-        )
-    character['active_quests'].append(quest_id)
-    return True
+def try_accept_quest(character, quest_id, quest_data_dict):
+    """
+    Accept a new quest without raising (for bots and bulk tools)
+    
+    Same requirements, checked in the same order, as accept_quest.
+    
+    Returns: OK if the quest was accepted, otherwise the status code of
+             the first requirement not met (see check_accept_quest)
+    """
+    status = check_accept_quest(character, quest_id, quest_data_dict)
+    if status == OK:
+        character['active_quests'].append(quest_id)
+    return status
 
+@tracing.traced("quest_handler.complete_quest")
 def complete_quest(character, quest_id, quest_data_dict):
     """
     Complete an active quest and grant rewards
@@ -133,7 +151,7 @@ def complete_quest(character, quest_id, quest_data_dict):
     try:
         character_manager.gain_experience(character, xp_reward)
     except character_manager.CharacterDeadError:
-        print("Gained XP, but cannot level up while dead.")
+        game_output.say("Gained XP, but cannot level up while dead.")
         
     character_manager.add_gold(character, gold_reward)
 
@@ -141,6 +159,7 @@ def complete_quest(character, quest_id, quest_data_dict):
     rewards = {'xp': xp_reward, 'gold': gold_reward}
     return rewards
 
+@tracing.traced("quest_handler.abandon_quest")
 def abandon_quest(character, quest_id):
     """
     Remove a quest from active quests without completing it
@@ -155,6 +174,7 @@ def abandon_quest(character, quest_id):
     character['active_quests'].remove(quest_id)
     return True
 
+@tracing.traced("quest_handler.get_active_quests")
 def get_active_quests(character, quest_data_dict):
     """
     Get full data for all active quests
@@ -169,6 +189,7 @@ def get_active_quests(character, quest_data_dict):
         if qid in quest_data_dict
     ]
 
+@tracing.traced("quest_handler.get_completed_quests")
 def get_completed_quests(character, quest_data_dict):
     """
     Get full data for all completed quests
@@ -181,6 +202,7 @@ def get_completed_quests(character, quest_data_dict):
         if qid in quest_data_dict
     ]
 
+@tracing.traced("quest_handler.get_available_quests")
 def get_available_quests(character, quest_data_dict):
     """
     Get quests that character can currently accept
@@ -227,29 +249,30 @@ def can_accept_quest(character, quest_id, quest_data_dict):
     """
     # TODO: Implement requirement checking
     # Check all requirements without raising exceptions
-    try:
-        quest_info = quest_data_dict[quest_id]
-        
-        # Check all requirements. If any fail, return False.
-        if character['level'] < quest_info['required_level']:
-            return False
-            
-        prereq = quest_info['prerequisite']
-        if prereq != "NONE" and not is_quest_completed(character, prereq):
-            return False
-            
-        if is_quest_completed(character, quest_id):
-            return False
-            
-        if is_quest_active(character, quest_id):
-            return False
-            
-    except KeyError:
-        # Quest ID doesn't even exist
-        return False
-        
-    # If all checks passed
-    return True
+    return check_accept_quest(character, quest_id, quest_data_dict) == OK
+
+def check_accept_quest(character, quest_id, quest_data_dict):
+    """
+    Check the requirements to accept a quest, without changing anything
+    
+    Returns: OK, QUEST_NOT_FOUND, QUEST_ALREADY_COMPLETED,
+             QUEST_ALREADY_ACTIVE, LEVEL_TOO_LOW or PREREQUISITE_NOT_MET
+    """
+    # .get() instead of catching KeyError: a missing quest is a normal answer
+    quest_info = quest_data_dict.get(quest_id)
+    if quest_info is None:
+        return QUEST_NOT_FOUND
+    if quest_id in character['completed_quests']:
+        return QUEST_ALREADY_COMPLETED
+    if quest_id in character['active_quests']:
+        return QUEST_ALREADY_ACTIVE
+    if character['level'] < quest_info['required_level']:
+        return LEVEL_TOO_LOW
+    prereq = quest_info['prerequisite']
+    if prereq != "NONE" and prereq not in character['completed_quests']:
+        return PREREQUISITE_NOT_MET
+    return OK
+
 def get_quest_prerequisite_chain(quest_id, quest_data_dict):
     """
     Get the full chain of prerequisites for a quest
@@ -350,10 +373,10 @@ def display_quest_info(quest_data):
     Shows: Title, Description, Rewards, Requirements
     """
     # TODO: Implement quest display 
-    print(f"\n=== {quest_data['title']} ===")
-    print(f"  Level: {quest_data['required_level']}  |  Prereq: {quest_data['prerequisite']}")
-    print(f"  Description: {quest_data['description']}")
-    print(f"  Rewards: {quest_data['reward_xp']} XP, {quest_data['reward_gold']} Gold")
+    game_output.say("\n=== {} ===", quest_data['title'])
+    game_output.say("  Level: {}  |  Prereq: {}", quest_data['required_level'], quest_data['prerequisite'])
+    game_output.say("  Description: {}", quest_data['description'])
+    game_output.say("  Rewards: {} XP, {} Gold", quest_data['reward_xp'], quest_data['reward_gold'])
 
 def display_quest_list(quest_list):
     """
@@ -364,15 +387,16 @@ def display_quest_list(quest_list):
     # TODO: Implement quest list display
     list_title = "Quests"
     
-    print(f"\n--- {list_title} ---")
+    game_output.say("\n--- {} ---", list_title)
     
     if not quest_list:
-        print("  (No quests to display)")
+        game_output.say("  (No quests to display)")
         return
         
     for quest_data in quest_list:
-        print(f"- {quest_data['title']} (Lvl {quest_data['required_level']}) | "
-              f"Rewards: {quest_data['reward_xp']} XP, {quest_data['reward_gold']} Gold")
+        game_output.say("- {} (Lvl {}) | Rewards: {} XP, {} Gold",
+                        quest_data['title'], quest_data['required_level'],
+                        quest_data['reward_xp'], quest_data['reward_gold'])
 
 def display_character_quest_progress(character, quest_data_dict):
     """
@@ -385,16 +409,16 @@ def display_character_quest_progress(character, quest_data_dict):
     - Total rewards earned
     """
     # TODO: Implement progress display
-    print("\n--- QUEST PROGRESS ---")
-    print(f"  Active Quests: {len(character['active_quests'])}")
-    print(f"  Completed Quests: {len(character['completed_quests'])}")
+    game_output.say("\n--- QUEST PROGRESS ---")
+    game_output.say("  Active Quests: {}", len(character['active_quests']))
+    game_output.say("  Completed Quests: {}", len(character['completed_quests']))
     
     percentage = get_quest_completion_percentage(character, quest_data_dict)
-    print(f"  Completion: {percentage:.2f}%") # .2f formats to 2 decimal places
+    game_output.say("  Completion: {:.2f}%", percentage) # .2f formats to 2 decimal places
     
     rewards = get_total_quest_rewards_earned(character, quest_data_dict)
-    print(f"  Total XP Earned: {rewards['total_xp']}")
-    print(f"  Total Gold Earned: {rewards['total_gold']}")
+    game_output.say("  Total XP Earned: {}", rewards['total_xp'])
+    game_output.say("  Total Gold Earned: {}", rewards['total_gold'])
 
 # ============================================================================
 # VALIDATION
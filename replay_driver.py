@@ -0,0 +1,215 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Replay Driver Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Plays scripted game sessions without a keyboard.
+
+A script is the list of replies a player would type, one per line.
+Lines starting with '#' are comments; every other line (blank ones
+included, they answer "Press Enter") is sent as-is. Each script runs in
+its own GameSession with a seeded RNG and its own temporary save
+directory, and the whole screen output is kept as a transcript, so the
+same script always gives the same transcript.
+
+Run with: python replay_driver.py script1.txt script2.txt --workers 4
+"""
+
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import game_data
+import game_output
+import main
+
+COMMENT_PREFIX = "#"
+
+# ============================================================================
+# SCRIPTS
+# ============================================================================
+
+def parse_script(text):
+    """
+    Turn script text into a list of replies
+
+    Returns: List of reply strings
+    """
+    replies = []
+    for line in text.splitlines():
+        if line.startswith(COMMENT_PREFIX):
+            continue
+        replies.append(line)
+    return replies
+
+def load_script(filename):
+    """
+    Read a script file
+
+    Returns: List of reply strings
+    Raises: FileNotFoundError if the file does not exist
+    """
+    with open(filename, 'r') as f:
+        return parse_script(f.read())
+
+# ============================================================================
+# RUNNING SCRIPTS
+# ============================================================================
+
+def run_script(replies, seed=0, shared_data=None, save_directory=None):
+    """
+    Play one scripted session headlessly
+
+    Args:
+        replies: List of reply strings
+        seed: Seed for the session's battles
+        shared_data: Dictionary with 'quests' and 'items' (loaded with
+                     main.load_game_data() if None)
+        save_directory: Where saves go (a temporary directory that is
+                        deleted afterwards if None)
+
+    Returns: Dictionary with transcript, finished (True if the session
+             ended by itself), replies_used, prompts and elapsed seconds
+    """
+    if shared_data is None:
+        with game_output.use_sink(game_output.NullSink()):
+            shared_data = main.load_game_data()
+
+    temporary = save_directory is None
+    if temporary:
+        save_directory = tempfile.mkdtemp(prefix="quest_replay_")
+
+    transcript = io.StringIO()
+    session = main.GameSession(
+        shared_data, save_directory=save_directory, output_stream=transcript, seed=seed
+    )
+
+    started = time.perf_counter()
+    try:
+        played = play_replies(session, replies, transcript)
+    finally:
+        elapsed = time.perf_counter() - started
+        if temporary:
+            shutil.rmtree(save_directory, ignore_errors=True)
+
+    played['transcript'] = transcript.getvalue()
+    played['elapsed'] = elapsed
+    return played
+
+def play_replies(session, replies, transcript=None):
+    """
+    Answer a session's prompts with replies until it ends or they run out
+
+    Args:
+        session: A GameSession that has not been started
+        replies: List of reply strings
+        transcript: Stream to echo prompts and replies into (optional)
+
+    Returns: Dictionary with finished, replies_used and prompts
+    """
+    replies_used = 0
+    prompts = 0
+    ran_out = False
+
+    prompt = session.start()
+    while prompt is not None:
+        prompts += 1
+        if transcript is not None:
+            transcript.write(prompt)
+        if replies_used == len(replies):
+            # Script ran out before the session ended
+            if transcript is not None:
+                transcript.write("\n")
+            ran_out = True
+            session.close()
+            break
+        reply = replies[replies_used]
+        replies_used += 1
+        if transcript is not None:
+            transcript.write(reply + "\n")
+        prompt = session.send(reply)
+
+    return {
+        'finished': not ran_out,
+        'replies_used': replies_used,
+        'prompts': prompts
+    }
+
+def _run_job(job):
+    """Worker entry point: job is (replies, seed)"""
+    replies, seed = job
+    return run_script(replies, seed)
+
+def run_scripts(scripts, workers=None, base_seed=0, chunksize=16):
+    """
+    Play many scripts, in parallel worker processes
+
+    Script number i is played with seed base_seed + i, so results do not
+    depend on how the work is split between workers.
+
+    Args:
+        scripts: List of reply lists
+        workers: Number of worker processes (os.cpu_count() if None,
+                 1 plays everything in this process)
+
+    Returns: List of run_script results, in the same order as scripts
+    """
+    jobs = [(replies, base_seed + index) for index, replies in enumerate(scripts)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        return [_run_job(job) for job in jobs]
+
+    # The data is parsed once here; workers attach to it in shared memory
+    with game_output.use_sink(game_output.NullSink()):
+        shared_data = main.load_game_data()
+    with game_data.publish_catalog(shared_data['quests'], shared_data['items']) as catalog:
+        with ProcessPoolExecutor(max_workers=workers, initializer=main.attach_game_data,
+                                 initargs=(catalog.name,)) as pool:
+            return list(pool.map(_run_job, jobs, chunksize=chunksize))
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay scripted game sessions")
+    parser.add_argument("scripts", nargs="+", help="script files, one reply per line")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="play every script this many times")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--transcripts", default=None,
+                        help="directory to write one transcript per run into")
+    args = parser.parse_args()
+
+    names = args.scripts * args.repeat
+    scripts = [load_script(name) for name in names]
+
+    started = time.perf_counter()
+    results = run_scripts(scripts, workers=args.workers, base_seed=args.seed)
+    elapsed = time.perf_counter() - started
+
+    if args.transcripts:
+        os.makedirs(args.transcripts, exist_ok=True)
+        for index, (name, result) in enumerate(zip(names, results)):
+            base = os.path.splitext(os.path.basename(name))[0]
+            path = os.path.join(args.transcripts, f"{index:05d}_{base}.txt")
+            with open(path, 'w') as f:
+                f.write(result['transcript'])
+
+    unfinished = sum(1 for result in results if not result['finished'])
+    prompts = sum(result['prompts'] for result in results)
+    print(f"{len(results)} sessions, {prompts} prompts in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} sessions/s, {prompts / elapsed:.0f} prompts/s)")
+    if unfinished:
+        print(f"{unfinished} sessions ran out of script before the game ended")
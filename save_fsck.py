@@ -0,0 +1,310 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Checker Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Scans a directory of save files for ones a player could not load.
+
+Every save is read and validated the way load_character does it, then
+its quest and item IDs are checked against the game data. Problems go
+to a JSON Lines report, one line per file, written as results come in.
+
+- corrupt:  the file cannot be read or parsed at all
+- invalid:  it parses, but fails validation
+- repaired: it was invalid but fixable, and was rewritten (--repair)
+
+Fixable problems are the ones load_character already smooths over
+(health above max_health, saved stats that do not match base stats plus
+modifiers) plus unknown quest/item IDs, which are dropped, and quests
+both active and completed, which stay completed. Files still bad after
+that can be moved aside with --quarantine. A repair or move that fails
+(e.g. PermissionError) is recorded in that file's errors and the scan
+goes on.
+
+The directory is read with os.scandir and handed to worker processes a
+chunk at a time, with only a few chunks in flight, so memory use does
+not grow with the number of saves.
+
+Run with: python save_fsck.py data/save_games --report fsck.jsonl --repair
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import character_manager
+import game_data
+import game_output
+from custom_exceptions import InvalidSaveDataError, SaveFileCorruptedError
+
+SAVE_SUFFIX = "_save.txt"
+
+# Saves per worker task, and tasks queued per worker
+CHUNK_SIZE = 500
+CHUNKS_PER_WORKER = 2
+
+# Saved effective stat lines and the stats they should match
+STAT_LINES = (("MAX_HEALTH", "max_health"), ("STRENGTH", "strength"), ("MAGIC", "magic"))
+
+# Catalogs of the process doing the checking
+_catalogs = {}
+
+# ============================================================================
+# CHECKING ONE SAVE
+# ============================================================================
+
+def check_save(path, quests, items, repair=False, quarantine_directory=None):
+    """
+    Check one save file, and repair or quarantine it if asked
+
+    Args:
+        path: Save file path
+        quests / items: Catalogs to check IDs against
+        repair: Rewrite the file if every problem is fixable
+        quarantine_directory: Move files that stay bad here (or None)
+
+    Returns: Dictionary with file, status ('ok', 'invalid', 'corrupt' or
+             'repaired'), errors [[field, message]], repairs [message]
+             and quarantined (new path or None). A failed rewrite or move
+             adds a ["repair", ...] or ["quarantine", ...] error.
+    """
+    result = {'file': path, 'status': 'ok', 'errors': [], 'repairs': [], 'quarantined': None}
+    try:
+        data_map = character_manager.read_save_file(path)
+        character = character_manager.character_from_save_data(data_map)
+    except (SaveFileCorruptedError, InvalidSaveDataError) as e:
+        result['status'] = 'corrupt'
+        result['errors'].append(["file", str(e)])
+        _quarantine(result, quarantine_directory)
+        return result
+
+    errors = find_save_errors(path, data_map, character, quests, items)
+    if not errors:
+        return result
+    result['status'] = 'invalid'
+    result['errors'] = [list(error) for error in errors]
+
+    if repair:
+        repairs = repair_character(character, quests, items)
+        if not character_manager.find_character_errors(character, quests, items) \
+                and _name_matches(path, character):
+            try:
+                character_manager.save_character(character, os.path.dirname(path) or ".")
+            except OSError as e:
+                # Still bad on disk, so it can be quarantined below
+                result['errors'].append(["repair", f"could not rewrite: {e}"])
+            else:
+                result['status'] = 'repaired'
+                result['repairs'] = repairs or ["rewrote stats from base stats and modifiers"]
+                return result
+
+    _quarantine(result, quarantine_directory)
+    return result
+
+def find_save_errors(path, data_map, character, quests, items):
+    """
+    Collect every problem with a loaded save, including the ones
+    character_from_save_data fixed quietly
+
+    Returns: List of (field, message) tuples
+    """
+    errors = character_manager.find_character_errors(character, quests, items)
+    if not _name_matches(path, character):
+        errors.append(("name", f"file name does not match NAME '{character['name']}'"))
+
+    saved_health = int(data_map["HEALTH"])
+    if saved_health != character['health']:
+        errors.append(("health", f"health {saved_health} is above "
+                                 f"max_health {character['max_health']}"))
+    for key, stat in STAT_LINES:
+        saved = int(data_map[key])
+        if saved != character[stat]:
+            errors.append((stat, f"saved {stat} {saved} does not match base stats "
+                                 f"and modifiers ({character[stat]})"))
+    return errors
+
+def repair_character(character, quests, items):
+    """
+    Fix what can be fixed without guessing
+
+    Returns: List of messages describing each change
+    """
+    repairs = []
+    for field in ("active_quests", "completed_quests"):
+        unknown = [quest_id for quest_id in character[field] if quest_id not in quests]
+        if unknown:
+            character[field] = [quest_id for quest_id in character[field] if quest_id in quests]
+            repairs.append(f"dropped unknown quests from {field}: {', '.join(unknown)}")
+
+    both = [quest_id for quest_id in character['active_quests']
+            if quest_id in character['completed_quests']]
+    if both:
+        character['active_quests'] = [quest_id for quest_id in character['active_quests']
+                                      if quest_id not in both]
+        repairs.append(f"kept only as completed: {', '.join(both)}")
+
+    unknown = [item_id for item_id in character['inventory'] if item_id not in items]
+    if unknown:
+        character['inventory'] = [item_id for item_id in character['inventory'] if item_id in items]
+        repairs.append(f"dropped unknown items: {', '.join(unknown)}")
+
+    for field, source in (("equipped_weapon", "weapon"), ("equipped_armor", "armor")):
+        item_id = character.get(field)
+        if item_id is not None and item_id not in items:
+            character[field] = None
+            character_manager.remove_stat_modifier(character, source)
+            repairs.append(f"unequipped unknown item {item_id}")
+    return repairs
+
+def _name_matches(path, character):
+    return os.path.basename(path) == character['name'] + SAVE_SUFFIX
+
+def _quarantine(result, quarantine_directory):
+    if quarantine_directory is None:
+        return
+    target = os.path.join(quarantine_directory, os.path.basename(result['file']))
+    try:
+        os.makedirs(quarantine_directory, exist_ok=True)
+        shutil.move(result['file'], target)
+    except OSError as e:
+        result['errors'].append(["quarantine", f"could not move to {quarantine_directory}: {e}"])
+        return
+    result['quarantined'] = target
+
+# ============================================================================
+# SCANNING
+# ============================================================================
+
+def iter_save_files(save_directory):
+    """Yield the path of every save file, without listing them all first"""
+    with os.scandir(save_directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(SAVE_SUFFIX) and entry.is_file():
+                yield entry.path
+
+def iter_chunks(paths, size=CHUNK_SIZE):
+    """Group paths into lists of up to size"""
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _use_catalog(catalog_name):
+    """Worker initializer: attach to the published catalog"""
+    _catalogs.update(game_data.attach_catalog(catalog_name))
+
+def _check_chunk(job):
+    """Worker entry point: check one chunk of saves"""
+    paths, repair, quarantine_directory = job
+    quests, items = _catalogs['quests'], _catalogs['items']
+    with game_output.use_sink(game_output.NullSink()):
+        return [check_save(path, quests, items, repair, quarantine_directory) for path in paths]
+
+def _map_bounded(pool, function, jobs, in_flight):
+    """Like pool.map, but only submits in_flight jobs ahead of the results"""
+    pending = deque()
+    for job in jobs:
+        pending.append(pool.submit(function, job))
+        if len(pending) >= in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def scan_saves(save_directory="data/save_games", quest_file="data/quests.txt",
+               item_file="data/items.txt", workers=None, repair=False,
+               quarantine_directory=None):
+    """
+    Check every save in a directory
+
+    Args:
+        workers: Number of worker processes (os.cpu_count() if None,
+                 1 checks everything in this process)
+        repair / quarantine_directory: See check_save
+
+    Yields: check_save results, chunk by chunk, in directory order
+    Raises: MissingDataFileError, InvalidDataFormatError for bad data files
+    """
+    quests = game_data.load_quests(quest_file)
+    items = game_data.load_items(item_file)
+    jobs = ((chunk, repair, quarantine_directory)
+            for chunk in iter_chunks(iter_save_files(save_directory)))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        _catalogs.update(quests=quests, items=items)
+        for job in jobs:
+            yield from _check_chunk(job)
+        return
+
+    # The data is parsed once here; workers attach to it in shared memory
+    with game_data.publish_catalog(quests, items) as catalog:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_use_catalog,
+                                 initargs=(catalog.name,)) as pool:
+            for results in _map_bounded(pool, _check_chunk, jobs, workers * CHUNKS_PER_WORKER):
+                yield from results
+
+def write_report(results, report_file=None, include_ok=False):
+    """
+    Stream results to a JSON Lines report and count them
+
+    Args:
+        results: Iterable of check_save results
+        report_file: Report path (no report if None)
+        include_ok: Also write a line for every save that passed
+
+    Returns: Dictionary {status: count} plus 'scanned' and 'quarantined'
+    """
+    summary = {'scanned': 0, 'ok': 0, 'invalid': 0, 'corrupt': 0, 'repaired': 0, 'quarantined': 0}
+    report = open(report_file, 'w') if report_file else None
+    try:
+        for result in results:
+            summary['scanned'] += 1
+            summary[result['status']] += 1
+            if result['quarantined']:
+                summary['quarantined'] += 1
+            if report and (include_ok or result['status'] != 'ok'):
+                report.write(json.dumps(result) + "\n")
+    finally:
+        if report:
+            report.close()
+    return summary
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find corrupt and invalid save files")
+    parser.add_argument("save_directory", nargs="?", default="data/save_games")
+    parser.add_argument("--quest-file", default="data/quests.txt")
+    parser.add_argument("--item-file", default="data/items.txt")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--report", default=None, help="JSON Lines file for problems found")
+    parser.add_argument("--all", action="store_true", help="report saves that passed too")
+    parser.add_argument("--repair", action="store_true", help="rewrite fixable saves")
+    parser.add_argument("--quarantine", default=None,
+                        help="move saves that stay bad into this directory")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = scan_saves(args.save_directory, args.quest_file, args.item_file,
+                         args.workers, args.repair, args.quarantine)
+    summary = write_report(results, args.report, args.all)
+    elapsed = time.perf_counter() - started
+
+    print(f"Scanned {summary['scanned']} saves in {elapsed:.1f}s: {summary['ok']} ok, "
+          f"{summary['invalid']} invalid, {summary['corrupt']} corrupt, "
+          f"{summary['repaired']} repaired, {summary['quarantined']} quarantined")
@@ -0,0 +1,326 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Shared Catalog Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Quest and item data in shared memory, for multi-process workers.
+
+One process parses the data files and publish()es the catalog into a
+multiprocessing.shared_memory block. Worker processes attach() to it by
+name and read it in place: nothing is parsed or copied when attaching,
+and a field is only turned into a Python value when it is read. Every
+worker maps the same physical pages, so a worker's memory no longer
+grows with the catalog.
+
+Block layout (little-endian, every section starts 8-byte aligned):
+
+    header   magic, version, total size, quest table offset, item table offset
+    table    record count, id index size, string heap size
+             id index:  uint32 slots, record numbers in an open-addressing
+                        hash table keyed by crc32 of the id
+             per field: int64 per record (numbers) or
+                        uint32 per record + 1 (string offsets into the heap)
+             heap:      UTF-8 text of every string field
+
+Records keep their file order; lookups by id go through the id index.
+Attached tables and records are read-only Mappings, so game code that
+reads quests[quest_id]['reward_xp'] works unchanged.
+"""
+
+import array
+import mmap
+import os
+import struct
+import zlib
+from collections.abc import Mapping
+
+from custom_exceptions import CorruptedDataError, MissingDataFileError
+
+MAGIC = b"QCAT"
+VERSION = 1
+
+HEADER = struct.Struct("<4sIQQQ")
+TABLE_HEADER = struct.Struct("<QQQ")
+
+# Id index slot with no record in it
+EMPTY_SLOT = 0xFFFFFFFF
+
+# Where Linux exposes POSIX shared memory blocks as files
+SHM_DIRECTORY = "/dev/shm"
+
+# Field name and type for every record, id field first
+QUEST_SCHEMA = (
+    ('quest_id', str), ('title', str), ('description', str), ('reward_xp', int),
+    ('reward_gold', int), ('required_level', int), ('prerequisite', str)
+)
+ITEM_SCHEMA = (
+    ('item_id', str), ('name', str), ('type', str), ('effect', str),
+    ('cost', int), ('description', str)
+)
+
+# SharedMemory objects attached without /dev/shm, kept open for the
+# life of the process because tables point into their buffers
+_attached = []
+
+# ============================================================================
+# PUBLISHING
+# ============================================================================
+
+class SharedCatalog:
+    """A published catalog, owned by the process that published it"""
+
+    def __init__(self, memory, size):
+        self.memory = memory
+        self.name = memory.name
+        self.size = size
+
+    def close(self):
+        """Unmap the block from this process (workers keep theirs)"""
+        self.memory.close()
+
+    def unlink(self):
+        """Free the block once no new worker needs to attach"""
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        self.unlink()
+        return False
+
+def publish(quests, items, name=None):
+    """
+    Copy parsed quests and items into a new shared memory block
+
+    Args:
+        quests / items: Dictionaries from game_data.load_quests/load_items
+        name: Block name (a random one if None)
+
+    Returns: SharedCatalog; pass its name to attach() in the workers
+    """
+    from multiprocessing import shared_memory
+
+    blob = encode_catalog(quests, items)
+    memory = shared_memory.SharedMemory(name=name, create=True, size=len(blob))
+    memory.buf[:len(blob)] = blob
+    return SharedCatalog(memory, len(blob))
+
+def encode_catalog(quests, items):
+    """
+    Build the whole shared block
+
+    Returns: bytes in the layout described at the top of the module
+    """
+    blob = bytearray(HEADER.size)
+    _pad(blob)
+    quest_offset = len(blob)
+    blob += encode_table(quests, QUEST_SCHEMA)
+    _pad(blob)
+    item_offset = len(blob)
+    blob += encode_table(items, ITEM_SCHEMA)
+    _pad(blob)
+    HEADER.pack_into(blob, 0, MAGIC, VERSION, len(blob), quest_offset, item_offset)
+    return bytes(blob)
+
+def encode_table(records, schema):
+    """Build one table from a {record_id: record} dictionary"""
+    records = list(records.values())
+    count = len(records)
+    id_field = schema[0][0]
+
+    # Id index: at most half full, so probes stay short
+    slots = 8
+    while slots < 2 * count:
+        slots *= 2
+    index = array.array('I', [EMPTY_SLOT]) * slots
+    for number, record in enumerate(records):
+        slot = zlib.crc32(record[id_field].encode('utf-8')) & (slots - 1)
+        while index[slot] != EMPTY_SLOT:
+            slot = (slot + 1) & (slots - 1)
+        index[slot] = number
+
+    heap = bytearray()
+    columns = []
+    for field, kind in schema:
+        if kind is int:
+            columns.append(array.array('q', (record[field] for record in records)))
+            continue
+        offsets = array.array('I', [len(heap)])
+        for record in records:
+            heap += str(record[field]).encode('utf-8')
+            offsets.append(len(heap))
+        columns.append(offsets)
+    if len(heap) >= 2 ** 32:
+        raise ValueError("Catalog text is too large for 32-bit string offsets")
+
+    blob = bytearray(TABLE_HEADER.pack(count, slots, len(heap)))
+    blob += index.tobytes()
+    _pad(blob)
+    for column in columns:
+        blob += column.tobytes()
+        _pad(blob)
+    blob += heap
+    return blob
+
+def _pad(blob):
+    blob += bytes(-len(blob) % 8)
+
+# ============================================================================
+# ATTACHING
+# ============================================================================
+
+def attach(name):
+    """
+    Attach to a published catalog, read-only
+
+    Returns: Dictionary with 'quests' and 'items' (CatalogTable mappings)
+    Raises: MissingDataFileError if no block has that name,
+            CorruptedDataError if the block is not a catalog
+    """
+    buffer = _map_read_only(name)
+    if len(buffer) < HEADER.size:
+        raise CorruptedDataError(f"Shared catalog '{name}' is too small.")
+    magic, version, size, quest_offset, item_offset = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION or size > len(buffer):
+        raise CorruptedDataError(f"Shared block '{name}' is not a version {VERSION} catalog.")
+
+    return {
+        'quests': CatalogTable(buffer, quest_offset, QUEST_SCHEMA),
+        'items': CatalogTable(buffer, item_offset, ITEM_SCHEMA)
+    }
+
+def _map_read_only(name):
+    path = os.path.join(SHM_DIRECTORY, name.lstrip("/"))
+    if os.path.exists(path):
+        # Map the block's file directly: truly read-only, and the
+        # resource tracker never adopts (and later deletes) the block
+        with open(path, 'rb') as f:
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    from multiprocessing import shared_memory
+    try:
+        memory = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Shared catalog '{name}' not found.")
+    _attached.append(memory)
+    return memory.buf.toreadonly()
+
+class CatalogTable(Mapping):
+    """Read-only {record_id: CatalogRecord} view of one table"""
+
+    def __init__(self, buffer, offset, schema):
+        count, slots, heap_size = TABLE_HEADER.unpack_from(buffer, offset)
+        position = offset + TABLE_HEADER.size
+
+        self._count = count
+        self._mask = slots - 1
+        self._index = buffer[position:position + 4 * slots].cast('I')
+        position += _aligned(4 * slots)
+
+        # field -> (kind, column view)
+        self._columns = {}
+        for field, kind in schema:
+            if kind is int:
+                length = 8 * count
+                self._columns[field] = (int, buffer[position:position + length].cast('q'))
+            else:
+                length = 4 * (count + 1)
+                self._columns[field] = (str, buffer[position:position + length].cast('I'))
+            position += _aligned(length)
+
+        self._heap = buffer[position:position + heap_size]
+        self.fields = tuple(field for field, _ in schema)
+        self._ids = self._columns[self.fields[0]][1]
+
+    def read(self, index, field):
+        """Return one field of the record at a position"""
+        kind, column = self._columns[field]
+        if kind is int:
+            return column[index]
+        return str(self._heap[column[index]:column[index + 1]], 'utf-8')
+
+    def find(self, record_id):
+        """Return the position of a record, or -1"""
+        if not isinstance(record_id, str):
+            return -1
+        wanted = record_id.encode('utf-8')
+        ids, heap, index, mask = self._ids, self._heap, self._index, self._mask
+        slot = zlib.crc32(wanted) & mask
+        while True:
+            number = index[slot]
+            if number == EMPTY_SLOT:
+                return -1
+            if heap[ids[number]:ids[number + 1]] == wanted:
+                return number
+            slot = (slot + 1) & mask
+
+    def __getitem__(self, record_id):
+        index = self.find(record_id)
+        if index < 0:
+            raise KeyError(record_id)
+        return CatalogRecord(self, index)
+
+    def __contains__(self, record_id):
+        return self.find(record_id) >= 0
+
+    def get(self, record_id, default=None):
+        # Mapping.get would raise and catch KeyError for a missing id
+        index = self.find(record_id)
+        if index < 0:
+            return default
+        return CatalogRecord(self, index)
+
+    def __iter__(self):
+        id_field = self.fields[0]
+        for index in range(self._count):
+            yield self.read(index, id_field)
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"<CatalogTable of {self._count} records>"
+
+class CatalogRecord(Mapping):
+    """Read-only view of one record; fields are decoded when read"""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, field):
+        if field not in self._table._columns:
+            raise KeyError(field)
+        return self._table.read(self._index, field)
+
+    def __iter__(self):
+        return iter(self._table.fields)
+
+    def __len__(self):
+        return len(self._table.fields)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+def _aligned(length):
+    return length + (-length % 8)
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== SHARED CATALOG TEST ===")
+
+    # import game_data
+    # with publish(game_data.load_quests(), game_data.load_items()) as catalog:
+    #     data = attach(catalog.name)
+    #     print(len(data['quests']), "quests,", catalog.size, "bytes")
@@ -0,0 +1,44 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Status Codes Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Status codes returned by the non-raising try_* functions in quest_handler
+and inventory_system, so bulk tools can check an action without an
+exception being built. 0 (OK) means it worked; STATUS_NAMES gives each
+code's name for reports.
+"""
+
+# ============================================================================
+# STATUS CODES
+# ============================================================================
+
+OK = 0
+QUEST_NOT_FOUND = 1
+QUEST_ALREADY_COMPLETED = 2
+QUEST_ALREADY_ACTIVE = 3
+LEVEL_TOO_LOW = 4
+PREREQUISITE_NOT_MET = 5
+ITEM_NOT_FOUND = 6
+WRONG_ITEM_TYPE = 7
+INVALID_ITEM_EFFECT = 8
+INVENTORY_FULL = 9
+NOT_ENOUGH_GOLD = 10
+
+STATUS_NAMES = {
+    OK: "OK",
+    QUEST_NOT_FOUND: "QUEST_NOT_FOUND",
+    QUEST_ALREADY_COMPLETED: "QUEST_ALREADY_COMPLETED",
+    QUEST_ALREADY_ACTIVE: "QUEST_ALREADY_ACTIVE",
+    LEVEL_TOO_LOW: "LEVEL_TOO_LOW",
+    PREREQUISITE_NOT_MET: "PREREQUISITE_NOT_MET",
+    ITEM_NOT_FOUND: "ITEM_NOT_FOUND",
+    WRONG_ITEM_TYPE: "WRONG_ITEM_TYPE",
+    INVALID_ITEM_EFFECT: "INVALID_ITEM_EFFECT",
+    INVENTORY_FULL: "INVENTORY_FULL",
+    NOT_ENOUGH_GOLD: "NOT_ENOUGH_GOLD"
+}
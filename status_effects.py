@@ -0,0 +1,279 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Status Effects Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Handles timed combat effects (poison, shields, strength buffs) and
+per-ability cooldowns.
+
+Effect expiry is managed by a timing wheel: each effect sits in the slot
+for the turn it ends, so advancing one turn only looks at the effects
+that end on that turn. Totals per target (poison damage, strength bonus)
+are kept up to date as effects start and end, so a turn never has to
+walk every active effect either.
+"""
+
+# Number of slots in the timing wheel. Effects lasting longer than this
+# wrap around and are skipped until their turn comes up.
+WHEEL_SIZE = 64
+
+POISON = 'poison'
+SHIELD = 'shield'
+STRENGTH = 'strength'
+VALID_EFFECTS = [POISON, SHIELD, STRENGTH]
+
+# ============================================================================
+# TIMING WHEEL
+# ============================================================================
+
+class TimingWheel:
+    """
+    Hashed timing wheel that tracks when entries expire
+
+    schedule() and advance() cost O(1) plus the number of entries in the
+    slot being advanced.
+    """
+
+    def __init__(self, size=WHEEL_SIZE):
+        self.size = size
+        self.slots = [[] for _ in range(size)]
+        self.now = 0
+
+    def schedule(self, entry, delay):
+        """
+        Schedule an entry to expire after a number of turns
+
+        Args:
+            entry: Any object
+            delay: Turns from now (at least 1)
+
+        Returns: The turn number the entry expires on
+        """
+        expires = self.now + max(1, delay)
+        self.slots[expires % self.size].append((expires, entry))
+        return expires
+
+    def advance(self):
+        """
+        Move forward one turn
+
+        Returns: List of entries that expire on the new turn
+        """
+        self.now += 1
+        slot = self.slots[self.now % self.size]
+        if not slot:
+            return []
+
+        expired = []
+        later = []
+        for expires, entry in slot:
+            if expires == self.now:
+                expired.append(entry)
+            else:
+                # Wrapped around: belongs to a later lap of the wheel
+                later.append((expires, entry))
+        self.slots[self.now % self.size] = later
+        return expired
+
+# ============================================================================
+# STATUS EFFECTS
+# ============================================================================
+
+class StatusEffect:
+    """One active effect on one target"""
+
+    __slots__ = ('target', 'kind', 'magnitude', 'remaining', 'active')
+
+    def __init__(self, target, kind, magnitude):
+        self.target = target
+        self.kind = kind
+        self.magnitude = magnitude
+        # Shields use this as the damage they can still absorb
+        self.remaining = magnitude
+        self.active = True
+
+class StatusEffects:
+    """
+    All status effects in one battle
+
+    Targets are the combatant dictionaries themselves (tracked by id, as
+    dictionaries cannot be dictionary keys).
+    """
+
+    def __init__(self):
+        self.wheel = TimingWheel()
+        self.targets = {}
+        # Running totals per target id
+        self.poison_totals = {}
+        self.strength_totals = {}
+        self.shields = {}
+        # Active effects per target id, and per (target id, kind): a total
+        # can add up to 0 while effects on it are still running
+        self.effect_counts = {}
+        self.stack_counts = {}
+
+    def add(self, target, kind, magnitude, duration):
+        """
+        Put an effect on a target
+
+        Args:
+            target: Combatant dictionary
+            kind: 'poison' (damage per turn), 'shield' (damage absorbed)
+                  or 'strength' (bonus damage, negative for a debuff)
+            magnitude: Size of the effect
+            duration: Turns the effect lasts
+
+        Returns: The StatusEffect (pass it to remove() to end it early)
+        Raises: ValueError if kind is not a valid effect
+        """
+        if kind not in VALID_EFFECTS:
+            raise ValueError(f"Unknown status effect '{kind}'. Valid: {VALID_EFFECTS}")
+
+        key = id(target)
+        self.targets[key] = target
+        self.effect_counts[key] = self.effect_counts.get(key, 0) + 1
+        effect = StatusEffect(target, kind, magnitude)
+
+        if kind == POISON:
+            self._add_total(self.poison_totals, key, kind, magnitude)
+        elif kind == STRENGTH:
+            self._add_total(self.strength_totals, key, kind, magnitude)
+        else:
+            self.shields.setdefault(key, []).append(effect)
+
+        self.wheel.schedule(effect, duration)
+        return effect
+
+    def remove(self, effect):
+        """End an effect now (its wheel entry is ignored when it comes up)"""
+        if not effect.active:
+            return
+        effect.active = False
+        key = id(effect.target)
+
+        if effect.kind == POISON:
+            self._reduce_total(self.poison_totals, key, POISON, effect.magnitude)
+        elif effect.kind == STRENGTH:
+            self._reduce_total(self.strength_totals, key, STRENGTH, effect.magnitude)
+        else:
+            shields = self.shields[key]
+            shields.remove(effect)
+            if not shields:
+                del self.shields[key]
+
+        # Forget targets with nothing left on them
+        self.effect_counts[key] -= 1
+        if self.effect_counts[key] == 0:
+            del self.effect_counts[key]
+            del self.targets[key]
+
+    def tick(self):
+        """
+        End one turn: poisoned targets take damage, finished effects expire
+
+        Returns: Dictionary {target id: poison damage dealt}
+        """
+        poison_dealt = {}
+        for key, damage in self.poison_totals.items():
+            target = self.targets[key]
+            dealt = min(damage, target['health'])
+            target['health'] -= dealt
+            poison_dealt[key] = dealt
+
+        for effect in self.wheel.advance():
+            self.remove(effect)
+
+        return poison_dealt
+
+    def absorb(self, target, damage):
+        """
+        Let the target's shields soak up incoming damage
+
+        Returns: Damage left after shields
+        """
+        shields = self.shields.get(id(target))
+        if not shields:
+            return damage
+
+        for effect in list(shields):
+            absorbed = min(effect.remaining, damage)
+            effect.remaining -= absorbed
+            damage -= absorbed
+            if effect.remaining <= 0:
+                self.remove(effect)
+            if damage <= 0:
+                break
+        return damage
+
+    def get_strength_bonus(self, target):
+        """Total bonus damage from strength effects on a target"""
+        return self.strength_totals.get(id(target), 0)
+
+    def get_poison_damage(self, target):
+        """Total poison damage a target takes each turn"""
+        return self.poison_totals.get(id(target), 0)
+
+    def get_shield(self, target):
+        """Total damage a target's shields can still absorb"""
+        return sum(effect.remaining for effect in self.shields.get(id(target), []))
+
+    def _add_total(self, totals, key, kind, amount):
+        totals[key] = totals.get(key, 0) + amount
+        self.stack_counts[key, kind] = self.stack_counts.get((key, kind), 0) + 1
+
+    def _reduce_total(self, totals, key, kind, amount):
+        totals[key] -= amount
+        self.stack_counts[key, kind] -= 1
+        if self.stack_counts[key, kind] == 0:
+            del self.stack_counts[key, kind]
+            del totals[key]
+
+# ============================================================================
+# COOLDOWNS
+# ============================================================================
+
+class CooldownTracker:
+    """
+    Per-ability cooldowns
+
+    Stores the turn each ability is ready again, so ticking a turn is O(1)
+    no matter how many abilities are cooling down.
+    """
+
+    def __init__(self):
+        self.now = 0
+        self.ready_at = {}
+
+    def start(self, ability, turns):
+        """Put an ability on cooldown for a number of turns"""
+        self.ready_at[ability] = self.now + turns
+
+    def remaining(self, ability):
+        """Turns left before an ability is ready (0 means ready)"""
+        return max(0, self.ready_at.get(ability, 0) - self.now)
+
+    def is_ready(self, ability):
+        """Check if an ability can be used"""
+        return self.remaining(ability) == 0
+
+    def tick(self):
+        """Move forward one turn"""
+        self.now += 1
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== STATUS EFFECTS TEST ===")
+
+    # hero = {'name': 'Hero', 'health': 100}
+    # effects = StatusEffects()
+    # effects.add(hero, POISON, 5, duration=3)
+    # for turn in range(4):
+    #     effects.tick()
+    #     print(f"Turn {turn + 1}: HP={hero['health']}")
@@ -0,0 +1,161 @@
+"""
+Test Benchmarks
+Tests the benchmark scripts and the scale-testing content tools
+"""
+
+import pytest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import bench_utils
+import bench_hot_paths
+import bench_memory
+import bench_startup
+import content_generator
+import character_manager
+import game_data
+import quest_handler
+
+# ============================================================================
+# HOT PATH BENCHMARK TESTS
+# ============================================================================
+
+def test_hot_path_benchmark_reports_json_ready_timings():
+    """Test one benchmark end to end on generated data"""
+    report = bench_hot_paths.run_benchmarks(
+        scale=1, repeat=1, selected=["quest_handler.get_quest_prerequisite_chain"]
+    )
+    
+    timing = report['results']["quest_handler.get_quest_prerequisite_chain"]
+    assert timing['median_s'] > 0
+    assert timing['repeat'] == 1
+    assert report['info']['scale'] == 1
+
+def test_unknown_benchmark_name_is_rejected():
+    """Test that a misspelled benchmark name fails before any work"""
+    with pytest.raises(ValueError):
+        bench_hot_paths.run_benchmarks(selected=["no_such_benchmark"])
+
+def test_synthetic_quests_form_chains(tmp_path):
+    """Test that generated quests load and chain as described"""
+    import random
+    
+    filename = str(tmp_path / "quests.txt")
+    quest_ids = bench_hot_paths.write_quest_file(filename, 40, random.Random(0))
+    quests = game_data.load_quests(filename)
+    
+    chain = quest_handler.get_quest_prerequisite_chain(quest_ids[-1], quests)
+    assert len(chain) == bench_hot_paths.QUEST_CHAIN_LENGTH
+    assert chain[0] == quest_ids[20]
+
+def test_compare_results_flags_changes():
+    """Test slower/faster/same verdicts"""
+    old = {'results': {'a': {'median_s': 1.0}, 'b': {'median_s': 1.0}, 'c': {'median_s': 1.0}}}
+    new = {'results': {'a': {'median_s': 1.5}, 'b': {'median_s': 0.5}, 'c': {'median_s': 1.05}}}
+    
+    verdicts = {row[0]: row[4] for row in bench_utils.compare_results(old, new)}
+    assert verdicts == {'a': 'slower', 'b': 'faster', 'c': 'same'}
+
+# ============================================================================
+# STARTUP BENCHMARK TESTS
+# ============================================================================
+
+def test_parse_importtime_reads_self_and_cumulative_times():
+    """Test reading -X importtime output"""
+    text = ("import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   metrics\n"
+            "import time:      2000 |       2120 | main\n")
+    
+    assert bench_startup.parse_importtime(text) == {'metrics': (120, 120), 'main': (2000, 2120)}
+
+def test_startup_benchmark_reaches_main_menu():
+    """Test the subprocess measurements end to end"""
+    report = bench_startup.run_startup_benchmarks(repeat=1)
+    
+    results = report['results']
+    assert set(results) == {'startup.interpreter', 'startup.import_main', 'startup.first_menu'}
+    assert results['startup.first_menu']['median_s'] > results['startup.interpreter']['median_s']
+    assert results['startup.import_main']['total_us'] > 0
+    assert results['startup.import_main']['top_imports']
+
+# ============================================================================
+# MEMORY BENCHMARK TESTS
+# ============================================================================
+
+def test_memory_benchmark_measures_each_representation():
+    """Test that every entity type is measured in each representation"""
+    report = bench_memory.run_memory_benchmarks(characters=200, catalog=200)
+    results = report['results']
+    
+    assert len(results) == 11
+    for entity in ['character', 'quest', 'item']:
+        dict_size = results[f"memory.{entity}.dict"]['steady_bytes_per_entity']
+        slots_size = results[f"memory.{entity}.slots"]['steady_bytes_per_entity']
+        assert 0 < slots_size < dict_size
+        assert results[f"memory.{entity}.dict"]['top_sites']
+    for entity in ['quest', 'item']:
+        record_size = results[f"memory.{entity}.record"]['steady_bytes_per_entity']
+        assert 0 < record_size < results[f"memory.{entity}.dict"]['steady_bytes_per_entity']
+
+def test_slots_records_keep_every_field():
+    """Test that the compact alternatives hold the same data"""
+    item = {'item_id': 'a', 'name': 'A', 'type': 'weapon', 'effect': 'strength:1',
+            'cost': 5, 'description': 'd'}
+    record = bench_memory.SlotsItem(item)
+    
+    assert record.effect == 'strength:1'
+    assert bench_memory.REPRESENTATIONS['item']['tuple'](item).cost == 5
+
+# ============================================================================
+# CONTENT GENERATOR TESTS
+# ============================================================================
+
+def test_generated_quests_respect_depth_and_fan_out():
+    """Test the shape of the generated prerequisite forest"""
+    quests = content_generator.generate_quests(500, seed=4, max_depth=4, fan_out=2)
+    
+    follow_ups = {}
+    for quest in quests.values():
+        follow_ups[quest['prerequisite']] = follow_ups.get(quest['prerequisite'], 0) + 1
+    del follow_ups["NONE"]
+    
+    assert max(follow_ups.values()) <= 2
+    assert max(len(quest_handler.get_quest_prerequisite_chain(quest_id, quests))
+               for quest_id in quests) == 4
+    assert content_generator.generate_quests(500, seed=4, max_depth=4, fan_out=2) == quests
+
+def test_generated_content_loads_and_saves_are_reproducible(tmp_path):
+    """Test that packs load through game_data and saves match across worker counts"""
+    serial = content_generator.generate_content(
+        str(tmp_path / "serial"), quest_count=60, item_count=80, save_count=30, seed=9, workers=1
+    )
+    content_generator.SAVE_CHUNK_SIZE, chunk_size = 10, content_generator.SAVE_CHUNK_SIZE
+    try:
+        parallel = content_generator.generate_content(
+            str(tmp_path / "parallel"), quest_count=60, item_count=80, save_count=30, seed=9, workers=2
+        )
+    finally:
+        content_generator.SAVE_CHUNK_SIZE = chunk_size
+    
+    quests = game_data.load_quests(serial['quest_file'])
+    items = game_data.load_items(serial['item_file'])
+    assert quest_handler.validate_quest_prerequisites(quests)
+    assert len(items) == 80
+    
+    names = sorted(character_manager.list_saved_characters(serial['save_directory']))
+    assert len(names) == 30
+    for name in names:
+        character = character_manager.load_character(name, serial['save_directory'])
+        assert all(item_id in items for item_id in character['inventory'])
+        assert all(quests[quest_id]['required_level'] <= character['level']
+                   for quest_id in character['completed_quests'])
+        with open(os.path.join(serial['save_directory'], f"{name}_save.txt")) as first, \
+             open(os.path.join(parallel['save_directory'], f"{name}_save.txt")) as second:
+            assert first.read() == second.read()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
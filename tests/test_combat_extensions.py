@@ -0,0 +1,493 @@
+"""
+Test Combat Extensions
+Tests seeded battles, replays and the other combat add-ons
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+import battle_solver
+import encounter_system
+import game_output
+import status_effects
+from custom_exceptions import *
+
+# ============================================================================
+# SEEDED RNG AND REPLAY TESTS
+# ============================================================================
+
+def run_scripted_battle(char_class, enemy_type, actions, **battle_kwargs):
+    """Run a battle with a fixed list of actions instead of input()"""
+    char = character_manager.create_character("ReplayTest", char_class)
+    enemy = combat_system.create_enemy(enemy_type)
+    battle = combat_system.SimpleBattle(char, enemy, **battle_kwargs)
+    battle.script = iter(actions)
+    result = battle.start_battle()
+    return battle, result
+
+def test_seeded_battles_are_reproducible():
+    """Test that two battles with the same seed play out identically"""
+    actions = ['2', '1', '1', '1', '2', '1', '1', '1', '2', '1'] * 3
+    first, first_result = run_scripted_battle("Rogue", "orc", actions, seed=42)
+    second, second_result = run_scripted_battle("Rogue", "orc", actions, seed=42)
+    
+    assert first_result == second_result
+    assert first.actions == second.actions
+    assert first.character['health'] == second.character['health']
+
+def test_replay_record_reproduces_battle():
+    """Test that replay_battle re-runs a battle from its record"""
+    battle, result = run_scripted_battle("Rogue", "goblin", ['3', '2', '1'] * 20, seed=7)
+    record = battle.get_replay_record()
+    
+    assert record['seed'] == 7
+    assert record['winner'] == result['winner']
+    
+    replayed_result, replayed = combat_system.replay_battle(record)
+    assert replayed_result == result
+    assert replayed.character['health'] == battle.character['health']
+    assert replayed.enemy['health'] == battle.enemy['health']
+
+def test_replay_with_injected_rng():
+    """Test that an injected rng without a seed is still replayable"""
+    rng = random.Random(99)
+    rng.random()  # Advance it so the seed alone would not be enough
+    battle, result = run_scripted_battle("Rogue", "orc", ['2', '3', '1'] * 30, rng=rng)
+    record = battle.get_replay_record()
+    
+    assert record['seed'] is None
+    replayed_result, replayed = combat_system.replay_battle(record)
+    assert replayed_result == result
+    assert replayed.actions == battle.actions
+
+def test_replay_with_effects_added_between_rounds():
+    """Test that effects added with add_effect are part of the replay"""
+    char = character_manager.create_character("Poisoner", "Rogue")
+    enemy = combat_system.create_enemy("orc")
+    battle = combat_system.SimpleBattle(char, enemy, seed=5)
+    battle.script = iter(['1', '2', '1', '1', '3'] * 20)
+    battle.add_effect(enemy, 'poison', 10, 5)
+    battle.begin()
+    battle.step()
+    battle.step()
+    battle.add_effect(char, 'shield', 15, 3)
+    result = None
+    while result is None:
+        result = battle.step()
+    
+    record = battle.get_replay_record()
+    assert record['effects'] == [[1, 'enemy', 'poison', 10, 5], [3, 'character', 'shield', 15, 3]]
+    
+    replayed_result, replayed = combat_system.replay_battle(record)
+    assert replayed_result == result
+    assert replayed.actions == battle.actions
+    assert replayed.character['health'] == battle.character['health']
+    assert replayed.enemy['health'] == battle.enemy['health']
+    assert replayed.get_replay_record() == record
+
+def test_replay_record_requires_started_battle():
+    """Test that an unstarted battle has no replay record"""
+    battle = combat_system.SimpleBattle({'name': 'Test', 'health': 100}, {'name': 'Goblin', 'health': 50})
+    
+    with pytest.raises(CombatNotActiveError):
+        battle.get_replay_record()
+
+# ============================================================================
+# TRANSACTIONAL BATTLE TESTS
+# ============================================================================
+
+def test_transactional_battle_leaves_character_untouched():
+    """Test that a transactional battle only changes its snapshot"""
+    battle, result = run_scripted_battle("Warrior", "goblin", ['1'] * 20,
+                                         seed=1, transactional=True)
+    char = battle.live_character
+    
+    assert result['winner'] == 'player'
+    assert char['health'] == char['max_health']
+    assert char['experience'] == 0
+    assert battle.character['experience'] == result['xp_gained']
+
+def test_transactional_battle_commit():
+    """Test that commit writes the battle results in one step"""
+    battle, result = run_scripted_battle("Warrior", "goblin", ['1'] * 20,
+                                         seed=1, transactional=True)
+    char = battle.live_character
+    changes = battle.commit()
+    
+    assert char['experience'] == result['xp_gained']
+    assert char['gold'] == 100 + result['gold_gained']
+    assert char['health'] == changes['health']
+    assert 'inventory' not in changes
+
+def test_transactional_battle_discard():
+    """Test that discard throws away the battle results"""
+    battle, result = run_scripted_battle("Rogue", "orc", ['1'] * 20,
+                                         seed=3, transactional=True)
+    battle.discard()
+    
+    assert battle.character['health'] == battle.live_character['health']
+    assert battle.live_character['gold'] == 100
+
+def test_transactional_level_up_commits_and_discards_cleanly():
+    """Test a level up inside a transactional battle, kept and thrown away"""
+    for keep in (True, False):
+        char = character_manager.create_character("Leveler", "Warrior")
+        char['experience'] = 99
+        enemy = combat_system.create_enemy("goblin")
+        enemy['health'] = 1
+        battle = combat_system.SimpleBattle(char, enemy, seed=1, transactional=True)
+        battle.begin()
+        
+        assert battle.step('1')['winner'] == 'player'
+        assert battle.character['level'] == 2
+        assert char['base_stats'] == {'max_health': 120, 'strength': 15, 'magic': 5}
+        assert char['level'] == 1
+        
+        if keep:
+            battle.commit()
+            assert char['level'] == 2
+            assert char['base_stats'] == {'max_health': 130, 'strength': 17, 'magic': 7}
+            assert char['strength'] == 17
+        else:
+            battle.discard()
+            character_manager.recalculate_stats(char)
+            assert char['level'] == 1
+            assert char['strength'] == 15
+            assert char['max_health'] == 120
+
+def test_commit_requires_transactional_battle():
+    """Test that a normal battle cannot be committed"""
+    battle, result = run_scripted_battle("Warrior", "goblin", ['1'] * 20, seed=1)
+    
+    with pytest.raises(CombatNotActiveError):
+        battle.commit()
+
+# ============================================================================
+# STEP-BY-STEP BATTLE TESTS
+# ============================================================================
+
+def test_battle_step_api():
+    """Test driving a battle one round at a time"""
+    char = character_manager.create_character("StepTest", "Warrior")
+    enemy = combat_system.create_enemy("goblin")
+    battle = combat_system.SimpleBattle(char, enemy, seed=5)
+    
+    battle.begin()
+    result = None
+    rounds = 0
+    while result is None:
+        result = battle.step('1')
+        rounds += 1
+    
+    assert result['winner'] == 'player'
+    assert rounds == battle.turn
+    assert not battle.combat_active
+    
+    with pytest.raises(CombatNotActiveError):
+        battle.step('1')
+
+def test_step_matches_start_battle():
+    """Test that step() and start_battle() give the same fight"""
+    actions = ['2', '1', '1', '1'] * 10
+    stepped_char = character_manager.create_character("StepTest", "Rogue")
+    stepped = combat_system.SimpleBattle(stepped_char, combat_system.create_enemy("orc"), seed=11)
+    stepped.begin()
+    result = None
+    for action in actions:
+        result = stepped.step(action)
+        if result is not None:
+            break
+    
+    blocking, blocking_result = run_scripted_battle("Rogue", "orc", actions, seed=11)
+    
+    assert result == blocking_result
+    assert stepped.actions == blocking.actions
+
+def test_run_battles_interleaves():
+    """Test that many battles can be run together round-robin"""
+    battles = [
+        combat_system.SimpleBattle(
+            character_manager.create_character(f"Hero{i}", "Rogue"),
+            combat_system.create_enemy("orc"),
+            seed=i
+        )
+        for i in range(20)
+    ]
+    
+    results = combat_system.run_battles(battles, lambda battle: '2' if battle.ability_cooldown == 0 else '1')
+    
+    assert len(results) == 20
+    assert all(result['winner'] in ('player', 'enemy') for result in results)
+    for battle, result in zip(battles, results):
+        replayed_result, replayed = combat_system.replay_battle(battle.get_replay_record())
+        assert replayed_result == result
+
+# ============================================================================
+# ENCOUNTER TESTS
+# ============================================================================
+
+def test_raid_encounter_resolves():
+    """Test that a large party-vs-horde encounter finishes"""
+    party = [character_manager.create_character(f"Raider{i}", "Warrior") for i in range(10)]
+    horde = encounter_system.create_horde("goblin", 45)
+    
+    encounter = encounter_system.Encounter(party, horde, seed=2)
+    result = encounter.run()
+    
+    assert result['winner'] in ('party', 'horde')
+    if result['winner'] == 'party':
+        assert all(goblin['health'] == 0 for goblin in horde)
+        assert len(result['survivors']) > 0
+    else:
+        assert all(hero['health'] == 0 for hero in party)
+
+def test_encounter_faster_combatants_act_more():
+    """Test that initiative order follows the speed stat"""
+    fast = {'name': 'Fast', 'health': 1000, 'max_health': 1000, 'strength': 1, 'speed': 20}
+    slow = {'name': 'Slow', 'health': 1000, 'max_health': 1000, 'strength': 1, 'speed': 10}
+    encounter = encounter_system.Encounter([fast], [slow], seed=0)
+    encounter.begin()
+    
+    for _ in range(30):
+        encounter.step()
+    
+    # Fast acted twice as often, so Slow took twice the hits
+    assert 1000 - slow['health'] == 2 * (1000 - fast['health'])
+
+def test_encounter_weakest_targeting():
+    """Test that 'weakest' targeting focuses the lowest-health enemy"""
+    hero = character_manager.create_character("Focus", "Warrior")
+    horde = encounter_system.create_horde("goblin", 3)
+    horde[1]['health'] = 5
+    hero['speed'] = 1000  # Hero always acts first
+    
+    encounter = encounter_system.Encounter([hero], horde, seed=0, targeting='weakest')
+    encounter.begin()
+    encounter.step()
+    
+    assert horde[1]['health'] == 0
+    assert horde[0]['health'] == horde[0]['max_health']
+
+def test_encounter_requires_both_sides():
+    """Test that an encounter needs combatants on each side"""
+    with pytest.raises(InvalidTargetError):
+        encounter_system.Encounter([], encounter_system.create_horde("orc", 2))
+
+# ============================================================================
+# STATUS EFFECT AND COOLDOWN TESTS
+# ============================================================================
+
+def test_timing_wheel_expiry():
+    """Test that wheel entries expire on their turn, including long delays"""
+    wheel = status_effects.TimingWheel(size=8)
+    wheel.schedule('short', 2)
+    wheel.schedule('long', 20)
+    
+    expired_on = {}
+    for turn in range(1, 25):
+        for entry in wheel.advance():
+            expired_on[entry] = turn
+    
+    assert expired_on == {'short': 2, 'long': 20}
+
+def test_poison_and_expiry():
+    """Test that poison deals damage each turn until it expires"""
+    target = {'name': 'Target', 'health': 100}
+    effects = status_effects.StatusEffects()
+    effects.add(target, 'poison', 5, 3)
+    effects.add(target, 'poison', 2, 1)
+    
+    for _ in range(5):
+        effects.tick()
+    
+    assert target['health'] == 100 - 5 * 3 - 2
+    assert effects.get_poison_damage(target) == 0
+
+def test_effect_totals_survive_cancelling_out():
+    """Test effects whose totals pass through 0 while others are active"""
+    target = {'name': 'Target', 'health': 100}
+    effects = status_effects.StatusEffects()
+    effects.add(target, 'strength', 5, 1)
+    effects.add(target, 'strength', -5, 3)
+    effects.add(target, 'strength', 5, 3)
+    
+    effects.tick()
+    assert effects.get_strength_bonus(target) == 0
+    effects.tick()
+    effects.tick()
+    
+    assert effects.get_strength_bonus(target) == 0
+    assert effects.targets == {}
+    assert effects.strength_totals == {}
+
+def test_shield_absorbs_damage_in_battle():
+    """Test that a shield soaks damage before health"""
+    char = character_manager.create_character("ShieldTest", "Warrior")
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"), seed=1)
+    battle.add_effect(char, 'shield', 10, 5)
+    
+    battle.apply_damage(char, 6)
+    assert char['health'] == char['max_health']
+    battle.apply_damage(char, 6)
+    assert char['health'] == char['max_health'] - 2
+    assert battle.effects.get_shield(char) == 0
+
+def test_strength_buff_in_battle():
+    """Test that a strength effect raises attack damage"""
+    char = character_manager.create_character("BuffTest", "Warrior")
+    enemy = combat_system.create_enemy("goblin")
+    battle = combat_system.SimpleBattle(char, enemy, seed=1)
+    base_damage = battle.calculate_damage(char, enemy)
+    
+    battle.add_effect(char, 'strength', 4, 2)
+    assert battle.calculate_damage(char, enemy) == base_damage + 4
+    
+    with pytest.raises(ValueError):
+        battle.add_effect(char, 'sleep', 1, 1)
+
+def test_cooldowns_per_ability():
+    """Test that each ability has its own cooldown"""
+    cooldowns = status_effects.CooldownTracker()
+    cooldowns.start('fireball', 3)
+    cooldowns.start('heal', 1)
+    cooldowns.tick()
+    
+    assert cooldowns.is_ready('heal')
+    assert cooldowns.remaining('fireball') == 2
+    assert cooldowns.is_ready('never_used')
+
+def test_class_abilities_use_effects_and_own_cooldowns():
+    """Test the poison and shield abilities put on, and their cooldown names"""
+    cleric = character_manager.create_character("Healer", "Cleric")
+    battle = combat_system.SimpleBattle(cleric, combat_system.create_enemy("goblin"), seed=1)
+    battle.begin()
+    battle.step('2')
+    
+    # The goblin's attack went into the shield
+    assert cleric['health'] == cleric['max_health']
+    assert 0 < battle.effects.get_shield(cleric) < combat_system.CLERIC_SHIELD[0]
+    assert battle.cooldowns.remaining('heal') == combat_system.ABILITY_COOLDOWN - 1
+    assert battle.cooldowns.is_ready(combat_system.SPECIAL_ABILITY)
+    assert battle.applied_effects == []
+    
+    rogue = character_manager.create_character("Stabber", "Rogue")
+    dragon = combat_system.create_enemy("dragon")
+    battle = combat_system.SimpleBattle(rogue, dragon, seed=1)
+    battle.begin()
+    while battle.effects.get_poison_damage(dragon) == 0:
+        battle.cooldowns.ready_at.clear()
+        battle.step('2')
+    
+    assert battle.effects.get_poison_damage(dragon) == combat_system.ROGUE_POISON[0]
+    assert battle.ability_name == 'critical_strike'
+
+def test_poison_can_end_battle():
+    """Test that an enemy can die from poison at the end of a round"""
+    char = character_manager.create_character("PoisonTest", "Cleric")
+    enemy = combat_system.create_enemy("dragon")
+    battle = combat_system.SimpleBattle(char, enemy, seed=1)
+    battle.begin()
+    battle.add_effect(enemy, 'poison', 500, 2)
+    
+    # An invalid choice wastes the turn, so only the poison hurts the dragon
+    result = battle.step('0')
+    assert result['winner'] == 'player'
+
+# ============================================================================
+# BATTLE SOLVER TESTS
+# ============================================================================
+
+def test_solver_deterministic_battle():
+    """Test that a battle without coin flips is solved with certainty"""
+    char = character_manager.create_character("SolverTest", "Mage")
+    enemy = combat_system.create_enemy("orc")
+    
+    result = battle_solver.solve_battle(char, enemy, battle_solver.ability_when_ready_policy)
+    
+    assert result['win_probability'] == 1.0
+    assert result['expected_turns'] == 4.0
+    # The solver never changes the character or enemy
+    assert char['health'] == char['max_health']
+    assert enemy['health'] == enemy['max_health']
+
+def test_solver_probabilities_sum_to_one():
+    """Test that win, loss and escape probabilities cover every outcome"""
+    char = character_manager.create_character("SolverTest", "Rogue")
+    enemy = combat_system.create_enemy("orc")
+    
+    result = battle_solver.solve_battle(char, enemy, battle_solver.ability_when_ready_policy)
+    total = (result['win_probability'] + result['loss_probability']
+             + result['escape_probability'])
+    
+    assert abs(total - 1.0) < 1e-9
+    assert 0 < result['win_probability'] < 1
+
+def test_solver_escape_policy():
+    """Test that always running ends in an escape or a loss"""
+    char = character_manager.create_character("SolverTest", "Warrior")
+    enemy = combat_system.create_enemy("goblin")
+    
+    def run_policy(character_hp, enemy_hp, cooldown):
+        return '3'
+    
+    result = battle_solver.solve_battle(char, enemy, run_policy)
+    
+    assert result['win_probability'] == 0.0
+    assert result['escape_probability'] > 0.99
+    assert result['expected_turns'] == pytest.approx(2.0, rel=1e-6)
+
+def cautious_policy(character_hp, enemy_hp, cooldown):
+    """Run when hurt, otherwise use the ability whenever it is ready"""
+    if character_hp <= 40:
+        return '3'
+    return '2' if cooldown == 0 else '1'
+
+@pytest.mark.parametrize("char_class, enemy_type", [("Rogue", "orc"), ("Cleric", "dragon")])
+def test_solver_matches_simulated_battles(char_class, enemy_type):
+    """Test solved outcome rates against thousands of seeded SimpleBattles"""
+    battles = 3000
+    solved = battle_solver.solve_battle(character_manager.create_character("Sim", char_class),
+                                        combat_system.create_enemy(enemy_type), cautious_policy)
+    
+    counts = {'player': 0, 'enemy': 0, 'none': 0}
+    turns = 0
+    with game_output.use_sink(game_output.NullSink()):
+        for seed in range(battles):
+            char = character_manager.create_character("Sim", char_class)
+            enemy = combat_system.create_enemy(enemy_type)
+            battle = combat_system.SimpleBattle(char, enemy, seed=seed)
+            battle.begin()
+            result = None
+            while result is None:
+                result = battle.step(cautious_policy(char['health'], enemy['health'],
+                                                     battle.ability_cooldown))
+            counts[result['winner']] += 1
+            turns += len(battle.actions)
+    
+    for winner, key in [('player', 'win_probability'), ('enemy', 'loss_probability'),
+                        ('none', 'escape_probability')]:
+        probability = solved[key]
+        # Four standard errors of the simulated rate, plus a little slack
+        tolerance = 4 * (probability * (1 - probability) / battles) ** 0.5 + 0.005
+        assert counts[winner] / battles == pytest.approx(probability, abs=tolerance)
+    assert turns / battles == pytest.approx(solved['expected_turns'], rel=0.05)
+
+def test_solver_rejects_endless_policy():
+    """Test that a policy that never finishes the fight is reported"""
+    char = character_manager.create_character("SolverTest", "Cleric")
+    enemy = combat_system.create_enemy("goblin")
+    
+    def heal_only_policy(character_hp, enemy_hp, cooldown):
+        return '2'
+    
+    with pytest.raises(ValueError):
+        battle_solver.solve_battle(char, enemy, heal_only_policy)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -10,6 +10,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from custom_exceptions import *
+from status_codes import *
 import character_manager
 import inventory_system
 import quest_handler
@@ -37,6 +38,82 @@ def test_character_dead_exception():
     with pytest.raises(CharacterDeadError):
         character_manager.gain_experience(char, 50)
 
+def test_validation_collects_every_error():
+    """Test that validation reports all problems, not just the first"""
+    char = character_manager.create_character("Test", "Warrior")
+    char['level'] = 0
+    char['health'] = 500
+    char['gold'] = "lots"
+    del char['magic']
+    
+    fields = [field for field, _ in character_manager.find_character_errors(char)]
+    assert fields == ["level", "magic", "gold", "health"]
+    
+    # Checks on fields that did pass their type checks still run
+    char['class'] = "Bard"
+    char['max_health'] = "high"
+    fields = [field for field, _ in character_manager.find_character_errors(char)]
+    assert fields == ["level", "max_health", "magic", "gold", "class"]
+    
+    char.update(level=1, gold=0, magic=5, max_health=120, **{'class': "Warrior"})
+    with pytest.raises(InvalidSaveDataError, match="health 500 is above max_health"):
+        character_manager.validate_character_data(char)
+
+def test_validation_type_checks_allow_subclasses_but_not_bool():
+    """Test that bool is not taken as int and int subclasses are"""
+    class Level(int):
+        pass
+    
+    char = character_manager.create_character("Test", "Warrior")
+    char['level'] = Level(3)
+    assert character_manager.find_character_errors(char) == []
+    
+    char['level'] = True
+    char['gold'] = False
+    fields = [field for field, _ in character_manager.find_character_errors(char)]
+    assert fields == ["level", "gold"]
+
+def test_validation_checks_ids_against_catalogs():
+    """Test quest and item ID checks with loaded catalogs"""
+    quests = game_data.load_quests("data/quests.txt")
+    items = game_data.load_items("data/items.txt")
+    char = character_manager.create_character("Test", "Mage")
+    char['inventory'] = ["health_potion", "no_such_item"]
+    char['completed_quests'] = ["no_such_quest"]
+    char['equipped_weapon'] = "iron_sword"
+    
+    errors = character_manager.find_character_errors(char, quests, items)
+    assert errors == [("completed_quests", "unknown quest 'no_such_quest'"),
+                      ("inventory", "unknown item 'no_such_item'")]
+    assert character_manager.find_character_errors(char) == []
+
+def test_load_rejects_out_of_range_save(tmp_path):
+    """Test that load_character runs the same validation"""
+    char = character_manager.create_character("RangeTest", "Rogue")
+    char['level'] = -3
+    character_manager.save_character(char, str(tmp_path))
+    
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.load_character("RangeTest", str(tmp_path))
+
+def test_unsafe_character_names_are_rejected(tmp_path):
+    """Test that names cannot reach files outside the save directory"""
+    for name in ["../../escape", "a/b", "..\\x", ".hidden", "", "x" * 33]:
+        assert not character_manager.is_valid_character_name(name)
+    assert character_manager.is_valid_character_name("Sir Lance-a_lot 2")
+    
+    char = character_manager.create_character("../escape", "Warrior")
+    with pytest.raises(InvalidCharacterNameError):
+        character_manager.save_character(char, str(tmp_path))
+    with pytest.raises(InvalidCharacterNameError):
+        character_manager.load_character("../escape", str(tmp_path))
+    with pytest.raises(InvalidCharacterNameError):
+        character_manager.delete_character("../escape", str(tmp_path))
+    # Callers that caught CharacterNotFoundError for these names still do
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("../escape", str(tmp_path))
+    assert not os.path.exists(os.path.join(os.path.dirname(str(tmp_path)), "escape_save.txt"))
+
 # ============================================================================
 # INVENTORY EXCEPTION TESTS
 # ============================================================================
@@ -184,6 +261,50 @@ def test_combat_not_active_exception():
     with pytest.raises(CombatNotActiveError):
         battle.player_turn()
 
+# ============================================================================
+# STATUS CODE TESTS
+# ============================================================================
+
+def test_try_accept_quest_returns_status_codes():
+    """Test that try_accept_quest reports refusals without raising"""
+    char = character_manager.create_character("Test", "Warrior")
+    quests = {
+        'first': {'required_level': 1, 'prerequisite': "NONE"},
+        'second': {'required_level': 1, 'prerequisite': "first"},
+        'late': {'required_level': 10, 'prerequisite': "NONE"}
+    }
+    
+    assert quest_handler.try_accept_quest(char, "missing", quests) == QUEST_NOT_FOUND
+    assert quest_handler.try_accept_quest(char, "late", quests) == LEVEL_TOO_LOW
+    assert quest_handler.try_accept_quest(char, "second", quests) == PREREQUISITE_NOT_MET
+    assert quest_handler.try_accept_quest(char, "first", quests) == OK
+    assert quest_handler.try_accept_quest(char, "first", quests) == QUEST_ALREADY_ACTIVE
+    assert char['active_quests'] == ["first"]
+    
+    char['active_quests'] = []
+    char['completed_quests'] = ["first"]
+    assert quest_handler.try_accept_quest(char, "first", quests) == QUEST_ALREADY_COMPLETED
+    assert quest_handler.can_accept_quest(char, "second", quests)
+    assert not quest_handler.can_accept_quest(char, "missing", quests)
+
+def test_try_inventory_calls_return_status_codes():
+    """Test the non-raising purchase, use and remove calls"""
+    char = {'name': "Test", 'inventory': [], 'gold': 10, 'health': 50, 'max_health': 100}
+    potion = {'type': 'consumable', 'effect': 'health:20', 'cost': 5}
+    
+    assert inventory_system.try_purchase_item(char, "potion", {'cost': 100}) == NOT_ENOUGH_GOLD
+    assert inventory_system.try_purchase_item(char, "potion", potion) == OK
+    assert inventory_system.try_use_item(char, "sword", potion) == ITEM_NOT_FOUND
+    assert inventory_system.try_use_item(char, "potion", {'type': 'weapon'}) == WRONG_ITEM_TYPE
+    assert inventory_system.try_use_item(char, "potion", dict(potion, effect="health")) == INVALID_ITEM_EFFECT
+    assert inventory_system.try_use_item(char, "potion", potion) == OK
+    assert char['health'] == 70
+    assert inventory_system.try_remove_item_from_inventory(char, "potion") == ITEM_NOT_FOUND
+    
+    char['inventory'] = ["junk"] * inventory_system.MAX_INVENTORY_SIZE
+    assert inventory_system.try_purchase_item(char, "potion", potion) == INVENTORY_FULL
+    assert char['gold'] == 5
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
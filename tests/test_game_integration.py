@@ -104,6 +104,86 @@ def test_equipment_system():
     assert 'equipped_weapon' in char
     assert char['equipped_weapon'] == "iron_sword"
 
+def test_equip_cycles_do_not_drift_stats():
+    """Test that equipping and unequipping leaves stats where they started"""
+    char = character_manager.create_character("DriftTest", "Warrior")
+    char['health'] = 60
+    start = {stat: char[stat] for stat in ('health', 'max_health', 'strength', 'magic')}
+    sword = {'type': 'weapon', 'effect': 'strength:5'}
+    mail = {'type': 'armor', 'effect': 'max_health:10'}
+    
+    for _ in range(3):
+        inventory_system.add_item_to_inventory(char, "iron_sword")
+        inventory_system.add_item_to_inventory(char, "chain_mail")
+        inventory_system.equip_weapon(char, "iron_sword", sword)
+        inventory_system.equip_armor(char, "chain_mail", mail)
+        assert char['strength'] == start['strength'] + 5
+        assert char['max_health'] == start['max_health'] + 10
+        assert inventory_system.unequip_weapon(char) == "iron_sword"
+        assert inventory_system.unequip_armor(char) == "chain_mail"
+        inventory_system.clear_inventory(char)
+    
+    assert {stat: char[stat] for stat in start} == start
+    assert char['equipped_armor'] is None
+
+def test_equipping_armor_raises_max_health_but_not_health():
+    """Test that armor adds to max_health without healing"""
+    char = character_manager.create_character("ArmorHeal", "Warrior")
+    char['health'] = 60
+    inventory_system.add_item_to_inventory(char, "chain_mail")
+    inventory_system.equip_armor(char, "chain_mail", {'type': 'armor', 'effect': 'max_health:10'})
+    
+    assert char['max_health'] == 130
+    assert char['health'] == 60
+    
+    char['health'] = 130
+    inventory_system.unequip_armor(char)
+    assert char['health'] == 120
+
+def test_level_up_keeps_equipment_bonus_separate():
+    """Test that level-ups raise base stats under equipment modifiers"""
+    char = character_manager.create_character("LevelGear", "Rogue")
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+    inventory_system.equip_weapon(char, "iron_sword", {'type': 'weapon', 'effect': 'strength:5'})
+    
+    character_manager.gain_experience(char, 100)
+    assert char['base_stats']['strength'] == 14
+    assert char['strength'] == 19
+    
+    inventory_system.unequip_weapon(char)
+    assert char['strength'] == 14
+
+def test_equipment_and_stats_survive_save_and_load(tmp_path):
+    """Test that saves keep equipment, base stats and modifiers"""
+    char = character_manager.create_character("GearSave", "Mage")
+    inventory_system.add_item_to_inventory(char, "leather_armor")
+    inventory_system.equip_armor(char, "leather_armor", {'type': 'armor', 'effect': 'max_health:5'})
+    inventory_system.apply_stat_effect(char, 'magic', 3)
+    character_manager.save_character(char, str(tmp_path))
+    
+    loaded = character_manager.load_character("GearSave", str(tmp_path))
+    
+    assert loaded['equipped_armor'] == "leather_armor"
+    assert loaded['equipped_weapon'] is None
+    for key in ('health', 'max_health', 'strength', 'magic', 'base_stats', 'stat_modifiers'):
+        assert loaded[key] == char[key]
+    
+    assert inventory_system.unequip_armor(loaded) == "leather_armor"
+    assert loaded['max_health'] == 80
+
+def test_old_saves_without_stat_sources_still_load(tmp_path):
+    """Test loading a save written before equipment and modifiers were saved"""
+    lines = ["NAME: OldHero", "CLASS: Cleric", "LEVEL: 2", "HEALTH: 90", "MAX_HEALTH: 110",
+             "STRENGTH: 12", "MAGIC: 17", "EXPERIENCE: 5", "GOLD: 40", "INVENTORY:",
+             "ACTIVE_QUESTS:", "COMPLETED_QUESTS:"]
+    (tmp_path / "OldHero_save.txt").write_text("\n".join(lines) + "\n")
+    
+    loaded = character_manager.load_character("OldHero", str(tmp_path))
+    
+    assert loaded['base_stats'] == {'max_health': 110, 'strength': 12, 'magic': 17}
+    assert loaded['stat_modifiers'] == {}
+    assert loaded['equipped_weapon'] is None
+
 def test_shop_system():
     """Test buying and selling items"""
     char = character_manager.create_character("ShopTest", "Mage")
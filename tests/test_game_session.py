@@ -0,0 +1,434 @@
+"""
+Test Game Sessions
+Tests output sinks, game sessions and the tools that drive them
+"""
+
+import pytest
+import sys
+import os
+import io
+import asyncio
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+import game_output
+import main
+import game_server
+import perf_stats
+import replay_driver
+import load_generator
+import profiling
+
+# ============================================================================
+# OUTPUT SINK TESTS
+# ============================================================================
+
+class NoFormatting:
+    """Value that fails the test if anything tries to format it"""
+    def __format__(self, spec):
+        raise AssertionError("Value was formatted")
+
+def test_null_sink_skips_formatting():
+    """Test that the null sink never formats messages"""
+    with game_output.use_sink(game_output.NullSink()):
+        game_output.say("Value: {}", NoFormatting())
+        combat_system.display_battle_log("Value: {}", NoFormatting())
+    
+    assert isinstance(game_output.get_sink(), game_output.ConsoleSink)
+
+def test_ability_messages_are_not_preformatted():
+    """Test that special ability and cooldown messages reach the sink as templates"""
+    events = game_output.EventSink()
+    char = character_manager.create_character("Striker", "Warrior")
+    char['max_health'] = char['health'] = 1000
+    enemy = combat_system.create_enemy("dragon")
+    battle = combat_system.SimpleBattle(char, enemy, seed=3)
+    
+    with game_output.use_sink(events):
+        battle.begin()
+        battle.step('2')
+        battle.step('2')
+    
+    templates = [template for template, _ in events.events]
+    assert ">>> You use Power Strike for {} damage!" in templates
+    assert ">>> Ability on cooldown! {} turns left." in templates
+
+def test_battle_log_follows_bound_sink():
+    """Test that battle messages go to a sink bound with bind_sink"""
+    events = game_output.EventSink()
+    with game_output.use_sink(game_output.NullSink()):
+        with game_output.bind_sink(events):
+            combat_system.display_battle_log("Hit for {}", 3)
+    with game_output.bind_sink(game_output.NullSink()):
+        combat_system.display_battle_log("Value: {}", NoFormatting())
+    
+    assert events.events == [(">>> Hit for {}", (3,))]
+
+def test_event_sink_records_structured_messages():
+    """Test that the event sink keeps templates and raw arguments"""
+    events = game_output.EventSink()
+    char = character_manager.create_character("SinkTest", "Mage")
+    
+    with game_output.use_sink(events):
+        character_manager.gain_experience(char, 10)
+    
+    assert events.events[0] == ("{} gained {} XP!", ("SinkTest", 10))
+    assert events.get_text() == ["SinkTest gained 10 XP!"]
+
+def test_buffered_sink_writes_once_per_flush():
+    """Test that the buffered sink holds output until flushed"""
+    stream = io.StringIO()
+    sink = game_output.BufferedSink(stream)
+    
+    with game_output.use_sink(sink):
+        game_output.say("Line {}", 1)
+        game_output.say("Line {}", 2)
+        assert stream.getvalue() == ""
+        game_output.flush()
+    
+    assert stream.getvalue() == "Line 1\nLine 2\n"
+
+# ============================================================================
+# GAME SESSION TESTS
+# ============================================================================
+
+@pytest.fixture
+def shared_data():
+    """Load the shared quest and item data once"""
+    return main.load_game_data()
+
+def test_session_creates_and_saves_character(shared_data, tmp_path):
+    """Test driving a new game one reply at a time"""
+    stream = io.StringIO()
+    session = main.GameSession(shared_data, save_directory=str(tmp_path), output_stream=stream)
+    
+    assert session.start() == "Select an option (1-3): "
+    assert session.send("1") == "Enter your character's name: "
+    assert session.send("SessionHero") == "Choose your class: "
+    assert session.send("rogue") == "Select an option (1-6): "
+    assert session.character['class'] == "Rogue"
+    assert "SessionHero" in character_manager.list_saved_characters(str(tmp_path))
+    
+    # Save and quit, then exit from the main menu
+    assert session.send("6") == "Select an option (1-3): "
+    assert session.send("3") is None
+    assert session.finished
+    assert "Thanks for playing" in stream.getvalue()
+
+def test_session_rejects_unsafe_names(shared_data, tmp_path):
+    """Test that a typed name cannot point a save outside the save directory"""
+    stream = io.StringIO()
+    session = main.GameSession(shared_data, save_directory=str(tmp_path / "saves"),
+                               output_stream=stream)
+    
+    session.start()
+    session.send("1")
+    assert session.send("../escape") == "Select an option (1-3): "
+    assert session.character is None
+    assert "Names can only use letters" in stream.getvalue()
+    assert not (tmp_path / "escape_save.txt").exists()
+
+def test_main_menu_comes_before_data_loading(tmp_path):
+    """Test that game data is only loaded once a game starts"""
+    session = main.GameSession(save_directory=str(tmp_path), output_stream=io.StringIO())
+    
+    assert session.start() == "Select an option (1-3): "
+    assert session.shared_data is None
+    assert session.send("1") == "Enter your character's name: "
+    assert session.shared_data is main.load_game_data()
+
+def test_sessions_do_not_share_characters(shared_data, tmp_path):
+    """Test that two sessions in one process keep separate state"""
+    first = main.GameSession(shared_data, save_directory=str(tmp_path), output_stream=io.StringIO())
+    second = main.GameSession(shared_data, save_directory=str(tmp_path), output_stream=io.StringIO())
+    
+    for session, name, char_class in [(first, "First", "Warrior"), (second, "Second", "Mage")]:
+        session.start()
+        session.send("1")
+        session.send(name)
+        session.send(char_class)
+    
+    assert first.character['name'] == "First"
+    assert second.character['name'] == "Second"
+    assert first.quests is second.quests
+    
+    # Each session's text only goes to its own stream
+    first.send("1")
+    assert "Class: Warrior" in first.output_stream.getvalue()
+    assert "Class: Warrior" not in second.output_stream.getvalue()
+
+def test_session_explore_runs_battle_from_replies(shared_data, tmp_path):
+    """Test that battles take their actions from session replies"""
+    session = main.GameSession(shared_data, save_directory=str(tmp_path),
+                               output_stream=io.StringIO(), seed=7)
+    session.start()
+    session.send("1")
+    session.send("Explorer")
+    session.send("Warrior")
+    
+    prompt = session.send("4")
+    while prompt == "Choose your action (1-3): ":
+        prompt = session.send("1")
+    
+    assert prompt == "\nPress Enter to continue..."
+    assert "Battle finished. Winner:" in session.output_stream.getvalue()
+
+def test_session_run_reads_input_stream(shared_data, tmp_path):
+    """Test playing a whole session from an input stream"""
+    replies = io.StringIO("1\nStreamHero\nCleric\n6\n3\n")
+    output = io.StringIO()
+    session = main.GameSession(shared_data, save_directory=str(tmp_path),
+                               input_stream=replies, output_stream=output)
+    session.run()
+    
+    assert session.finished
+    assert "Character StreamHero the Cleric has been created!" in output.getvalue()
+
+def test_session_revive_after_death(shared_data, tmp_path):
+    """Test that a dead character can pay to be revived"""
+    session = main.GameSession(shared_data, save_directory=str(tmp_path), output_stream=io.StringIO())
+    session.start()
+    session.send("1")
+    session.send("Fallen")
+    session.send("Warrior")
+    
+    session.character['health'] = 0
+    # Any game menu reply leads back round the loop to the death check
+    assert session.send("1") == "\nPress Enter to continue..."
+    assert session.send("") == "(R)evive (Cost: 100 G) or (Q)uit: "
+    assert session.send("R") == "Select an option (1-6): "
+    assert session.character['health'] == session.character['max_health'] // 2
+    assert session.character['gold'] == 0
+
+# ============================================================================
+# GAME SERVER TESTS
+# ============================================================================
+
+def test_percentile_interpolates():
+    """Test percentile helper on a small list"""
+    assert perf_stats.percentile([4, 1, 3, 2], 0) == 1
+    assert perf_stats.percentile([4, 1, 3, 2], 50) == 2.5
+    assert perf_stats.percentile([4, 1, 3, 2], 100) == 4
+    with pytest.raises(ValueError):
+        perf_stats.percentile([1], 101)
+
+def test_server_hosts_concurrent_sessions(shared_data, tmp_path):
+    """Test two clients playing at the same time on one server"""
+    async def scenario():
+        server = game_server.GameServer(port=0, shared_data=shared_data,
+                                        save_directory=str(tmp_path), track_memory=True)
+        await server.start()
+        first = game_server.LocalClient(port=server.port)
+        second = game_server.LocalClient(port=server.port)
+        
+        assert (await first.connect()).endswith("Select an option (1-3): ")
+        await second.connect()
+        
+        # Interleave the two players' commands
+        for client, reply in [(first, "1"), (second, "1"), (first, "NetOne"),
+                              (second, "NetTwo"), (first, "Warrior"), (second, "Mage")]:
+            screen = await client.send(reply)
+        assert "Character NetTwo the Mage has been created!" in screen
+        
+        stats = server.get_stats()
+        assert stats['connections_open'] == 2
+        assert stats['memory_per_connection_bytes'] > 0
+        
+        screen = await first.send("1")
+        assert "Class: Warrior" in screen
+        await first.send("")
+        await first.send("6")
+        final = await first.send("3")
+        assert "Thanks for playing" in final
+        assert first.closed
+        
+        # Hanging up mid-game still gets the last save written
+        await second.close()
+        for _ in range(100):
+            if not server.sessions:
+                break
+            await asyncio.sleep(0.01)
+        
+        stats = server.get_stats()
+        await server.close()
+        return stats
+    
+    stats = asyncio.run(scenario())
+    
+    assert stats['connections_total'] == 2
+    assert stats['connections_open'] == 0
+    assert stats['latency']['count'] == stats['commands']
+    assert stats['save_errors'] == 0
+    assert sorted(character_manager.list_saved_characters(str(tmp_path))) == ["NetOne", "NetTwo"]
+
+def test_save_queue_keeps_only_newest_pending_save():
+    """Test that saves requested during a slow write are coalesced"""
+    release = threading.Event()
+    written = []
+    
+    def slow_save(character, save_directory):
+        release.wait(5)
+        written.append(character['gold'])
+    
+    async def scenario():
+        stats = {'saves_written': 0, 'saves_coalesced': 0, 'save_errors': 0}
+        loop = asyncio.get_running_loop()
+        queue = game_server.SaveQueue(loop, None, "unused", stats, save_function=slow_save)
+        session = main.GameSession({'quests': {}, 'items': {}})
+        session.character = character_manager.create_character("Queued", "Rogue")
+        
+        for gold in [1, 2, 3, 4]:
+            session.character['gold'] = gold
+            queue.submit(session)
+        release.set()
+        await queue.drain()
+        return stats
+    
+    stats = asyncio.run(scenario())
+    
+    assert written == [1, 4]
+    assert stats['saves_written'] == 2
+    assert stats['saves_coalesced'] == 2
+
+def test_save_queue_messages_go_to_the_saving_session():
+    """Test that a background save prints to its own session, not the current sink"""
+    def noisy_save(character, save_directory):
+        game_output.say("Saving {}", character['name'])
+    
+    async def scenario(other_client):
+        loop = asyncio.get_running_loop()
+        stats = {'saves_written': 0, 'saves_coalesced': 0, 'save_errors': 0}
+        queue = game_server.SaveQueue(loop, None, "unused", stats, save_function=noisy_save)
+        session = main.GameSession({'quests': {}, 'items': {}}, output_stream=io.StringIO())
+        session.character = character_manager.create_character("Owner", "Cleric")
+        
+        # Another client's turn is running on the event loop meanwhile
+        with game_output.use_sink(other_client):
+            queue.submit(session)
+            await queue.drain()
+        return session
+    
+    other_client = game_output.EventSink()
+    session = asyncio.run(scenario(other_client))
+    
+    assert other_client.events == []
+    session.output.flush()
+    assert session.output_stream.getvalue() == "Saving Owner\n"
+
+# ============================================================================
+# REPLAY DRIVER TESTS
+# ============================================================================
+
+REPLAY_SCRIPT = """# Make a Warrior, look around, fight once, then quit
+1
+Replayer
+Warrior
+1
+
+4
+1
+1
+1
+1
+1
+1
+1
+1
+1
+1
+
+6
+3
+"""
+
+def test_parse_script_keeps_blank_replies():
+    """Test that comments are dropped but blank lines are kept"""
+    assert replay_driver.parse_script("# comment\n1\n\nName\n") == ["1", "", "Name"]
+
+def test_replay_is_deterministic(shared_data):
+    """Test that a script with a seed always gives the same transcript"""
+    replies = replay_driver.parse_script(REPLAY_SCRIPT)
+    first = replay_driver.run_script(replies, seed=3, shared_data=shared_data)
+    second = replay_driver.run_script(replies, seed=3, shared_data=shared_data)
+    
+    assert first['transcript'] == second['transcript']
+    assert "Battle finished. Winner:" in first['transcript']
+    assert first['prompts'] == first['replies_used']
+
+def test_replay_reports_script_running_out(shared_data):
+    """Test a script that stops before the game ends"""
+    result = replay_driver.run_script(["1", "Quitter"], shared_data=shared_data)
+    
+    assert not result['finished']
+    assert result['transcript'].endswith("Choose your class: \n")
+
+def test_replay_in_worker_processes_matches_in_process():
+    """Test that parallel replays give the same transcripts as serial ones"""
+    replies = replay_driver.parse_script(REPLAY_SCRIPT)
+    serial = replay_driver.run_scripts([replies] * 4, workers=1, base_seed=10)
+    parallel = replay_driver.run_scripts([replies] * 4, workers=2, base_seed=10, chunksize=1)
+    
+    assert [r['transcript'] for r in serial] == [r['transcript'] for r in parallel]
+
+# ============================================================================
+# LOAD GENERATOR TESTS
+# ============================================================================
+
+def test_load_generator_reports_every_action(shared_data, tmp_path):
+    """Test that bots perform and time every action in the mix"""
+    run = load_generator.run_load(players=5, actions_per_player=40, seed=1,
+                                  shared_data=shared_data, save_directory=str(tmp_path))
+    report = load_generator.build_report([run], players=5, workers=1)
+    
+    assert report['actions'] == 200
+    assert report['by_action']['autosave']['count'] == 200
+    assert set(report['by_action']) == set(load_generator.DEFAULT_ACTION_MIX) | {'autosave'}
+    assert report['by_action']['explore']['p99_ms'] >= report['by_action']['explore']['p50_ms']
+    assert len(character_manager.list_saved_characters(str(tmp_path))) == 5
+
+def test_load_generator_rejects_unknown_action(shared_data):
+    """Test that a typo in the action mix is caught up front"""
+    with pytest.raises(ValueError):
+        load_generator.run_load(players=1, actions_per_player=1,
+                                action_mix={'dance': 1}, shared_data=shared_data)
+
+# ============================================================================
+# PROFILING TESTS
+# ============================================================================
+
+def test_io_tracer_counts_per_action(shared_data, tmp_path):
+    """Test that file I/O is split by game action"""
+    session = main.GameSession(shared_data, save_directory=str(tmp_path), output_stream=io.StringIO())
+    replies = ["1", "Tracer", "Mage", "1", "", "6", "3"]
+    
+    with profiling.IOTracer(session) as tracer:
+        replay_driver.play_replies(session, replies)
+    
+    # One autosave after viewing stats, one save when quitting
+    assert tracer.counts['view_stats']['opens'] == 1
+    assert tracer.counts['save_and_quit']['opens'] == 1
+    assert tracer.counts['view_stats']['writes'] > 0
+    assert tracer.counts['other']['opens'] == 1
+    assert open is not tracer._open
+
+def test_profile_call_writes_pstats_and_collapsed_stacks(tmp_path):
+    """Test profiler output files"""
+    def outer():
+        return sum(inner(n) for n in range(2000))
+    
+    def inner(n):
+        return n * n
+    
+    output = str(tmp_path / "run.pstats")
+    assert profiling.profile_call(outer, output) == sum(n * n for n in range(2000))
+    
+    with open(output + ".collapsed") as f:
+        lines = f.read().splitlines()
+    assert any("(outer);" in line and "(inner)" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,286 @@
+"""
+Test Instrumentation
+Tests the metrics registry, trace spans and the hooks that feed them
+"""
+
+import io
+import json
+import pytest
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+import combat_system
+import game_output
+import main
+import metrics
+import tracing
+from custom_exceptions import *
+
+@pytest.fixture
+def recording():
+    """Turn metrics on for one test, starting from nothing"""
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+@pytest.fixture
+def tracing_on():
+    """Turn tracing on for one test, with an empty buffer"""
+    tracing.clear()
+    tracing.enable(capacity=tracing.DEFAULT_CAPACITY)
+    yield
+    tracing.disable()
+    tracing.clear()
+
+# ============================================================================
+# METRICS REGISTRY TESTS
+# ============================================================================
+
+def test_disabled_metrics_record_nothing():
+    """Test that nothing is kept while metrics are off"""
+    metrics.reset()
+    metrics.inc("saves")
+    metrics.observe("save_character_seconds", 0.1)
+    InventoryFullError("full")
+    
+    assert metrics.snapshot() == {}
+
+def test_histogram_buckets_are_cumulative(recording):
+    """Test histogram export"""
+    metrics.observe("load_quests_seconds", 0.0002)
+    metrics.observe("load_quests_seconds", 0.3)
+    metrics.observe("load_quests_seconds", 10.0)
+    
+    entry = metrics.snapshot()['load_quests_seconds']['series'][0]
+    assert entry['buckets']['0.00025'] == 1
+    assert entry['buckets']['0.5'] == 2
+    assert entry['count'] == 3
+    
+    text = metrics.to_prometheus()
+    assert 'quest_load_quests_seconds_bucket{le="+Inf"} 3' in text
+    assert "# TYPE quest_load_quests_seconds histogram" in text
+
+def test_raise_gauge_keeps_largest_value(recording):
+    """Test the high-water gauge"""
+    for value in [3, 7, 2]:
+        metrics.raise_gauge("inventory_items_max", value)
+    
+    assert metrics.get_value("inventory_items_max") == 7
+    assert "quest_inventory_items_max 7" in metrics.to_prometheus()
+
+def test_updates_from_many_threads_are_not_lost(recording):
+    """Test that counters and histograms survive concurrent updates"""
+    def record():
+        for _ in range(2000):
+            metrics.inc("saves")
+            metrics.observe("save_character_seconds", 0.001)
+    
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert metrics.get_value("saves") == 16000
+    assert metrics.get_value("save_character_seconds")[0] == 16000
+
+def test_counter_labels_in_prometheus_text(recording):
+    """Test counters with labels, including escaping"""
+    metrics.inc("battles", labels={'winner': 'player'})
+    metrics.inc("battles", 2, labels={'winner': 'player'})
+    metrics.inc("game_errors", 3, labels={'type': 'Say "hi"'})
+    
+    text = metrics.to_prometheus()
+    assert 'quest_battles_total{winner="player"} 3' in text
+    assert 'quest_game_errors_total{type="Say \\"hi\\""} 3' in text
+
+# ============================================================================
+# GAME HOOK TESTS
+# ============================================================================
+
+def test_game_errors_are_counted_where_caught(recording, tmp_path):
+    """Test that errors the game handles are counted, and only those"""
+    char = character_manager.create_character("Broke", "Rogue")
+    char['gold'] = 0
+    with pytest.raises(InsufficientResourcesError):
+        inventory_system.purchase_item(char, "health_potion", {'cost': 25})
+    InsufficientResourcesError("built, never raised")
+    assert metrics.get_value("game_errors", {'type': 'InsufficientResourcesError'}) is None
+    
+    session = main.GameSession(main.load_game_data(), save_directory=str(tmp_path),
+                               output_stream=io.StringIO())
+    session.start()
+    for reply in ["1", "Broke", "Rogue"]:
+        session.send(reply)
+    session.character['gold'] = 0
+    for reply in ["5", "B", "health_potion"]:
+        session.send(reply)
+    
+    assert "Error: " in session.output_stream.getvalue()
+    assert metrics.get_value("game_errors", {'type': 'InsufficientResourcesError'}) == 1
+
+def test_game_modules_record_metrics(recording, tmp_path):
+    """Test saves, loads, purchases, battles and gauges"""
+    char = character_manager.create_character("Measured", "Warrior")
+    inventory_system.purchase_item(char, "health_potion", {'cost': 25})
+    character_manager.save_character(char, str(tmp_path))
+    character_manager.load_character("Measured", str(tmp_path))
+    
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"), seed=1)
+    battle.script = iter(['1'] * 50)
+    with game_output.use_sink(game_output.NullSink()):
+        battle.start_battle()
+    
+    assert metrics.get_value("saves") == 1
+    assert metrics.get_value("loads") == 1
+    assert metrics.get_value("purchases") == 1
+    assert metrics.get_value("battles", {'winner': 'player'}) == 1
+    assert metrics.get_value("inventory_items") == (1, 1)
+    assert metrics.get_value("inventory_items_max") == 1
+    assert "# TYPE quest_inventory_items_max gauge" in metrics.to_prometheus()
+    assert metrics.snapshot()['inventory_items']['series'][0]['buckets']['1'] == 1
+    assert metrics.get_value("save_character_seconds")[0] == 1
+    assert metrics.get_value("battle_seconds")[0] == 1
+
+def test_stepped_battles_are_timed(recording):
+    """Test that battles driven with begin() and step() are timed too"""
+    char = character_manager.create_character("Stepper", "Warrior")
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"), seed=1)
+    
+    with game_output.use_sink(game_output.NullSink()):
+        battle.begin()
+        result = None
+        while result is None:
+            result = battle.step('1')
+    
+    assert metrics.get_value("battle_seconds")[0] == 1
+    assert "battle_seconds" in metrics.to_prometheus()
+
+def test_game_actions_are_timed_once_each(recording, tmp_path):
+    """Test that an action spread over many replies is one observation"""
+    session = main.GameSession(main.load_game_data(), save_directory=str(tmp_path),
+                               output_stream=io.StringIO(), seed=7)
+    session.start()
+    for reply in ["1", "Timed", "Warrior"]:
+        session.send(reply)
+    prompt = session.send("4")
+    turns = 0
+    while prompt == "Choose your action (1-3): ":
+        prompt = session.send("1")
+        turns += 1
+    assert metrics.get_value("game_action_seconds", {'action': 'explore'}) is None
+    session.send("")
+    
+    assert turns > 1
+    count, total = metrics.get_value("game_action_seconds", {'action': 'explore'})
+    assert count == 1
+    assert total > 0
+
+# ============================================================================
+# TRACING TESTS
+# ============================================================================
+
+def test_disabled_tracing_records_nothing():
+    """Test that spans are only kept while tracing is on"""
+    tracing.clear()
+    with tracing.span("ignored") as opened:
+        assert opened is None
+    assert tracing.start_span("ignored") is None
+    inventory_system.add_item_to_inventory(character_manager.create_character("Quiet", "Mage"), "x")
+    
+    assert tracing.get_spans() == []
+
+def test_spans_nest_and_buffer_is_bounded(tracing_on):
+    """Test parent links, traced attributes and the ring buffer limit"""
+    char = character_manager.create_character("Nested", "Rogue")
+    with tracing.span("outer", character="Nested") as outer:
+        inventory_system.add_item_to_inventory(char, "health_potion")
+    
+    inner, finished_outer = tracing.get_spans()
+    assert finished_outer['span_id'] == outer.span_id
+    assert inner['name'] == "inventory_system.add_item_to_inventory"
+    assert inner['parent_id'] == outer.span_id
+    assert inner['trace_id'] == outer.trace_id
+    assert inner['attributes'] == {'item_id': "health_potion", 'character': "Nested"}
+    assert finished_outer['duration_ms'] >= inner['duration_ms']
+    
+    tracing.enable(capacity=3)
+    for number in range(5):
+        with tracing.span(f"span{number}"):
+            pass
+    assert [entry['name'] for entry in tracing.get_spans()] == ["span2", "span3", "span4"]
+
+def test_traced_call_records_error(tracing_on):
+    """Test that a span keeps the type of the exception that ended it"""
+    char = character_manager.create_character("Broke", "Rogue")
+    char['gold'] = 0
+    with pytest.raises(InsufficientResourcesError):
+        inventory_system.purchase_item(char, "health_potion", {'cost': 25})
+    
+    entry = tracing.get_spans()[-1]
+    assert entry['name'] == "inventory_system.purchase_item"
+    assert entry['attributes']['error'] == "InsufficientResourcesError"
+
+def test_game_action_spans_cover_session_work(tracing_on, tmp_path):
+    """Test spans for a game action, its combat turns and the autosave"""
+    session = main.GameSession(main.load_game_data(), save_directory=str(tmp_path),
+                               output_stream=io.StringIO(), seed=7)
+    session.start()
+    for reply in ["1", "Traced", "Warrior"]:
+        session.send(reply)
+    prompt = session.send("4")
+    while prompt == "Choose your action (1-3): ":
+        prompt = session.send("1")
+    session.send("")
+    
+    spans = tracing.get_spans()
+    action = next(entry for entry in spans if entry['name'] == "game_action")
+    assert action['attributes']['action'] == "explore"
+    assert action['attributes']['character'] == "Traced"
+    assert 0 < action['attributes']['busy_ms'] <= action['duration_ms']
+    
+    children = [entry for entry in spans if entry['parent_id'] == action['span_id']]
+    names = [entry['name'] for entry in children]
+    assert "combat.turn" in names
+    assert names[-1] == "autosave"
+    assert all(entry['trace_id'] == action['trace_id'] for entry in children)
+    
+    filename = tmp_path / "spans.jsonl"
+    assert tracing.dump_jsonl(str(filename)) == len(spans)
+    lines = filename.read_text().splitlines()
+    assert json.loads(lines[0]) == spans[0]
+
+def test_interleaved_sessions_keep_separate_traces(tracing_on, tmp_path):
+    """Test that one session's spans never nest inside another's action"""
+    shared_data = main.load_game_data()
+    first, second = [
+        main.GameSession(shared_data, save_directory=str(tmp_path),
+                         output_stream=io.StringIO(), seed=1)
+        for _ in range(2)
+    ]
+    for session, name in [(first, "Left"), (second, "Right")]:
+        session.start()
+        for reply in ["1", name, "Mage"]:
+            session.send(reply)
+    
+    # Both open the quest menu, then take turns inside it
+    for first_reply, second_reply in [("3", "3"), ("1", "2"), ("", ""), ("6", "6")]:
+        first.send(first_reply)
+        second.send(second_reply)
+    
+    spans = {entry['span_id']: entry for entry in tracing.get_spans()}
+    nested = [entry for entry in spans.values() if entry['parent_id'] in spans]
+    assert nested
+    for entry in nested:
+        parent = spans[entry['parent_id']]
+        assert entry['attributes']['character'] == parent['attributes']['character']
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -15,6 +15,13 @@ def test_custom_exceptions_module_exists():
     import custom_exceptions
     assert custom_exceptions is not None
 
+def test_status_codes_module_exists():
+    """Test that status codes live in their own module"""
+    import custom_exceptions
+    import status_codes
+    assert status_codes.STATUS_NAMES[status_codes.OK] == "OK"
+    assert not hasattr(custom_exceptions, "STATUS_NAMES")
+
 def test_game_data_module_exists():
     """Test that game_data module can be imported"""
     import game_data
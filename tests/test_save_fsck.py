@@ -0,0 +1,96 @@
+"""
+Test Save Fsck
+Tests the save file scanner, its report, repairs and quarantine
+"""
+
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_fsck
+
+@pytest.fixture
+def saves(tmp_path):
+    """A save directory with one good save and one of each kind of problem"""
+    directory = tmp_path / "save_games"
+    for name in ("Good", "Unknown", "Clamped", "Broken"):
+        character = character_manager.create_character(name, "Warrior")
+        character['inventory'] = ["health_potion"]
+        character_manager.save_character(character, str(directory))
+    
+    unknown = directory / "Unknown_save.txt"
+    unknown.write_text(unknown.read_text().replace("INVENTORY: health_potion",
+                                                   "INVENTORY: health_potion,ghost_blade"))
+    clamped = directory / "Clamped_save.txt"
+    clamped.write_text(clamped.read_text().replace("HEALTH: 120\n", "HEALTH: 999\n", 1))
+    broken = directory / "Broken_save.txt"
+    broken.write_text(broken.read_text().replace("LEVEL: 1", "LEVEL: 0"))
+    (directory / "Garbled_save.txt").write_text("not a save\n")
+    (directory / "notes.txt").write_text("not scanned\n")
+    return directory
+
+def scan(directory, **options):
+    """Scan a directory against the real data files"""
+    results = save_fsck.scan_saves(str(directory), workers=options.pop('workers', 1), **options)
+    return {os.path.basename(result['file']): result for result in results}
+
+# ============================================================================
+# SCANNING TESTS
+# ============================================================================
+
+def test_scan_reports_every_problem(saves):
+    """Test the status and errors reported for each save"""
+    results = scan(saves)
+    
+    assert len(results) == 5
+    assert results["Good_save.txt"]['status'] == "ok"
+    assert results["Garbled_save.txt"]['status'] == "corrupt"
+    assert results["Unknown_save.txt"]['errors'] == [["inventory", "unknown item 'ghost_blade'"]]
+    assert results["Clamped_save.txt"]['errors'][0][0] == "health"
+    assert results["Broken_save.txt"]['errors'] == [["level", "'level' is 0, below 1"]]
+
+def test_repair_and_quarantine(saves, tmp_path):
+    """Test that fixable saves are rewritten and the rest moved aside"""
+    quarantine = tmp_path / "quarantine"
+    results = scan(saves, repair=True, quarantine_directory=str(quarantine))
+    
+    assert results["Unknown_save.txt"]['status'] == "repaired"
+    assert results["Clamped_save.txt"]['status'] == "repaired"
+    assert sorted(os.listdir(quarantine)) == ["Broken_save.txt", "Garbled_save.txt"]
+    assert character_manager.load_character("Unknown", str(saves))['inventory'] == ["health_potion"]
+    assert {result['status'] for result in scan(saves).values()} == {"ok"}
+
+def test_failed_repair_and_quarantine_are_recorded(saves, tmp_path, monkeypatch):
+    """Test that a file that cannot be rewritten or moved does not stop the scan"""
+    def refuse(*args):
+        raise PermissionError("read-only")
+    
+    monkeypatch.setattr(character_manager, "save_character", refuse)
+    monkeypatch.setattr(save_fsck.shutil, "move", refuse)
+    results = scan(saves, repair=True, quarantine_directory=str(tmp_path / "quarantine"))
+    
+    assert len(results) == 5
+    unknown = results["Unknown_save.txt"]
+    assert unknown['status'] == "invalid"
+    assert [field for field, _ in unknown['errors']] == ["inventory", "repair", "quarantine"]
+    assert unknown['quarantined'] is None
+    assert results["Garbled_save.txt"]['errors'][-1][0] == "quarantine"
+    assert (saves / "Broken_save.txt").exists()
+
+def test_report_streams_problems_from_workers(saves, tmp_path):
+    """Test the JSON Lines report from a scan with worker processes"""
+    report = tmp_path / "report.jsonl"
+    summary = save_fsck.write_report(scan(saves, workers=2).values(), str(report))
+    
+    lines = [json.loads(line) for line in report.read_text().splitlines()]
+    assert summary['scanned'] == 5
+    assert summary['ok'] == 1
+    assert len(lines) == 4
+    assert all(line['status'] != "ok" for line in lines)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,216 @@
+"""
+Test Shared Data
+Tests frozen game records, the shared-memory catalog and the preloading worker pool
+"""
+
+import copy
+import gc
+import pickle
+import pytest
+import sys
+import os
+from multiprocessing import shared_memory
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import content_generator
+import game_data
+import game_output
+import game_records
+import main
+import replay_driver
+import shared_catalog
+import worker_pool
+import bench_workers
+from custom_exceptions import CorruptedDataError, MissingDataFileError
+
+@pytest.fixture
+def catalog_data():
+    """Generated quests and items, with some non-ASCII text"""
+    quests = content_generator.generate_quests(300, seed=4)
+    items = content_generator.generate_items(200, seed=4)
+    first = next(iter(items))
+    items[first] = dict(items[first], description="Forgé à la main ✓")
+    return quests, items
+
+# ============================================================================
+# GAME RECORD TESTS
+# ============================================================================
+
+def test_loaded_records_are_frozen_mappings():
+    """Test the read-only dict interface of loaded records"""
+    items = game_data.load_items("data/items.txt")
+    potion = items['health_potion']
+    
+    assert isinstance(potion, game_records.ItemRecord)
+    assert potion['type'] == "consumable"
+    assert potion.get('no_such_field', 7) == 7
+    assert dict(potion)['cost'] == potion.cost
+    assert potion == dict(potion)
+    with pytest.raises(TypeError):
+        potion['cost'] = 0
+    with pytest.raises(AttributeError):
+        potion.cost = 0
+    with pytest.raises(KeyError):
+        potion['get']
+
+def test_records_are_hashable_and_copy_free():
+    """Test hashing, pickling and copying"""
+    quests = game_data.load_quests("data/quests.txt")
+    quest = next(iter(quests.values()))
+    
+    cache = {quest: "cached"}
+    assert cache[game_records.QuestRecord.from_dict(dict(quest))] == "cached"
+    assert pickle.loads(pickle.dumps(quest)) == quest
+    assert copy.deepcopy(quest) is quest
+
+def test_repeated_strings_are_interned():
+    """Test that records share one copy of repeated values"""
+    first, second = [
+        game_records.ItemRecord(item_id="potion_" + str(number), name="Potion",
+                                type="".join(["consum", "able"]), effect="health:20",
+                                cost=25, description="Heals")
+        for number in range(2)
+    ]
+    
+    assert first.type is second.type
+    with pytest.raises(TypeError):
+        game_records.ItemRecord(item_id="broken", name="Broken")
+
+# ============================================================================
+# SHARED CATALOG TESTS
+# ============================================================================
+
+def test_attached_catalog_matches_parsed_data(catalog_data):
+    """Test that every record reads back the same, in file order"""
+    quests, items = catalog_data
+    with game_data.publish_catalog(quests, items) as catalog:
+        attached = game_data.attach_catalog(catalog.name)
+
+        assert list(attached['quests']) == list(quests)
+        assert len(attached['items']) == len(items)
+        for quest_id, quest in quests.items():
+            assert attached['quests'][quest_id] == quest
+        for item_id, item in items.items():
+            assert dict(attached['items'][item_id]) == item
+
+        assert "no_such_quest" not in attached['quests']
+        assert attached['items'].get("no_such_item") is None
+        with pytest.raises(KeyError):
+            attached['quests'][next(iter(quests))]['no_such_field']
+
+def test_attached_catalog_is_read_only(catalog_data):
+    """Test that workers cannot write into the shared block"""
+    quests, items = catalog_data
+    with game_data.publish_catalog(quests, items) as catalog:
+        attached = shared_catalog.attach(catalog.name)
+
+        with pytest.raises(TypeError):
+            attached['quests'][next(iter(quests))]['title'] = "Changed"
+        with pytest.raises(TypeError):
+            attached['quests']._heap[0] = 0
+
+def test_attach_rejects_missing_and_foreign_blocks():
+    """Test the errors for a bad catalog name or contents"""
+    with pytest.raises(MissingDataFileError):
+        shared_catalog.attach("quest_no_such_catalog")
+
+    foreign = shared_memory.SharedMemory(create=True, size=64)
+    try:
+        foreign.buf[:4] = b"JUNK"
+        with pytest.raises(CorruptedDataError):
+            shared_catalog.attach(foreign.name)
+    finally:
+        foreign.close()
+        foreign.unlink()
+
+def test_session_plays_from_attached_catalog():
+    """Test a scripted game using the shared catalog as its data"""
+    data = main.load_game_data()
+    replies = ["1", "Sharer", "Mage", "3", "2", "", "6", "5", "B", "health_potion", "", "L", "6", "3"]
+    with game_data.publish_catalog(data['quests'], data['items']) as catalog:
+        attached = game_data.attach_catalog(catalog.name)
+        shared = replay_driver.run_script(replies, seed=2, shared_data=attached)
+    parsed = replay_driver.run_script(replies, seed=2, shared_data=data)
+
+    assert shared['finished']
+    assert shared['transcript'] == parsed['transcript']
+
+# ============================================================================
+# WORKER POOL TESTS
+# ============================================================================
+
+needs_fork = pytest.mark.skipif(not worker_pool.fork_available(), reason="needs fork")
+
+@pytest.fixture
+def unfreeze():
+    """Give objects frozen by a test back to the garbage collector"""
+    yield
+    gc.unfreeze()
+
+def report_worker_state():
+    """Pool task: what a worker had before doing any work"""
+    return bool(main._shared_game_data), gc.get_freeze_count()
+
+@needs_fork
+def test_forked_workers_start_with_data_loaded(unfreeze):
+    """Test that forked workers inherit the preloaded, frozen data"""
+    pool = worker_pool.start_pool(2, start_method='fork')
+    try:
+        assert len(worker_pool.warm_up(pool, 2)) == 2
+        has_data, frozen = pool.submit(report_worker_state).result()
+    finally:
+        pool.shutdown()
+    
+    assert has_data
+    assert frozen > 0
+
+def test_preload_keeps_collector_disabled_if_it_was(unfreeze):
+    """Test that preload restores the caller's GC setting"""
+    gc.disable()
+    try:
+        worker_pool.preload(freeze=False)
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+    
+    worker_pool.preload(freeze=False)
+    assert gc.isenabled()
+
+def test_game_data_is_cached_per_file_pair(tmp_path):
+    """Test that load_game_data does not hand back data for other files"""
+    default = main.load_game_data()
+    quest_file = tmp_path / "quests.txt"
+    item_file = tmp_path / "items.txt"
+    quest_file.write_text("QUEST_ID: only_quest\nTITLE: Only\nDESCRIPTION: x\n"
+                          "REWARD_XP: 1\nREWARD_GOLD: 1\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n")
+    with open("data/items.txt") as f:
+        item_file.write_text(f.read())
+    
+    with game_output.use_sink(game_output.NullSink()):
+        other = main.load_game_data(str(quest_file), str(item_file))
+    
+    assert list(other['quests']) == ["only_quest"]
+    assert main.load_game_data() is default
+    assert main.load_game_data(str(quest_file), str(item_file)) is other
+
+def test_unknown_start_method_is_rejected():
+    """Test start_pool's start method check"""
+    with pytest.raises(ValueError):
+        worker_pool.start_pool(2, start_method='teleport')
+
+@needs_fork
+def test_worker_benchmark_reads_shared_memory(unfreeze):
+    """Test one benchmark mode end to end on the real data files"""
+    result = bench_workers.measure_mode('fork_frozen', 2, "data/quests.txt", "data/items.txt", games=1)
+    
+    assert result['preload_s'] > 0
+    assert 0 < result['min_s'] <= result['median_s'] <= result['startup_s']
+    if os.path.exists(f"/proc/{os.getpid()}/smaps_rollup"):
+        assert result['memory_started']['shared_kb'] > 0
+        assert 0 < result['memory_after_churn']['shared_fraction'] <= 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,252 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Tracing Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Per-action trace spans, for finding out why one particular action was slow.
+
+A span is one timed piece of work (a game action, a quest call, a combat
+turn, an autosave) with its duration, attributes such as the character,
+item_id or quest_id, and the span it happened inside. Finished spans go
+into a fixed-size ring buffer, so tracing can stay on in a long-running
+server; dump_jsonl() writes whatever is in the buffer to a file.
+
+Like metrics, tracing is off by default and costs one flag check per
+instrumented call while off.
+
+    with tracing.span("shop.buy", item_id=item_id):
+        ...
+
+    @tracing.traced("inventory.use_item")
+    def use_item(character, item_id, item_data):
+"""
+
+import collections
+import contextvars
+import functools
+import itertools
+import os
+import time
+from contextlib import contextmanager
+
+DEFAULT_CAPACITY = 10000
+
+# Arguments that are copied onto spans by @traced when a function has them
+TRACED_ARGUMENTS = ('item_id', 'quest_id')
+
+enabled = False
+
+_buffer = collections.deque(maxlen=DEFAULT_CAPACITY)
+_current = contextvars.ContextVar("current_span", default=None)
+_ids = itertools.count(1)
+# Makes span IDs unique across processes writing to the same place
+_process_tag = f"{os.getpid():x}"
+
+# ============================================================================
+# SPANS
+# ============================================================================
+
+class Span:
+    """One timed piece of work"""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'attributes',
+                 'start_time', '_started', 'duration')
+
+    def __init__(self, name, parent, attributes):
+        self.name = name
+        self.span_id = f"{_process_tag}-{next(_ids)}"
+        if parent is None:
+            self.trace_id = self.span_id
+            self.parent_id = None
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+        self.attributes = attributes
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self.duration = None
+
+    def set(self, key, value):
+        """Add or change an attribute"""
+        self.attributes[key] = value
+
+    def finish(self):
+        """End the span and put it in the ring buffer (only once)"""
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._started
+            _buffer.append(self)
+
+    def to_dict(self):
+        """Return the span as JSON-ready data"""
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start': self.start_time,
+            'duration_ms': self.duration * 1000 if self.duration is not None else None,
+            'attributes': self.attributes
+        }
+
+# ============================================================================
+# SWITCHING ON AND OFF
+# ============================================================================
+
+def enable(capacity=None):
+    """
+    Start recording spans
+
+    Args:
+        capacity: Ring buffer size (keeps the current size if None)
+    """
+    global enabled, _buffer
+    if capacity is not None and capacity != _buffer.maxlen:
+        _buffer = collections.deque(_buffer, maxlen=capacity)
+    enabled = True
+
+def disable():
+    """Stop recording spans (buffered spans are kept)"""
+    global enabled
+    enabled = False
+
+def clear():
+    """Empty the ring buffer"""
+    _buffer.clear()
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+def start_span(name, **attributes):
+    """
+    Open a span inside the current span
+
+    The caller must call finish() on it. Use span() instead unless the
+    span has to stay open across yields (like a whole game action).
+
+    Returns: The Span, or None while tracing is off
+    """
+    if not enabled:
+        return None
+    return Span(name, _current.get(), attributes)
+
+def finish(span):
+    """Finish a span from start_span (does nothing for None)"""
+    if span is not None:
+        span.finish()
+
+def get_current():
+    """Return the span new spans will be nested in"""
+    return _current.get()
+
+def set_current(span):
+    """Make a span the parent of spans started from here on"""
+    _current.set(span)
+
+@contextmanager
+def span(name, **attributes):
+    """Trace a with block as a span nested in the current one"""
+    if not enabled:
+        yield None
+        return
+    opened = Span(name, _current.get(), attributes)
+    token = _current.set(opened)
+    try:
+        yield opened
+    finally:
+        _current.reset(token)
+        opened.finish()
+
+def traced(name, attributes=None):
+    """
+    Decorator: trace every call of a function as a span
+
+    By default the span gets the character's name (from a 'character'
+    argument) and any item_id/quest_id arguments.
+
+    Args:
+        name: Span name
+        attributes: Optional function taking the same arguments as the
+                    decorated function and returning an attribute dict
+    """
+    def decorate(func):
+        # Positions of the interesting arguments (read from the code object
+        # rather than with inspect, which is slow to import)
+        code = func.__code__
+        parameters = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+        wanted = [(argument, parameters.index(argument))
+                  for argument in TRACED_ARGUMENTS + ('character',) if argument in parameters]
+
+        def get_attributes(args, kwargs):
+            if attributes is not None:
+                return attributes(*args, **kwargs)
+            found = {}
+            for argument, position in wanted:
+                if argument in kwargs:
+                    value = kwargs[argument]
+                elif position < len(args):
+                    value = args[position]
+                else:
+                    continue
+                if argument != 'character':
+                    found[argument] = value
+                elif isinstance(value, dict) and 'name' in value:
+                    found[argument] = value['name']
+            return found
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            opened = Span(name, _current.get(), get_attributes(args, kwargs))
+            token = _current.set(opened)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                opened.set('error', type(e).__name__)
+                raise
+            finally:
+                _current.reset(token)
+                opened.finish()
+        return wrapper
+    return decorate
+
+# ============================================================================
+# READING SPANS
+# ============================================================================
+
+def get_spans():
+    """Return every buffered span as a dictionary, oldest first"""
+    return [span.to_dict() for span in list(_buffer)]
+
+def dump_jsonl(filename):
+    """
+    Write every buffered span to a JSON lines file (one span per line)
+
+    Returns: Number of spans written
+    """
+    import json
+
+    spans = get_spans()
+    with open(filename, 'w') as f:
+        for entry in spans:
+            f.write(json.dumps(entry, default=str) + "\n")
+    return len(spans)
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== TRACING TEST ===")
+
+    # enable()
+    # with span("outer", character="Hero"):
+    #     with span("inner", item_id="health_potion"):
+    #         pass
+    # for entry in get_spans():
+    #     print(entry)
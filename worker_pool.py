@@ -0,0 +1,170 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Worker Pool Module
+
+Name: Daylen Hicks
+
+AI Usage: Used an AI assistant to help explain and break down the
+          logic, discuss the overall approach, and fix syntactical errors.
+
+Starts worker processes from a parent that has already loaded the game.
+
+preload() imports every game module and loads the game data once, then
+calls gc.freeze(): everything built so far moves to the permanent GC
+generation, so the cyclic garbage collector never walks (and writes to)
+those objects again. start_pool() then forks the workers. They start with
+the modules and the data already in memory, and keep sharing those pages
+with the parent copy-on-write instead of each getting a private copy the
+first time the GC runs.
+
+Where fork is not available (Windows, macOS by default) workers are
+spawned instead and load the data themselves.
+
+    pool = worker_pool.start_pool(4)
+    results = list(pool.map(replay_driver._run_job, jobs))
+"""
+
+import gc
+import importlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import game_output
+import main
+
+# Modules worth having in memory before forking
+GAME_MODULES = ('character_manager', 'inventory_system', 'quest_handler',
+                'combat_system', 'game_data', 'replay_driver')
+
+# How long warm-up tasks hold a worker, so each one lands on a new worker
+WARM_UP_DELAY = 0.05
+
+# ============================================================================
+# PRELOADING
+# ============================================================================
+
+def fork_available():
+    """Return True if worker processes can be forked on this platform"""
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+def preload(quest_file="data/quests.txt", item_file="data/items.txt",
+            modules=GAME_MODULES, freeze=True):
+    """
+    Import the game modules and load the game data in this process
+
+    Args:
+        quest_file / item_file: Data files (see main.load_game_data)
+        modules: Module names to import
+        freeze: Move everything loaded into the permanent GC generation
+
+    Returns: Dictionary with 'quests' and 'items'
+    """
+    # No collections while the catalog is built, so nothing gets moved
+    # around or written to before the freeze
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for name in modules:
+            module = importlib.import_module(name)
+            # main imports some modules lazily; using an attribute loads them
+            getattr(module, '__name__')
+
+        with game_output.use_sink(game_output.NullSink()):
+            data = main.load_game_data(quest_file, item_file)
+
+        if freeze:
+            # Drop garbage first so it is not kept forever
+            gc.collect()
+            gc.freeze()
+    finally:
+        # Leave the collector the way the caller had it
+        if was_enabled:
+            gc.enable()
+    return data
+
+# ============================================================================
+# POOLS
+# ============================================================================
+
+def start_pool(workers, initializer=None, initargs=(), quest_file="data/quests.txt",
+               item_file="data/items.txt", start_method=None, freeze=True):
+    """
+    Start a process pool whose workers already have the game loaded
+
+    Args:
+        workers: Number of worker processes
+        initializer / initargs: Run in every worker after it starts
+        quest_file / item_file: Data files to load
+        start_method: 'fork' (preload here, then fork), 'spawn' (each
+                      worker loads the data) or None (fork if possible)
+        freeze: gc.freeze() after preloading (fork only)
+
+    Returns: ProcessPoolExecutor
+    Raises: ValueError for an unknown or unavailable start method
+    """
+    if start_method is None:
+        start_method = 'fork' if fork_available() else 'spawn'
+
+    if start_method == 'fork':
+        if not fork_available():
+            raise ValueError("Worker processes cannot be forked on this platform")
+        preload(quest_file, item_file, freeze=freeze)
+        context = multiprocessing.get_context('fork')
+        return ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                   initializer=initializer, initargs=initargs)
+
+    if start_method == 'spawn':
+        context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                   initializer=_load_then_initialize,
+                                   initargs=(quest_file, item_file, initializer, initargs))
+
+    raise ValueError(f"Unknown start method '{start_method}'")
+
+def _load_then_initialize(quest_file, item_file, initializer, initargs):
+    with game_output.use_sink(game_output.NullSink()):
+        main.load_game_data(quest_file, item_file)
+    if initializer is not None:
+        initializer(*initargs)
+
+def worker_ready(delay=WARM_UP_DELAY):
+    """
+    Pool task: hold the worker for a moment, then say who answered
+
+    Returns: (process ID, time.monotonic() when the worker got the task)
+    """
+    answered = time.monotonic()
+    time.sleep(delay)
+    return os.getpid(), answered
+
+def warm_up(pool, workers, timeout=60):
+    """
+    Start every worker now instead of when work first arrives
+
+    Returns: Dictionary {worker process ID: time.monotonic() it was ready}
+    Raises: TimeoutError if the workers do not all start in time
+    """
+    deadline = time.monotonic() + timeout
+    ready = {}
+    while len(ready) < workers:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Only {len(ready)} of {workers} workers started")
+        # A task submitted while every worker is busy starts a new worker
+        futures = [pool.submit(worker_ready) for _ in range(workers)]
+        for future in futures:
+            pid, answered = future.result(timeout=timeout)
+            ready.setdefault(pid, answered)
+    return ready
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== WORKER POOL TEST ===")
+
+    # pool = start_pool(4)
+    # print(warm_up(pool, 4))
+    # pool.shutdown()